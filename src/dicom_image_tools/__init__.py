@@ -1,4 +1,8 @@
 __version__ = "19.5.0"
 
-from .dicom_handlers.dicom_import import import_dicom_file, import_dicom_from_folder
+from .dicom_handlers.dicom_import import (
+    import_dicom_file,
+    import_dicom_from_folder,
+    iter_import_dicom_from_folder,
+)
 from .roi.square_roi import SquareRoi
@@ -0,0 +1,66 @@
+# Private tags used when calculating the patient geometrical offset in CT images
+GE_TABLE_OFFSET_TAG = 0x00431031
+TOSHIBA_TABLE_OFFSET_TAG = 0x70051007
+
+# The private creators of the private tags, needed to look up the VR of the private tags in implicit VR files
+GE_PRIVATE_CREATOR_TAG = 0x00430010
+TOSHIBA_PRIVATE_CREATOR_TAG = 0x70050010
+
+# Tags used when sorting files into studies and series, and by the series classes for the metadata they keep
+HEADER_TAG_KEYWORDS = [
+    # Routing
+    "SpecificCharacterSet",
+    "SOPClassUID",
+    "SOPInstanceUID",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "Modality",
+    "Manufacturer",
+    "ManufacturerModelName",
+    "DetectorManufacturerName",
+    "DetectorManufacturerModelName",
+    "SeriesDescription",
+    # Ordering
+    "AcquisitionDate",
+    "AcquisitionTime",
+    "InstanceNumber",
+    "SliceLocation",
+    "ImagePositionPatient",
+    # Geometry
+    "Rows",
+    "Columns",
+    "PixelSpacing",
+    "DetectorElementSpacing",
+    "SliceThickness",
+    "TableHeight",
+    "DataCollectionCenterPatient",
+    "ReconstructionTargetCenterPatient",
+    "FieldOfViewRotation",
+    # Exposure
+    "KVP",
+    "XRayTubeCurrent",
+    "XRayTubeCurrentInmA",
+    "XRayTubeCurrentInuA",
+    "ExposureTime",
+    # Pixel data
+    "BitsAllocated",
+    "BitsStored",
+    "PixelRepresentation",
+    "PixelIntensityRelationshipSign",
+    "RescaleSlope",
+    "RescaleIntercept",
+    "WindowCenter",
+    "WindowWidth",
+    # Dose matrix
+    "DoseGridScaling",
+    "DoseSummationType",
+    "DoseType",
+    "DoseUnits",
+]
+
+PRIVATE_HEADER_TAGS = [
+    GE_PRIVATE_CREATOR_TAG,
+    GE_TABLE_OFFSET_TAG,
+    TOSHIBA_PRIVATE_CREATOR_TAG,
+    TOSHIBA_TABLE_OFFSET_TAG,
+]
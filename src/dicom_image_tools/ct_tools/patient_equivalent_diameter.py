@@ -1,16 +1,35 @@
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
+from numpy.typing import ArrayLike
+from scipy import ndimage
+from scipy.spatial import ConvexHull, QhullError
 from skimage.transform import hough_line, radon
 
 from ..dicom_handlers.ct import CtSeries
+from ..dicom_handlers.result_cache import ResultCache
+from ..helpers.masked_statistics import get_masked_statistics
+from ..helpers.packed_mask import PackedMask
 from ..helpers.voxel_data import VoxelData
+from ..helpers.workers import validate_workers
 
 log = logging.getLogger(__name__)
 
+# Engines that the maximum and minimum distance through the patient can be calculated with
+SINOGRAM_ENGINES = ["radon", "convex_hull"]
+
+# The image and mask volumes attached from shared memory in the worker processes, see _attach_shared_volumes
+_shared_volumes: Dict[str, np.ndarray] = {}
+_shared_memory_blocks: List[SharedMemory] = []
+
 
 @dataclass
 class EquivalentDiameterData:
@@ -47,6 +66,56 @@ class EquivalentDiameterData:
         return json.dumps(self.to_dict())
 
 
+@dataclass
+class EquivalentDiameterVolumeData:
+    """The equivalent diameter data of all slices in a series, with one array per quantity and one element per slice
+
+    The attributes have the same names and meaning as in EquivalentDiameterData.
+    """
+
+    Area_px: np.ndarray
+    EAD_px: np.ndarray
+    EAD_cm: np.ndarray
+    EquivalentAreaCircumference_cm: np.ndarray
+    MeanHU: np.ndarray
+    MedianHU: np.ndarray
+    LAT_cm: np.ndarray
+    AP_cm: np.ndarray
+    WED_px: np.ndarray
+    WED_cm: np.ndarray
+    EED_px: np.ndarray
+    EED_cm: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.Area_px)
+
+    def to_dict(self):
+        return {
+            "Area_px": self.Area_px.tolist(),
+            "EAD_px": self.EAD_px.tolist(),
+            "EAD_cm": self.EAD_cm.tolist(),
+            "EquivalentAreaCircumference_cm": self.EquivalentAreaCircumference_cm.tolist(),
+            "MeanHU": self.MeanHU.tolist(),
+            "MedianHU": self.MedianHU.tolist(),
+            "LAT_cm": self.LAT_cm.tolist(),
+            "AP_cm": self.AP_cm.tolist(),
+            "WED_px": self.WED_px.tolist(),
+            "WED_cm": self.WED_cm.tolist(),
+            "EED_px": self.EED_px.tolist(),
+            "EED_cm": self.EED_cm.tolist(),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def to_list(self) -> List[EquivalentDiameterData]:
+        """Split the data into one EquivalentDiameterData instance per slice"""
+        return [
+            EquivalentDiameterData(**{key: float(value[ind]) for key, value in self.__dict__.items()})
+            for ind in range(len(self))
+        ]
+
+
 @dataclass
 class SinogramData:
     MaxPixels: float
@@ -144,6 +213,82 @@ def _calculate_slice_area_equivalent_diameter(
     )
 
 
+def calculate_volume_area_equivalent_diameter(ct: CtSeries, slab_size: int = 64) -> EquivalentDiameterVolumeData:
+    """Calculate the area equivalent diameter for all slices in a CT series at once. The calculations are the same as
+    in calculate_area_equivalent_diameter, but the area, LAT and AP dimensions are found with reductions over the mask
+    volume and the mean and median HU with
+    :func:`~dicom_image_tools.helpers.masked_statistics.get_masked_statistics`, without copying the slices.
+
+    Args:
+        ct: A CtSeries object containing the series for which the area equivalent diameter should be determined
+        slab_size: The number of mask slices to reduce at a time. Defaults to 64
+
+    Raises:
+        TypeError: If ct is not a CtSeries or if slab_size is not an integer
+        ValueError: If slab_size is less than 1
+
+    Returns:
+        The equivalent diameter data with one array element per slice. Slices without any masked pixels get NaN mean
+        and median HU
+    """
+    if not isinstance(ct, CtSeries):
+        raise TypeError("ct must be an instance of the CtSeries class")
+
+    if not isinstance(slab_size, int) or isinstance(slab_size, bool):
+        raise TypeError("slab_size must be an integer")
+
+    if slab_size < 1:
+        raise ValueError("slab_size must be at least 1")
+
+    log.debug("Calculating area equivalent diameter for the volume")
+    if ct.Mask is None:
+        ct.get_patient_mask(remove_table=True)
+
+    slice_count = ct.ImageVolume.shape[2]
+
+    area_pixels = np.zeros(slice_count)
+    lat_pixels = np.zeros(slice_count, dtype=np.int64)
+    ap_pixels = np.zeros(slice_count, dtype=np.int64)
+    for start in range(0, slice_count, slab_size):
+        mask = ct.Mask[:, :, start : start + slab_size]
+        stop = start + mask.shape[2]
+        area_pixels[start:stop] = np.count_nonzero(mask, axis=(0, 1))
+        lat_pixels[start:stop] = np.count_nonzero(np.any(mask, axis=0), axis=0)
+        ap_pixels[start:stop] = np.count_nonzero(np.any(mask, axis=1), axis=0)
+
+    statistics = get_masked_statistics(image_volume=ct.ImageVolume, mask=ct.Mask)
+    mean_hu = np.asarray(statistics.slice_mean, dtype=float)
+    median_hu = np.asarray(statistics.slice_median, dtype=float)
+
+    pixel_size_x_cm = np.divide([voxel_data.x for voxel_data in ct.VoxelData[:slice_count]], 10.0)
+    pixel_size_y_cm = np.divide([voxel_data.y for voxel_data in ct.VoxelData[:slice_count]], 10.0)
+
+    mask_equivalent_diameter_pixels = np.multiply(2.0, np.sqrt(np.divide(area_pixels, np.pi)))
+    mask_equivalent_circumference_pixels = np.multiply(2.0, np.sqrt(np.multiply(area_pixels, np.pi)))
+
+    # Water equivalent area and diameter from AAPM Report 220 §2.1, see _calculate_slice_area_equivalent_diameter
+    aw_pixels = np.add(np.multiply(np.divide(mean_hu, 1000.0), area_pixels), area_pixels)
+    wed_pixels = np.multiply(2.0, np.sqrt(np.divide(aw_pixels, np.pi)))
+
+    lat_cm = np.multiply(lat_pixels, pixel_size_x_cm)
+    ap_cm = np.multiply(ap_pixels, pixel_size_y_cm)
+
+    return EquivalentDiameterVolumeData(
+        Area_px=area_pixels,
+        EAD_px=mask_equivalent_diameter_pixels,
+        EAD_cm=np.multiply(mask_equivalent_diameter_pixels, pixel_size_x_cm),
+        EquivalentAreaCircumference_cm=np.multiply(mask_equivalent_circumference_pixels, pixel_size_x_cm),
+        MeanHU=mean_hu,
+        MedianHU=median_hu,
+        LAT_cm=lat_cm,
+        AP_cm=ap_cm,
+        WED_px=wed_pixels,
+        WED_cm=np.multiply(wed_pixels, pixel_size_x_cm),
+        EED_px=np.sqrt(np.multiply(ap_pixels, lat_pixels)),
+        EED_cm=np.sqrt(np.multiply(ap_cm, lat_cm)),
+    )
+
+
 def calculate_max_min_lat_ap_hough(mask: np.ndarray, voxel_data: VoxelData):
     """Calculate the maximum and minimum distance through the patient/mask, and the angles at which they occur, using
     the Hough transform.
@@ -248,6 +393,128 @@ def calculate_max_min_lat_ap_radon(mask: np.ndarray, voxel_data: VoxelData) -> S
 
     non_zero = [np.count_nonzero(radon_mask[:, ind]) for ind in range(180)]
 
+    return _get_sinogram_data(non_zero=non_zero, voxel_data=voxel_data)
+
+
+def calculate_max_min_lat_ap_convex_hull(mask: np.ndarray, voxel_data: VoxelData) -> SinogramData:
+    """Calculate the maximum and minimum distance through the patient/mask, and the angles at which they occur, from
+    the widths of the mask projected at the angles 0 to 179 degrees, without calculating the radon transform.
+
+    The width at each angle is the number of detector bins from the first to the last non-zero bin of the radon
+    transform used by calculate_max_min_lat_ap_radon. The vertices of the convex hull of the mask boundary pixels are
+    projected onto the detector axis to find the range of bins that the mask can reach, and only the bins at the ends
+    of the range are sampled, with the same bilinear interpolation as the radon transform, to find the first and last
+    non-zero bin. The result is the same as that of calculate_max_min_lat_ap_radon for masks without gaps in their
+    projections, e.g., convex masks. Gaps between separate parts of a mask are counted as part of the width.
+
+    Args:
+        mask: A 2D binary numpy.ndarray containing the patient mask/ROI
+        voxel_data: Pixel size for the mask
+
+    Returns:
+        The maximum and minimum distance through the patient/mask in pixels and cm, and the angles of the maximum and
+        minimum distance, respectively.
+    """
+    if not isinstance(mask, np.ndarray) or (len(mask.shape) > 2 and mask.shape[2] > 1):
+        raise TypeError("mask must be a 2D numpy ndarray")
+
+    if not isinstance(voxel_data, VoxelData):
+        raise TypeError("voxel_data must be a VoxelData object instance")
+
+    mask = np.squeeze(mask.astype(bool), axis=2) if mask.ndim > 2 else mask.astype(bool)
+
+    # Crop the mask to a centred square, as the radon transform does with circle=True
+    side = min(mask.shape)
+    offsets = [int(np.ceil((size - side) / 2)) for size in mask.shape]
+    mask = mask[offsets[0] : offsets[0] + side, offsets[1] : offsets[1] + side]
+
+    boundary_rows, boundary_columns = np.nonzero(np.logical_and(mask, np.logical_not(ndimage.binary_erosion(mask))))
+    if not boundary_rows.size:
+        return _get_sinogram_data(non_zero=list(np.zeros(180, dtype=np.int64)), voxel_data=voxel_data)
+
+    points = np.column_stack([boundary_columns, boundary_rows]).astype(float)
+    try:
+        points = points[ConvexHull(points).vertices]
+    except QhullError:
+        # Less than three boundary pixels or all boundary pixels on a line
+        pass
+
+    # The mask is padded with zeros to sample it outside of its borders, as the radon transform does
+    padded_mask = np.pad(mask.astype(float), 1)
+    center = side // 2
+    angles = np.deg2rad(np.arange(180))
+    widths = np.zeros(180, dtype=np.int64)
+    for angle, cos_a, sin_a in zip(range(180), np.cos(angles), np.sin(angles)):
+        # A bin is non-zero only if its line of samples passes within one pixel, along both axes, of a mask pixel. The
+        # range is widened by one bin on each side to include bins reached due to rounding in the sample positions
+        projections = (points[:, 0] - center) * cos_a - (points[:, 1] - center) * sin_a
+        reach = np.abs(cos_a) + np.abs(sin_a)
+        first_bin = max(int(np.floor(projections.min() - reach)) + center, 0)
+        last_bin = min(int(np.ceil(projections.max() + reach)) + center, side - 1)
+
+        first_non_zero = _get_first_non_zero_radon_bin(
+            padded_mask=padded_mask, cos_a=cos_a, sin_a=sin_a, bins=range(first_bin, last_bin + 1)
+        )
+        if first_non_zero is None:
+            continue
+
+        last_non_zero = _get_first_non_zero_radon_bin(
+            padded_mask=padded_mask, cos_a=cos_a, sin_a=sin_a, bins=range(last_bin, first_non_zero - 1, -1)
+        )
+        widths[angle] = last_non_zero - first_non_zero + 1
+
+    return _get_sinogram_data(non_zero=list(widths), voxel_data=voxel_data)
+
+
+def _get_first_non_zero_radon_bin(
+    padded_mask: np.ndarray, cos_a: float, sin_a: float, bins: range, batch_size: int = 4
+) -> Optional[int]:
+    """Get the first of the given bins, in the given order, that is non-zero in the radon transform of a square mask
+    padded with one row and column of zeros on each side, at the angle with the given cosine and sine
+
+    The bins are sampled in batches as skimage.transform.radon samples them, i.e., the mask is rotated around its
+    centre with bilinear interpolation and the bin is non-zero if any sample in its column of the rotated mask is.
+    """
+    side = padded_mask.shape[0] - 2
+    center = side // 2
+    rows = np.arange(side, dtype=float)[:, np.newaxis]
+
+    for start in range(0, len(bins), batch_size):
+        batch = np.asarray(bins[start : start + batch_size])
+        columns = batch.astype(float)[np.newaxis, :]
+
+        # The sample positions are calculated in the same order as in skimage.transform.warp to get the same rounding
+        x = cos_a * columns + sin_a * rows + -center * (cos_a + sin_a - 1)
+        y = -sin_a * columns + cos_a * rows + -center * (cos_a - sin_a - 1)
+
+        # Samples outside of the mask are clipped to the zero border of the padded mask
+        min_x, min_y = np.floor(x), np.floor(y)
+        dx, dy = x - min_x, y - min_y
+        min_x = np.clip(min_x + 1, 0, side + 1).astype(int)
+        max_x = np.clip(np.ceil(x) + 1, 0, side + 1).astype(int)
+        min_y = np.clip(min_y + 1, 0, side + 1).astype(int)
+        max_y = np.clip(np.ceil(y) + 1, 0, side + 1).astype(int)
+
+        top = (1 - dx) * padded_mask[min_y, min_x] + dx * padded_mask[min_y, max_x]
+        bottom = (1 - dx) * padded_mask[max_y, min_x] + dx * padded_mask[max_y, max_x]
+        non_zero = np.flatnonzero(np.any((1 - dy) * top + dy * bottom != 0, axis=0))
+        if non_zero.size:
+            return int(batch[non_zero[0]])
+
+    return None
+
+
+def _get_sinogram_data(non_zero: List[int], voxel_data: VoxelData) -> SinogramData:
+    """Get the maximum and minimum distance through the patient/mask from the width at each angle 0 to 179 degrees
+
+    Args:
+        non_zero: The width of the patient/mask in pixels at each angle
+        voxel_data: Pixel size for the mask
+
+    Returns:
+        The maximum and minimum distance through the patient/mask in pixels and cm, and the angles of the maximum and
+        minimum distance, respectively.
+    """
     sinogram_max_px = max(non_zero)
     sinogram_max_cm = np.multiply(sinogram_max_px, np.divide(voxel_data.x, 10.0))  # Assumes max patient size = LAT
 
@@ -303,15 +570,37 @@ def calculate_max_min_lat_ap_radon(mask: np.ndarray, voxel_data: VoxelData) -> S
 
 
 def calculate_area_equivalent_diameter(
-    ct: CtSeries, use_radon: Optional[bool] = False, use_hough: Optional[bool] = False
+    ct: CtSeries,
+    use_radon: Optional[bool] = False,
+    use_hough: Optional[bool] = False,
+    workers: Optional[int] = None,
+    sinogram_engine: str = "radon",
+    cache: Optional[ResultCache] = None,
 ) -> Tuple[List[EquivalentDiameterData], Optional[List[SinogramData]], Optional[List[SinogramData]]]:
     """Calculate the area equivalent diameter for all slices in a CT series. The calculations are based on the
     specifications in AAPM report 204 and 220.
 
+    The slices can be distributed over a pool of worker processes by specifying the number of workers. The image and
+    mask volumes are then copied once to shared memory that the workers read the slices from, and the results are
+    returned in slice order.
+
     Args:
         ct: A CtSeries object containing the series for which the area equivalent diameter should be determined
         use_radon: Use radon transform to determine maximum and minimum distance through patient
         use_hough: Use Hough transform to determine maximum and minimum distance through patient
+        workers: The number of worker processes to calculate the slices with. Defaults to None, i.e., the slices are
+            calculated serially
+        sinogram_engine: The engine to determine the maximum and minimum distance through patient with when use_radon
+            is True, one of "radon" (calculate_max_min_lat_ap_radon) and "convex_hull"
+            (calculate_max_min_lat_ap_convex_hull). Defaults to "radon"
+        cache: A cache to load the results from, or store them in. The results are keyed by the SOPInstanceUIDs of
+            the series, the patient mask, the pixel data type of the image volume and the options above. The cache is
+            also used when creating the patient mask. Defaults to None, i.e., no caching
+
+    Raises:
+        TypeError: If ct is not a CtSeries, if use_radon or use_hough is not a boolean or if workers is not an integer
+        ValueError: If workers is less than 1
+        ValueError: If sinogram_engine is not one of the supported engines
 
     Returns:
         Tuple in the form (EAD_data, radon_data, hough_data) where the radon_data and hough_data only have values if
@@ -326,27 +615,186 @@ def calculate_area_equivalent_diameter(
     if not isinstance(use_hough, bool):
         raise TypeError("use_hough must be a boolean")
 
+    validate_workers(workers=workers)
+
+    if sinogram_engine not in SINOGRAM_ENGINES:
+        raise ValueError(f"sinogram_engine must be one of {', '.join(SINOGRAM_ENGINES)}")
+
     log.debug("Calculating area equivalent diameter")
     if ct.Mask is None:
-        ct.get_patient_mask(remove_table=True)
+        ct.get_patient_mask(remove_table=True, cache=cache)
+
+    cache_key = None
+    if cache is not None and None not in ct.SopInstanceUids:
+        cache_key = cache.get_key(
+            "area_equivalent_diameter",
+            ct.SopInstanceUids,
+            mask=_get_mask_digest(mask=ct.Mask),
+            pixel_data=ct._get_pixel_data_policy(),
+            use_radon=use_radon,
+            use_hough=use_hough,
+            sinogram_engine=sinogram_engine,
+        )
+        cached_result = cache.load(cache_key)
+        if cached_result is not None:
+            log.debug("Loaded area equivalent diameter from the cache")
+            return (
+                _from_arrays(arrays=cached_result, data_class=EquivalentDiameterData, prefix="ead_"),
+                _from_arrays(arrays=cached_result, data_class=SinogramData, prefix="radon_") if use_radon else None,
+                _from_arrays(arrays=cached_result, data_class=SinogramData, prefix="hough_") if use_hough else None,
+            )
+
+    slice_count = ct.ImageVolume.shape[2]
+
+    if workers is None or workers == 1:
+        slice_data = [
+            _calculate_slice_data(
+                image=ct.ImageVolume[:, :, ind],
+                mask=ct.Mask[:, :, ind],
+                voxel_data=ct.VoxelData[ind],
+                use_radon=use_radon,
+                use_hough=use_hough,
+                sinogram_engine=sinogram_engine,
+            )
+            for ind in range(slice_count)
+        ]
+    else:
+        slice_data = _calculate_slice_data_in_processes(
+            ct=ct, use_radon=use_radon, use_hough=use_hough, workers=workers, sinogram_engine=sinogram_engine
+        )
+
+    ead_data = [obj[0] for obj in slice_data]
+    radon_data = [obj[1] for obj in slice_data] if use_radon else None
+    hough_data = [obj[2] for obj in slice_data] if use_hough else None
+
+    if cache_key is not None:
+        arrays = _to_arrays(data=ead_data, data_class=EquivalentDiameterData, prefix="ead_")
+        if use_radon:
+            arrays.update(_to_arrays(data=radon_data, data_class=SinogramData, prefix="radon_"))
+        if use_hough:
+            arrays.update(_to_arrays(data=hough_data, data_class=SinogramData, prefix="hough_"))
+        cache.store(cache_key, arrays)
+
+    return ead_data, radon_data, hough_data
+
+
+def _get_mask_digest(mask: Union[np.ndarray, PackedMask]) -> str:
+    # Digest of the mask bits, the same for a mask and the PackedMask holding it
+    packed_mask = mask.Packed if isinstance(mask, PackedMask) else np.packbits(mask, axis=1)
+    digest = hashlib.sha256(np.ascontiguousarray(packed_mask).tobytes())
+    digest.update(str(mask.shape).encode("utf-8"))
+
+    return digest.hexdigest()
 
-    ead_data = [
-        _calculate_slice_area_equivalent_diameter(ct.ImageVolume[:, :, ind], ct.Mask[:, :, ind], ct.VoxelData[ind])
-        for ind in range(ct.ImageVolume.shape[2])
-    ]
+
+def _to_arrays(data: List, data_class: type, prefix: str) -> Dict[str, np.ndarray]:
+    return {
+        f"{prefix}{field.name}": np.array([getattr(obj, field.name) for obj in data], dtype=float)
+        for field in fields(data_class)
+    }
+
+
+def _from_arrays(arrays: Dict[str, np.ndarray], data_class: type, prefix: str) -> List:
+    columns = {field.name: arrays[f"{prefix}{field.name}"].tolist() for field in fields(data_class)}
+    slice_count = len(arrays[f"{prefix}{fields(data_class)[0].name}"])
+
+    return [data_class(**{name: column[ind] for name, column in columns.items()}) for ind in range(slice_count)]
+
+
+def _calculate_slice_data(
+    image: np.ndarray,
+    mask: np.ndarray,
+    voxel_data: VoxelData,
+    use_radon: bool,
+    use_hough: bool,
+    sinogram_engine: str = "radon",
+) -> Tuple[EquivalentDiameterData, Optional[SinogramData], Optional[SinogramData]]:
+    ead_data = _calculate_slice_area_equivalent_diameter(image, mask, voxel_data)
 
     radon_data = None
-    if use_radon:
-        radon_data = [
-            calculate_max_min_lat_ap_radon(mask=ct.Mask[:, :, ind], voxel_data=ct.VoxelData[ind])
-            for ind in range(ct.ImageVolume.shape[2])
-        ]
+    if use_radon and sinogram_engine == "convex_hull":
+        radon_data = calculate_max_min_lat_ap_convex_hull(mask=mask, voxel_data=voxel_data)
+    elif use_radon:
+        radon_data = calculate_max_min_lat_ap_radon(mask=mask, voxel_data=voxel_data)
 
     hough_data = None
     if use_hough:
-        hough_data = [
-            calculate_max_min_lat_ap_radon(mask=ct.Mask[:, :, ind], voxel_data=ct.VoxelData[ind])
-            for ind in range(ct.ImageVolume.shape[2])
-        ]
+        hough_data = calculate_max_min_lat_ap_radon(mask=mask, voxel_data=voxel_data)
 
     return ead_data, radon_data, hough_data
+
+
+def _calculate_slice_data_in_processes(
+    ct: CtSeries, use_radon: bool, use_hough: bool, workers: int, sinogram_engine: str
+) -> List[Tuple[EquivalentDiameterData, Optional[SinogramData], Optional[SinogramData]]]:
+    slice_count = ct.ImageVolume.shape[2]
+    log.debug(f"Calculating the area equivalent diameter of {slice_count} slices with {workers} worker processes")
+
+    with _create_shared_volume(volume=ct.ImageVolume) as image_spec, _create_shared_volume(volume=ct.Mask) as mask_spec:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_attach_shared_volumes, initargs=(image_spec, mask_spec)
+        ) as executor:
+            # Results are returned in slice order
+            return list(
+                executor.map(
+                    _calculate_shared_slice_data,
+                    range(slice_count),
+                    ct.VoxelData[:slice_count],
+                    repeat(use_radon),
+                    repeat(use_hough),
+                    repeat(sinogram_engine),
+                    chunksize=max(1, slice_count // (workers * 4)),
+                )
+            )
+
+
+@contextmanager
+def _create_shared_volume(volume: ArrayLike) -> Iterator[Tuple[str, Tuple[int, int, int], str]]:
+    """Copy a volume of the shape (rows, columns, slices) to shared memory one slice at a time
+
+    The slices are stored contiguously, i.e., in the shape (slices, rows, columns). The shared memory is released when
+    the context is exited.
+
+    Returns:
+        The name of the shared memory block, the shape of the stored array and its data type
+
+    """
+    first_slice = np.asarray(volume[:, :, 0])
+    shape = (volume.shape[2], volume.shape[0], volume.shape[1])
+    dtype = first_slice.dtype
+
+    shared_memory = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    try:
+        shared_volume = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+        shared_volume[0] = first_slice
+        for ind in range(1, shape[0]):
+            shared_volume[ind] = volume[:, :, ind]
+
+        del shared_volume
+        yield shared_memory.name, shape, dtype.str
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def _attach_shared_volumes(
+    image_spec: Tuple[str, Tuple[int, int, int], str], mask_spec: Tuple[str, Tuple[int, int, int], str]
+) -> None:
+    # Worker process initializer. The shared memory blocks are kept open for the lifetime of the worker
+    for key, (name, shape, dtype) in (("image", image_spec), ("mask", mask_spec)):
+        shared_memory = SharedMemory(name=name)
+        _shared_memory_blocks.append(shared_memory)
+        _shared_volumes[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shared_memory.buf)
+
+
+def _calculate_shared_slice_data(
+    index: int, voxel_data: VoxelData, use_radon: bool, use_hough: bool, sinogram_engine: str
+) -> Tuple[EquivalentDiameterData, Optional[SinogramData], Optional[SinogramData]]:
+    return _calculate_slice_data(
+        image=_shared_volumes["image"][index],
+        mask=_shared_volumes["mask"][index],
+        voxel_data=voxel_data,
+        use_radon=use_radon,
+        use_hough=use_hough,
+        sinogram_engine=sinogram_engine,
+    )
@@ -0,0 +1,129 @@
+import logging
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from ..dicom_handlers.ct import CtSeries
+from .patient_equivalent_diameter import EquivalentDiameterData, EquivalentDiameterVolumeData, SinogramData
+
+log = logging.getLogger(__name__)
+
+# File formats that the size metrics can be saved in, given by the file suffix
+SIZE_METRICS_FILE_FORMATS = [".npy", ".parquet"]
+
+
+def get_size_metrics_table(
+    ct: CtSeries,
+    ead_data: Union[List[EquivalentDiameterData], EquivalentDiameterVolumeData],
+    radon_data: Optional[List[SinogramData]] = None,
+    hough_data: Optional[List[SinogramData]] = None,
+) -> np.ndarray:
+    """Collect the per-slice size metrics of a CT series in a numpy structured array with one row per slice
+
+    The table has the columns SlicePosition, kV and mA from the CT series, one column per EquivalentDiameterData
+    attribute and, if given, one column per SinogramData attribute prefixed with "Radon_" and "Hough_", e.g.,
+    "Radon_MaxCm". Missing kV and mA values are NaN.
+
+    Args:
+        ct: The CT series that the size metrics were calculated for
+        ead_data: The equivalent diameter data of the slices, as returned by calculate_area_equivalent_diameter or
+            calculate_volume_area_equivalent_diameter
+        radon_data: The radon data of the slices, as returned by calculate_area_equivalent_diameter. Defaults to None
+        hough_data: The Hough data of the slices, as returned by calculate_area_equivalent_diameter. Defaults to None
+
+    Raises:
+        TypeError: If ct is not a CtSeries
+        ValueError: If the number of slices in the size metrics does not match the number of slices in the series
+
+    Returns:
+        The size metrics as a numpy structured array with one float64 column per metric
+
+    """
+    if not isinstance(ct, CtSeries):
+        raise TypeError("ct must be an instance of the CtSeries class")
+
+    slice_count = len(ct.SlicePosition)
+
+    columns: Dict[str, np.ndarray] = {
+        "SlicePosition": np.asarray(ct.SlicePosition, dtype=float),
+        "kV": _get_series_column(values=ct.kV, slice_count=slice_count),
+        "mA": _get_series_column(values=ct.mA, slice_count=slice_count),
+    }
+
+    if isinstance(ead_data, EquivalentDiameterVolumeData):
+        columns.update({field.name: getattr(ead_data, field.name) for field in fields(ead_data)})
+    else:
+        columns.update(_get_columns(data=ead_data, data_class=EquivalentDiameterData))
+
+    if radon_data is not None:
+        columns.update(_get_columns(data=radon_data, data_class=SinogramData, prefix="Radon_"))
+
+    if hough_data is not None:
+        columns.update(_get_columns(data=hough_data, data_class=SinogramData, prefix="Hough_"))
+
+    for name, column in columns.items():
+        if len(column) != slice_count:
+            raise ValueError(f"The {name} column has {len(column)} values but the series has {slice_count} slices")
+
+    table = np.empty(slice_count, dtype=[(name, float) for name in columns])
+    for name, column in columns.items():
+        table[name] = column
+
+    return table
+
+
+def save_size_metrics(table: np.ndarray, output_path: Union[Path, str]) -> None:
+    """Save a size metrics table, as returned by get_size_metrics_table, to a NumPy or Parquet file
+
+    The file format is given by the suffix of the output path, ".npy" or ".parquet". Saving Parquet files requires the
+    optional dependency pyarrow, installed with ``pip install dicom_image_tools[parquet]``.
+
+    Args:
+        table: The size metrics table
+        output_path: The path of the file to save the table to
+
+    Raises:
+        TypeError: If table is not a numpy structured array
+        ValueError: If the suffix of the output path is not one of the supported file formats
+        ImportError: If saving a Parquet file and pyarrow is not installed
+
+    """
+    if not isinstance(table, np.ndarray) or table.dtype.names is None:
+        raise TypeError("table must be a numpy structured array")
+
+    output_path = Path(output_path)
+    if output_path.suffix.lower() not in SIZE_METRICS_FILE_FORMATS:
+        raise ValueError(f"The output file must have one of the suffixes {', '.join(SIZE_METRICS_FILE_FORMATS)}")
+
+    log.debug(f"Saving size metrics of {len(table)} slices to {output_path}")
+
+    if output_path.suffix.lower() == ".npy":
+        np.save(output_path, table, allow_pickle=False)
+        return
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Saving size metrics to Parquet requires pyarrow. Install it with pip install dicom_image_tools[parquet]"
+        ) from e
+
+    arrow_table = pyarrow.table({name: np.ascontiguousarray(table[name]) for name in table.dtype.names})
+    pyarrow.parquet.write_table(arrow_table, output_path)
+
+
+def _get_series_column(values: Optional[List[Optional[float]]], slice_count: int) -> np.ndarray:
+    if not values:
+        return np.full(slice_count, np.nan)
+
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def _get_columns(data: List, data_class: type, prefix: str = "") -> Dict[str, np.ndarray]:
+    return {
+        f"{prefix}{field.name}": np.fromiter((getattr(obj, field.name) for obj in data), dtype=float, count=len(data))
+        for field in fields(data_class)
+    }
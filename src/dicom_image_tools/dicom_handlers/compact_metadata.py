@@ -0,0 +1,118 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import pydicom
+from pydicom import DataElement, FileDataset
+from pydicom.datadict import dictionary_VR, keyword_for_tag, tag_for_keyword
+from pydicom.tag import BaseTag, Tag
+
+from ..constants.dicom_tags import HEADER_TAG_KEYWORDS, PRIVATE_HEADER_TAGS
+
+logger = logging.getLogger(__name__)
+
+
+class CompactMetadata:
+    """A slim record of the header tags used by the package, kept instead of the complete dataset of an image
+
+    Only the tags in :data:`~dicom_image_tools.constants.dicom_tags.HEADER_TAG_KEYWORDS` and the private tags in
+    :data:`~dicom_image_tools.constants.dicom_tags.PRIVATE_HEADER_TAGS` are kept. The record supports the parts of the
+    pydicom Dataset interface used in the package, i.e., ``"KVP" in metadata``, ``metadata.KVP``,
+    ``metadata.get("KVP")`` and ``metadata[0x00431031].value``. The complete dataset is re-read from disk with
+    :func:`~dicom_image_tools.dicom_handlers.compact_metadata.CompactMetadata.read_dataset`.
+
+    Args:
+        file: Path to the file that the metadata was read from
+        dcm: The dataset to keep the metadata from
+
+    Attributes:
+        FilePath: Path to the file that the metadata was read from
+
+    """
+
+    __slots__ = tuple(HEADER_TAG_KEYWORDS) + ("FilePath", "_private_elements")
+
+    def __init__(self, file: Path, dcm: Union[FileDataset, "CompactMetadata"]):
+        self.FilePath: Path = file
+        self._private_elements: Optional[Dict[int, DataElement]] = None
+
+        for keyword in HEADER_TAG_KEYWORDS:
+            if keyword in dcm:
+                setattr(self, keyword, dcm[keyword].value)
+
+        for tag in PRIVATE_HEADER_TAGS:
+            if tag in dcm:
+                if self._private_elements is None:
+                    self._private_elements = {}
+                self._private_elements[tag] = dcm[tag]
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for tags that are not set in the record
+        if name in HEADER_TAG_KEYWORDS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        raise AttributeError(
+            f"'{name}' is not kept in the compact metadata. Use read_dataset() to read the complete dataset from "
+            f"{self.FilePath}"
+        )
+
+    def __contains__(self, key: Union[str, int]) -> bool:
+        keyword = self._get_keyword(key)
+        if keyword is not None:
+            return hasattr(self, keyword)
+
+        if isinstance(key, str):
+            return False
+
+        return self._private_elements is not None and Tag(key) in self._private_elements
+
+    def __getitem__(self, key: Union[str, int]) -> DataElement:
+        keyword = self._get_keyword(key)
+        if keyword is not None and hasattr(self, keyword):
+            tag = tag_for_keyword(keyword)
+            return DataElement(tag, dictionary_VR(tag), getattr(self, keyword))
+
+        if not isinstance(key, str) and self._private_elements is not None and Tag(key) in self._private_elements:
+            return self._private_elements[Tag(key)]
+
+        raise KeyError(key)
+
+    def get(self, key: Union[str, int], default: Optional[Any] = None) -> Any:
+        """Get the value of a tag given as a keyword, or the data element of a tag given as a tag number
+
+        Args:
+            key: The keyword or tag number of the tag
+            default: The value to return if the tag is not in the record. Defaults to None
+
+        Returns:
+            The value or data element of the tag, or default if the tag is not in the record
+
+        """
+        if key not in self:
+            return default
+
+        return getattr(self, key) if isinstance(key, str) else self[key]
+
+    def read_dataset(self, stop_before_pixels: bool = True) -> FileDataset:
+        """Read the complete dataset from the file that the metadata was read from
+
+        Args:
+            stop_before_pixels: Stop reading the file before the pixel data. Defaults to True
+
+        Returns:
+            The complete dataset of the file
+
+        """
+        logger.debug(f"Reading complete dataset from {self.FilePath}")
+        return pydicom.dcmread(fp=str(self.FilePath.absolute()), stop_before_pixels=stop_before_pixels)
+
+    @staticmethod
+    def _get_keyword(key: Union[str, int]) -> Optional[str]:
+        if isinstance(key, str):
+            return key if key in HEADER_TAG_KEYWORDS else None
+
+        if not isinstance(key, (int, BaseTag)):
+            raise TypeError("The key must be given as a keyword or as a tag number")
+
+        keyword = keyword_for_tag(Tag(key))
+        return keyword if keyword in HEADER_TAG_KEYWORDS else None
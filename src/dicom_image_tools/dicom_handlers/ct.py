@@ -1,21 +1,33 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pydicom
+from numpy.typing import DTypeLike
 from plotly import graph_objects as go
 from pydicom import FileDataset
 from scipy import ndimage
 from scipy.ndimage import center_of_mass
-from skimage import morphology
 
 from ..helpers.check_path_is_valid import check_path_is_valid_path
+from ..helpers.dicom_header import read_dicom_header
+from ..helpers.lazy_image_volume import LazyImageVolume
+from ..helpers.masked_statistics import get_masked_statistics
 from ..helpers.normalize_dicom_exposure_parameters import get_xray_tube_current_in_ma
+from ..helpers.packed_mask import PackedMask
 from ..helpers.patient_centering import PatientGeometricalOffset, PatientMassCenter
-from ..helpers.pixel_data import get_pixel_array
+from ..helpers import patient_segmentation
+from ..helpers.pixel_data import (
+    RescaledPixelArray,
+    get_pixel_array,
+    validate_pixel_data_dtype,
+)
 from ..helpers.voxel_data import VoxelData
 from ..helpers.window import get_default_window_settings
+from ..helpers.workers import validate_workers
+from ..image_quality.variance_image import get_variance_volume
 from ..plotting.plotly import (
     create_stack_plot,
     get_image_and_roi_traces_and_layout,
@@ -23,15 +35,21 @@ from ..plotting.plotly import (
 )
 from ..roi.roi import Roi
 from .dicom_series import DicomSeries
+from .result_cache import ResultCache
 
 log = logging.getLogger(__name__)
 
+# Engines available for the patient segmentation in CtSeries.get_patient_mask
+PATIENT_MASK_ENGINES = ["loop", "vectorized", "chunked"]
+
 
 class CtSeries(DicomSeries):
     """A class to manage DICOM files from CT connected by a Series Instance UID
 
     Args:
         series_instance_uid: Series instance UID of the object to be created
+        compact_metadata: Keep a CompactMetadata record for each slice instead of the complete dataset. Defaults to
+            False
 
     Attributes:
         kV: Tube voltage used for each image in kV
@@ -39,7 +57,8 @@ class CtSeries(DicomSeries):
         SlicePosition: List of slice locations (in mm)
         Manufacturer: The name of the manufacturer of the CT machine
         ManufacturersModelName: The model name specified by the manufacturer as given in the DICOM file
-        Mask: A mask covering the patient, created in the get_patient_mask method
+        Mask: A mask covering the patient, created in the get_patient_mask method. A PackedMask for the "chunked"
+            engine
         MaskSuccess: A boolean saying if the patient mask creationg was successful or not
         PatientClipped: A boolean specifying if the masked patient contour touches the any of the edges of the image
                         volume
@@ -53,11 +72,17 @@ class CtSeries(DicomSeries):
 
     """
 
-    def __init__(self, series_instance_uid: str):
-        super().__init__(series_instance_uid=series_instance_uid)
+    def __init__(self, series_instance_uid: str, compact_metadata: bool = False):
+        super().__init__(series_instance_uid=series_instance_uid, compact_metadata=compact_metadata)
         self.kV: Optional[List[float]] = None
         self.mA: Optional[List[Optional[float]]] = None
-        self.SlicePosition: Optional[List[float]] = []
+        self._slice_position: List[float] = []
+        self._sop_instance_uids: List[Optional[str]] = []
+        self._slice_order_pending: bool = False
+        self._pixel_data_dtype: Optional[str] = None
+        self._pixel_data_policy: str = "float64"
+        self._patient_mask_parameters: Optional[Tuple[int, bool, str]] = None
+        self._eroded_mask: Optional[np.ndarray] = None
         self.Manufacturer: Optional[str] = None
         self.ManufacturersModelName: Optional[str] = None
 
@@ -75,52 +100,175 @@ class CtSeries(DicomSeries):
         self.MeanHuPatientVolume: Optional[float] = None
         self.MedianHuPatientVolume: Optional[float] = None
 
-    def add_file(self, file: Union[Path, str], dcm: Optional[FileDataset] = None) -> None:
+    def add_file(self, file: Union[Path, str], dcm: Optional[FileDataset] = None, incremental: bool = False) -> None:
         """Add a file to the objects list of files.
 
         First performs a check that the file is a valid DICOM file and that it is a CT file.
         List properties are emptied to prevent mismatch between them, the FilePaths and SlicePosition
 
+        The files are sorted on slice position once the FilePaths or SlicePosition are accessed, so adding all files of
+        a series only sorts them once.
+
+        In incremental mode an imported image volume is kept and only the added slice is decoded and inserted at its
+        slice position. If the patient has been segmented, the patient mask is updated for the inserted slice and the
+        slices next to it that are affected by the table removal, and the statistics and mass centres of the updated
+        slices and of the volume are recalculated. Incremental mode is only used for image volumes imported with the
+        "float64" or "float32" data types and, if segmented, with the "loop" or "vectorized" engine. Otherwise the
+        imported data is emptied as in the default mode.
+
+        Args:
+            file: Path to where the file to be added is stored on disk
+            dcm: The DICOM-file imported to a FileDataset object
+            incremental: Update the imported image volume and patient mask for the added file instead of emptying them.
+                Defaults to False
+
         Raises:
             ValueError: If supplied file is not a CT image
 
         """
         file = check_path_is_valid_path(path_to_check=file)
 
+        if self._contains_file(file):
+            # Return None since the file is already in the volume
+            return
+
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            # Only the routing and ordering tags are used when adding the file
+            dcm = read_dicom_header(file=file, selective=True)
 
         if dcm.Modality.upper() != "CT":
             raise ValueError(f"The supplied file is not a CT image. (supplied modality: {dcm.Modality}")
 
-        self.ImageVolume = None
-        self.kV = []
-        self.mA = []
-        self.PatientMassCenterImage = []
-        self.PatientMassCenterVolume = None
-        self.PatientGeometricalOffset = None
-        self.MeanHuPatientVolume = None
-        self.MeanHuPatientImage = []
-        self.MedianHuPatientVolume = None
-        self.MedianHuPatientImage = []
-        self.Mask = None
-        self.MaskSuccess = None
-        self.PatientClipped = None
+        slice_dcm, px = None, None
+        if incremental and self._can_add_file_incrementally():
+            slice_dcm, px = self._read_slice(fp=file, lazy=False, dtype=self._pixel_data_dtype)
+            if px.shape != self.ImageVolume.shape[:2]:
+                log.debug(f"The image size of {file} does not match the image volume, emptying the imported data")
+                slice_dcm, px = None, None
+
+        if px is None:
+            self.ImageVolume = None
+            self.kV = []
+            self.mA = []
+            self.PatientMassCenterImage = []
+            self.PatientMassCenterVolume = None
+            self.PatientGeometricalOffset = None
+            self.MeanHuPatientVolume = None
+            self.MeanHuPatientImage = []
+            self.MedianHuPatientVolume = None
+            self.MedianHuPatientImage = []
+            self.Mask = None
+            self.MaskSuccess = None
+            self.PatientClipped = None
+            self._patient_mask_parameters = None
+            self._eroded_mask = None
 
         super().add_file(file=file, dcm=dcm)
         self.Manufacturer = dcm.Manufacturer
         self.ManufacturersModelName = dcm.ManufacturerModelName if "ManufacturerModelName" in dcm else None
-        self.SlicePosition.append(self._get_slice_position(dcm))
+        self._slice_position.append(self._get_slice_position(dcm))
+        self._sop_instance_uids.append(dcm.get("SOPInstanceUID"))
+        self._slice_order_pending = True
+
+        if px is not None:
+            self._insert_added_slice(file=file, dcm=slice_dcm, px=px)
+
+    def _can_add_file_incrementally(self) -> bool:
+        if type(self.ImageVolume) is not np.ndarray or self._pixel_data_dtype not in ["float64", "float32"]:
+            return False
+
+        if self.ImageVolume.shape[2] != len(self._file_paths) or len(self.kV) != len(self._file_paths):
+            return False
+
+        if self.Mask is None:
+            return True
+
+        return isinstance(self.Mask, np.ndarray) and self._patient_mask_parameters is not None
+
+    def _insert_added_slice(self, file: Path, dcm: FileDataset, px: np.ndarray) -> None:
+        # Insert the decoded slice and its metadata at the slice position of the added file
+        self._finalize_file_order()
+        index = self._file_paths.index(file)
+        log.debug(f"Inserting {file} at index {index} of the image volume")
+
+        self.ImageVolume = np.insert(self.ImageVolume, index, px, axis=2)
+        self.kV.insert(index, float(dcm.KVP) if dcm.KVP else None)
+        self.mA.insert(index, get_xray_tube_current_in_ma(dcm))
+        self.VoxelData.insert(
+            index, VoxelData(x=float(dcm.PixelSpacing[1]), y=float(dcm.PixelSpacing[0]), z=float(dcm.SliceThickness))
+        )
+        self.CompleteMetadata.insert(index, self._get_metadata_record(file=file, dcm=dcm))
+
+        if self.Mask is not None:
+            self._update_patient_mask_for_inserted_slice(index=index)
+
+    @property
+    def SlicePosition(self) -> List[float]:
+        self._finalize_file_order()
+        return self._slice_position
+
+    @SlicePosition.setter
+    def SlicePosition(self, slice_position: List[float]) -> None:
+        self._finalize_file_order()
+        self._slice_position = slice_position
+
+    @property
+    def SopInstanceUids(self) -> List[Optional[str]]:
+        """The SOPInstanceUIDs of the added files, in slice order"""
+        self._finalize_file_order()
+        return self._sop_instance_uids
+
+    def _finalize_file_order(self) -> None:
+        if not self._slice_order_pending:
+            return
 
         # Reorder lists according to slice positions
-        file_order = [ind for ind in list(np.argsort(np.array(self.SlicePosition)))]
-        self.FilePaths = [self.FilePaths[ind] for ind in file_order]
-        self.SlicePosition = [self.SlicePosition[ind] for ind in file_order]
+        self._slice_order_pending = False
+        file_order = np.argsort(np.array(self._slice_position), kind="stable")
+        self.FilePaths = [self._file_paths[ind] for ind in file_order]
+        self._slice_position = [self._slice_position[ind] for ind in file_order]
+        self._sop_instance_uids = [self._sop_instance_uids[ind] for ind in file_order]
 
-    def import_image_volume(self) -> None:
+    def import_image_volume(
+        self,
+        lazy: bool = False,
+        backing_dtype: DTypeLike = np.float32,
+        memory_map: bool = True,
+        dtype: str = "float64",
+        workers: Optional[int] = None,
+    ) -> None:
         """Import the files in the CtVolume and insert them into the ImageVolumeProperty. Also add metadata for each
         image into the respective property.
+
+        In lazy mode only the headers are read, and the ImageVolume is a
+        :class:`~dicom_image_tools.helpers.lazy_image_volume.LazyImageVolume` that decodes each slice the first time it
+        is accessed. This makes it possible to work with series that do not fit in memory.
+
+        With the "native" data type the stored pixel values are kept, and the ImageVolume is a
+        :class:`~dicom_image_tools.helpers.pixel_data.RescaledPixelArray` that applies the rescale slope and intercept
+        of each slice when accessed.
+
+        The slices can be read and decoded in parallel by specifying the number of workers. Each slice is written
+        directly into its place in the image volume, and the metadata is kept in slice order.
+
+        Args:
+            lazy: Decode the slices on first access instead of on import. Defaults to False
+            backing_dtype: The data type used for storing the decoded slices in lazy mode. Defaults to numpy.float32
+            memory_map: Store the decoded slices in a memory-mapped temporary file in lazy mode. Defaults to True
+            dtype: The data type to decode the pixel data to, one of "float64", "float32" and "native". Defaults to
+                "float64"
+            workers: The number of threads to read and decode the slices with. Defaults to None, i.e., a serial import
+
+        Raises:
+            TypeError: If dtype is not a string or if workers is not an integer
+            ValueError: If dtype is not one of the supported pixel data types or if workers is less than 1
+
         """
+        validate_pixel_data_dtype(dtype=dtype)
+        validate_workers(workers=workers)
+        self._pixel_data_dtype = None if lazy else dtype
+        self._pixel_data_policy = f"lazy {dtype} in {np.dtype(backing_dtype).name}" if lazy else dtype
+
         # Remove any previously imported image volume
         self.ImageVolume = None
         self.kV = []
@@ -130,14 +278,46 @@ class CtSeries(DicomSeries):
         self.VoxelData = []
         self.CompleteMetadata = []
 
-        for ind, fp in enumerate(self.FilePaths):
-            dcm = pydicom.dcmread(fp=str(fp.absolute()))
-            px = get_pixel_array(dcm=dcm)
+        if not len(self.FilePaths):
+            return
 
-            if self.ImageVolume is None:
-                self.ImageVolume = np.empty((px.shape[0], px.shape[1], len(self.FilePaths)))
+        slice_count = len(self.FilePaths)
+        rescale_slope = np.ones((1, 1, slice_count))
+        rescale_intercept = np.zeros((1, 1, slice_count))
+
+        # The first slice gives the shape and data type of the image volume, the remaining slices are written into it
+        first_dcm, px = self._read_slice(
+            fp=self.FilePaths[0], lazy=lazy, dtype=dtype, selective=self.UseCompactMetadata
+        )
+        volume = None
+        if px is not None:
+            stored = px.StoredValues if isinstance(px, RescaledPixelArray) else px
+            volume = np.empty((stored.shape[0], stored.shape[1], slice_count), dtype=stored.dtype)
+            self._insert_slice(
+                ind=0, px=px, volume=volume, rescale_slope=rescale_slope, rescale_intercept=rescale_intercept
+            )
+
+        def import_slice(ind: int) -> FileDataset:
+            dcm, slice_px = self._read_slice(
+                fp=self.FilePaths[ind], lazy=lazy, dtype=dtype, selective=self.UseCompactMetadata
+            )
+            if slice_px is not None:
+                self._insert_slice(
+                    ind=ind,
+                    px=slice_px,
+                    volume=volume,
+                    rescale_slope=rescale_slope,
+                    rescale_intercept=rescale_intercept,
+                )
+            return dcm
+
+        if workers is None or workers == 1:
+            datasets = [first_dcm] + [import_slice(ind) for ind in range(1, slice_count)]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                datasets = [first_dcm] + list(executor.map(import_slice, range(1, slice_count)))
 
-            self.ImageVolume[:, :, ind] = px
+        for fp, dcm in zip(self.FilePaths, datasets):
             self.kV.append(float(dcm.KVP) if dcm.KVP else None)
             self.mA.append(get_xray_tube_current_in_ma(dcm))
 
@@ -147,14 +327,58 @@ class CtSeries(DicomSeries):
                 VoxelData(x=float(dcm.PixelSpacing[1]), y=float(dcm.PixelSpacing[0]), z=float(dcm.SliceThickness))
             )
 
-            # Remove pixel data part of dcm to decrease memory used for the object
+            self.CompleteMetadata.append(self._get_metadata_record(file=fp, dcm=dcm))
+
+        if lazy:
+            self.ImageVolume = LazyImageVolume(
+                file_paths=self.FilePaths,
+                shape=(int(first_dcm.Rows), int(first_dcm.Columns), slice_count),
+                dtype=backing_dtype,
+                memory_map=memory_map,
+                pixel_dtype=dtype,
+            )
+        elif dtype == "native":
+            self.ImageVolume = RescaledPixelArray(
+                stored_values=volume, slope=rescale_slope, intercept=rescale_intercept
+            )
+        else:
+            self.ImageVolume = volume
+
+    @staticmethod
+    def _read_slice(
+        fp: Path, lazy: bool, dtype: str, selective: bool = False
+    ) -> Tuple[FileDataset, Optional[Union[np.ndarray, RescaledPixelArray]]]:
+        if lazy:
+            return read_dicom_header(file=fp, selective=selective), None
+
+        dcm = pydicom.dcmread(fp=str(fp.absolute()))
+        px = get_pixel_array(dcm=dcm, dtype=dtype)
+
+        # Remove pixel data part of dcm to decrease memory used for the object
+        if "PixelData" in dcm:
             try:
                 del dcm[0x7FE00010]
             except Exception as e:
                 log.debug(f"Could not remove pixel data from dataset ({fp.absolute()})")
                 pass
 
-            self.CompleteMetadata.append(dcm)
+        return dcm, px
+
+    @staticmethod
+    def _insert_slice(
+        ind: int,
+        px: Union[np.ndarray, RescaledPixelArray],
+        volume: np.ndarray,
+        rescale_slope: np.ndarray,
+        rescale_intercept: np.ndarray,
+    ) -> None:
+        if isinstance(px, RescaledPixelArray):
+            volume[:, :, ind] = px.StoredValues
+            rescale_slope[0, 0, ind] = px.Slope
+            rescale_intercept[0, 0, ind] = px.Intercept
+            return
+
+        volume[:, :, ind] = px
 
     @staticmethod
     def _get_slice_position(dcm: FileDataset) -> float:
@@ -166,92 +390,211 @@ class CtSeries(DicomSeries):
 
         return float(dcm.InstanceNumber)
 
-    def get_patient_mask(self, threshold: Optional[int] = -500, remove_table: Optional[bool] = False):
+    def get_patient_mask(
+        self,
+        threshold: Optional[int] = -500,
+        remove_table: Optional[bool] = False,
+        engine: str = "loop",
+        slab_size: int = 64,
+        cache: Optional[ResultCache] = None,
+    ):
         """Segment the ImageVolume to find the patient/phantom in the images.
 
+        The "vectorized" engine gives the same results as the "loop" engine but keeps the mask boolean, fills the holes
+        of all slices in one labelling pass and calculates the centres of mass with reductions over the volume instead
+        of per-slice loops. The "chunked" engine gives the same results as the other engines for long scans that do not
+        fit in memory: the volume is segmented slab_size slices at a time with
+        :func:`~dicom_image_tools.helpers.patient_segmentation.get_patient_mask_chunked` and the mask is kept as a
+        :class:`~dicom_image_tools.helpers.packed_mask.PackedMask` with one bit per voxel. The mean and median HU are
+        calculated with :func:`~dicom_image_tools.helpers.masked_statistics.get_masked_statistics` by all engines.
+        Slices without any masked voxels get NaN statistics.
+
+        If a result cache is given, the mask and the results calculated from it are loaded from the cache if the series
+        has been segmented with the same threshold, table removal and pixel data type before, and stored in the cache
+        otherwise. An image volume that has not been imported is imported as when the mask is calculated, so the series
+        is left in the same state whether or not the results are loaded from the cache.
+
         Args:
             threshold: HU value to use as threshold. Defaults to -500
             remove_table: Specify if the CT table should be removed from the image. Defaults to False
+            engine: The segmentation engine to use, one of "loop", "vectorized" and "chunked". Defaults to "loop"
+            slab_size: The number of slices to segment at a time with the "chunked" engine. Defaults to 64
+            cache: A cache to load the results from, or store them in. Defaults to None, i.e., no caching
 
         Raises:
             TypeError: If threshold is not an integer
             ValueError: If there is not image volume to segment
+            ValueError: If engine is not one of the supported engines
 
         """
         if not isinstance(threshold, int):
             raise TypeError("The threshold must be given as an integer")
 
+        if engine not in PATIENT_MASK_ENGINES:
+            raise ValueError(f"The engine must be one of {', '.join(PATIENT_MASK_ENGINES)}")
+
+        cache_key = None
+        if cache is not None and len(self.SopInstanceUids) == len(self.FilePaths) and None not in self.SopInstanceUids:
+            cache_key = cache.get_key(
+                "patient_mask",
+                self.SopInstanceUids,
+                threshold=threshold,
+                remove_table=bool(remove_table),
+                pixel_data=self._get_pixel_data_policy(),
+            )
+            cached_result = cache.load(cache_key)
+            if cached_result is not None:
+                log.info("Loaded patient mask from the cache")
+                if self.ImageVolume is None:
+                    self.import_image_volume()
+                self._restore_patient_mask_result(result=cached_result, packed=engine == "chunked")
+                self._patient_mask_parameters = (threshold, bool(remove_table), engine)
+                self._eroded_mask = None
+                return
+
         if self.ImageVolume is None:
             self.import_image_volume()
             if self.ImageVolume is None:
                 raise ValueError("Found no image volume to segment")
 
-        self.Mask = np.zeros(self.ImageVolume.shape)
-        self.Mask[self.ImageVolume >= threshold] = 1
+        self._eroded_mask = None
+        if engine == "chunked":
+            self.Mask = patient_segmentation.get_patient_mask_chunked(
+                image_volume=self.ImageVolume,
+                threshold=threshold,
+                remove_table_from_mask=remove_table,
+                slab_size=slab_size,
+            )
+            image_volume = self.ImageVolume
+        else:
+            # Lazy image volumes are decoded into their backing store
+            image_volume = np.asarray(self.ImageVolume)
+
+            self.Mask = image_volume >= threshold
 
-        if remove_table:
-            # Remove the table by eroding and dilating the image volume
-            if self.Mask.shape[2] > 2:
-                self.Mask = morphology.binary_erosion(image=self.Mask, footprint=morphology.cube(width=3))
+            if remove_table:
+                # The eroded mask is kept for updating the mask when slices are added incrementally
+                eroded_mask = patient_segmentation.erode_mask(mask=self.Mask)
+                self._eroded_mask = eroded_mask if eroded_mask.shape[2] > 2 else None
+                self.Mask = patient_segmentation.dilate_mask(
+                    mask=patient_segmentation.select_central_component(mask=eroded_mask)
+                )
+
+            if engine == "vectorized":
+                self.Mask = patient_segmentation.fill_holes_slice_wise(mask=self.Mask)
             else:
                 for i in range(self.Mask.shape[2]):
-                    self.Mask[:, :, i] = morphology.binary_erosion(
-                        image=self.Mask[:, :, i], footprint=morphology.disk(radius=3)
-                    )
+                    self.Mask[:, :, i] = ndimage.binary_fill_holes(self.Mask[:, :, i]).astype(int)
+
+        mask_sum = self.Mask.count_nonzero() if isinstance(self.Mask, PackedMask) else np.sum(self.Mask)
+        if mask_sum > 0:
+            log.info("Axial images segmented successfully")
+            self.MaskSuccess = True
+
+        if engine == "chunked":
+            self._set_patient_mass_centers_vectorized(slab_size=slab_size)
+        elif engine == "vectorized":
+            self.Mask = self.Mask.astype(bool)
+            self._set_patient_mass_centers_vectorized()
+        else:
+            self.Mask = self.Mask.astype(bool)
+            tmp_mass_center = [center_of_mass(input=self.Mask[:, :, ind]) for ind in range(self.Mask.shape[2])]
+            self.PatientMassCenterImage = [PatientMassCenter(x=obj[1], y=obj[0]) for obj in tmp_mass_center]
+
+            if self.Mask.shape[2] > 1:
+                tmp_mass_center = center_of_mass(input=self.Mask)
+                self.PatientMassCenterVolume = PatientMassCenter(
+                    x=tmp_mass_center[1], y=tmp_mass_center[0], z=tmp_mass_center[2]
+                )
+            else:
+                self.PatientMassCenterVolume = self.PatientMassCenterImage[0]
 
-            self.Mask, nb_labels = ndimage.label(self.Mask)
+        # Try to get the patient geometrical offset
+        try:
+            self._get_patient_geometrical_offset()
+        except Exception as e:
+            log.warning("Could not calculate patient geometrical offset", e)
 
-            central_position = [
-                int(np.floor(np.divide(float(self.Mask.shape[0]), 2.0))),
-                int(np.floor(np.divide(float(self.Mask.shape[1]), 2.0))),
-                int(np.floor(np.divide(float(self.Mask.shape[2]), 2.0))),
+        # Check if patient is clipped
+        self.PatientClipped = any(
+            [
+                np.sum(self.Mask[0, :, :]) > 0,
+                np.sum(self.Mask[-1, :, :]) > 0,
+                np.sum(self.Mask[:, 0, :]) > 0,
+                np.sum(self.Mask[:, -1, :]) > 0,
             ]
+        )
 
-            central_blob = np.max(
-                self.Mask[
-                    (central_position[0] - 2) : (central_position[0] + 3),
-                    (central_position[1] - 2) : (central_position[1] + 3),
-                    central_position[2],
-                ]
-            )
+        # Calculate mean and median values
+        statistics = get_masked_statistics(image_volume=image_volume, mask=self.Mask)
 
-            self.Mask[self.Mask != central_blob] = 0
-            self.Mask[self.Mask == central_blob] = 1
+        self.MeanHuPatientImage = statistics.slice_mean
+        self.MedianHuPatientImage = statistics.slice_median
+        self.MeanHuPatientVolume = statistics.volume_mean
+        self.MedianHuPatientVolume = statistics.volume_median
 
-            if self.Mask.shape[2] > 2:
-                self.Mask = morphology.binary_dilation(image=self.Mask, footprint=morphology.cube(width=3))
-            else:
-                for i in range(self.Mask.shape[2]):
-                    self.Mask[:, :, i] = morphology.binary_dilation(
-                        image=self.Mask[:, :, i], footprint=morphology.disk(radius=3)
-                    )
+        self._patient_mask_parameters = (threshold, bool(remove_table), engine)
 
-        for i in range(self.Mask.shape[2]):
-            self.Mask[:, :, i] = ndimage.binary_fill_holes(self.Mask[:, :, i]).astype(int)
+        if cache_key is not None:
+            cache.store(cache_key, self._get_patient_mask_result())
 
-        if np.sum(self.Mask) > 0:
-            log.info("Axial images segmented successfully")
-            self.MaskSuccess = True
+    def _update_patient_mask_for_inserted_slice(self, index: int) -> None:
+        threshold, remove_table, engine = self._patient_mask_parameters
 
-        self.Mask = self.Mask.astype(bool)
-        tmp_mass_center = [center_of_mass(input=self.Mask[:, :, ind]) for ind in range(self.Mask.shape[2])]
-        self.PatientMassCenterImage = [PatientMassCenter(x=obj[1], y=obj[0]) for obj in tmp_mass_center]
+        if remove_table and self._eroded_mask is None:
+            # The table removal of series with up to two slices is done slice by slice, and cached masks are restored
+            # without the eroded mask, so the complete image volume is segmented again
+            log.debug("Segmenting the complete image volume again after inserting a slice")
+            self.PatientGeometricalOffset = None
+            self.get_patient_mask(threshold=threshold, remove_table=remove_table, engine=engine)
+            return
 
-        if self.Mask.shape[2] > 1:
-            tmp_mass_center = center_of_mass(input=self.Mask)
-            self.PatientMassCenterVolume = PatientMassCenter(
-                x=tmp_mass_center[1], y=tmp_mass_center[0], z=tmp_mass_center[2]
+        if remove_table:
+            self.Mask, self._eroded_mask, updated = patient_segmentation.insert_slice_in_table_removed_mask(
+                image_volume=self.ImageVolume,
+                mask=self.Mask,
+                eroded_mask=self._eroded_mask,
+                index=index,
+                threshold=threshold,
             )
         else:
-            self.PatientMassCenterVolume = self.PatientMassCenterImage[0]
+            slice_mask = ndimage.binary_fill_holes(self.ImageVolume[:, :, index] >= threshold)
+            self.Mask = np.insert(self.Mask, index, slice_mask, axis=2)
+            updated = np.array([index])
 
-        # Try to get the patient geometrical offset
+        log.debug(f"Updating the patient mask results of {len(updated)} slices")
+
+        if np.any(self.Mask[:, :, updated]):
+            self.MaskSuccess = True
+
+        self.MeanHuPatientImage.insert(index, np.nan)
+        self.MedianHuPatientImage.insert(index, np.nan)
+        statistics = get_masked_statistics(image_volume=self.ImageVolume[:, :, updated], mask=self.Mask[:, :, updated])
+        for ind, slice_index in enumerate(updated):
+            self.MeanHuPatientImage[slice_index] = statistics.slice_mean[ind]
+            self.MedianHuPatientImage[slice_index] = statistics.slice_median[ind]
+
+        statistics = get_masked_statistics(image_volume=self.ImageVolume, mask=self.Mask, per_slice=False)
+        self.MeanHuPatientVolume = statistics.volume_mean
+        self.MedianHuPatientVolume = statistics.volume_median
+
+        if engine == "vectorized":
+            self._set_patient_mass_centers_vectorized()
+        else:
+            self.PatientMassCenterImage.insert(index, None)
+            for slice_index in updated:
+                mass_center = center_of_mass(input=self.Mask[:, :, slice_index])
+                self.PatientMassCenterImage[slice_index] = PatientMassCenter(x=mass_center[1], y=mass_center[0])
+
+            mass_center = center_of_mass(input=self.Mask)
+            self.PatientMassCenterVolume = PatientMassCenter(x=mass_center[1], y=mass_center[0], z=mass_center[2])
+
+        self.PatientGeometricalOffset = None
         try:
             self._get_patient_geometrical_offset()
         except Exception as e:
             log.warning("Could not calculate patient geometrical offset", e)
 
-        # Check if patient is clipped
         self.PatientClipped = any(
             [
                 np.sum(self.Mask[0, :, :]) > 0,
@@ -261,13 +604,147 @@ class CtSeries(DicomSeries):
             ]
         )
 
-        # Calculate mean and median values
-        tmp_masked_image = np.ma.array(self.ImageVolume, mask=np.logical_not(self.Mask))
+    def get_variance_volume(
+        self,
+        window_side_x: int = 3,
+        window_side_y: int = 3,
+        window_side_z: int = 1,
+        masked: bool = False,
+        standard_deviation: bool = False,
+        slab_size: Optional[int] = 64,
+        dtype: DTypeLike = np.float64,
+    ) -> np.ndarray:
+        """Calculate a local variance, or noise, map of the ImageVolume, e.g., for CT noise quality assurance
+
+        See :func:`~dicom_image_tools.image_quality.variance_image.get_variance_volume`. The image volume is imported if
+        it has not been imported.
+
+        Args:
+            window_side_x: The horizontal side (columns) of the rolling window applied. Defaults to 3
+            window_side_y: The vertical side (rows) of the rolling window applied. Defaults to 3
+            window_side_z: The side of the rolling window applied along the slices. Defaults to 1, i.e., slice by slice
+            masked: Restrict the windows to the patient mask created by get_patient_mask. Voxels outside of the mask get
+                NaN. Defaults to False
+            standard_deviation: Return the local standard deviation instead of the variance. Defaults to False
+            slab_size: The number of slices to process at a time. Defaults to 64
+            dtype: The data type of the returned volume. Defaults to numpy.float64
+
+        Raises:
+            ValueError: If there is no image volume, or if masked is True and the patient has not been segmented
+
+        Returns:
+            The local variance, or standard deviation, of each voxel in the shape of the ImageVolume
+
+        """
+        if masked and self.Mask is None:
+            raise ValueError("The patient must be segmented with get_patient_mask before a masked variance volume")
+
+        if self.ImageVolume is None:
+            self.import_image_volume()
+            if self.ImageVolume is None:
+                raise ValueError("Found no image volume to calculate the variance volume for")
+
+        return get_variance_volume(
+            image_volume=self.ImageVolume,
+            window_side_x=window_side_x,
+            window_side_y=window_side_y,
+            window_side_z=window_side_z,
+            mask=self.Mask if masked else None,
+            standard_deviation=standard_deviation,
+            slab_size=slab_size,
+            dtype=dtype,
+        )
+
+    def _get_patient_mask_result(self) -> Dict[str, np.ndarray]:
+        # The arrays stored in the result cache by get_patient_mask
+        packed_mask = self.Mask.Packed if isinstance(self.Mask, PackedMask) else np.packbits(self.Mask, axis=1)
+        volume_center = self.PatientMassCenterVolume
+
+        return {
+            "mask": packed_mask,
+            "mask_shape": np.array(self.Mask.shape),
+            "mask_success": np.array(bool(self.MaskSuccess)),
+            "patient_clipped": np.array(bool(self.PatientClipped)),
+            "mass_center_image": np.array(
+                [[center.x, center.y] for center in self.PatientMassCenterImage], dtype=float
+            ).reshape(-1, 2),
+            "mass_center_volume": np.array(
+                [volume_center.x, volume_center.y, np.nan if volume_center.z is None else volume_center.z]
+            ),
+            "geometrical_offset": np.array(
+                [[offset.x, offset.y] for offset in self.PatientGeometricalOffset or []], dtype=float
+            ).reshape(-1, 2),
+            "mean_hu_image": np.array(self.MeanHuPatientImage, dtype=float),
+            "median_hu_image": np.array(self.MedianHuPatientImage, dtype=float),
+            "mean_hu_volume": np.array(self.MeanHuPatientVolume, dtype=float),
+            "median_hu_volume": np.array(self.MedianHuPatientVolume, dtype=float),
+        }
+
+    def _get_pixel_data_policy(self) -> str:
+        # How the pixel data is decoded and stored, which the results calculated from the image volume depend on. An
+        # image volume that has not been imported is imported with the default data type when it is needed
+        return self._pixel_data_policy if self.ImageVolume is not None else "float64"
+
+    def _restore_patient_mask_result(self, result: Dict[str, np.ndarray], packed: bool) -> None:
+        mask_shape = tuple(int(value) for value in result["mask_shape"])
+        if packed:
+            self.Mask = PackedMask(shape=mask_shape)
+            self.Mask.Packed[...] = result["mask"]
+        else:
+            self.Mask = np.unpackbits(result["mask"], axis=1, count=mask_shape[1]).astype(bool)
+
+        self.MaskSuccess = True if result["mask_success"] else None
+        self.PatientClipped = bool(result["patient_clipped"])
+        self.PatientMassCenterImage = [PatientMassCenter(x=x, y=y) for x, y in result["mass_center_image"].tolist()]
+
+        x, y, z = result["mass_center_volume"].tolist()
+        self.PatientMassCenterVolume = PatientMassCenter(x=x, y=y, z=None if np.isnan(z) else z)
+
+        self.PatientGeometricalOffset = [
+            PatientGeometricalOffset(x=x, y=y) for x, y in result["geometrical_offset"].tolist()
+        ] or None
+
+        self.MeanHuPatientImage = result["mean_hu_image"].tolist()
+        self.MedianHuPatientImage = result["median_hu_image"].tolist()
+        self.MeanHuPatientVolume = float(result["mean_hu_volume"])
+        self.MedianHuPatientVolume = float(result["median_hu_volume"])
+
+    def _set_patient_mass_centers_vectorized(self, slab_size: Optional[int] = None) -> None:
+        # Project the mask onto the row and column axes and reduce the projections with the coordinates. The mask is
+        # projected slab_size slices at a time so that a packed mask is only unpacked one slab at a time
+        slab_size = self.Mask.shape[2] if slab_size is None else slab_size
+        row_projections = []
+        column_projections = []
+        for start in range(0, self.Mask.shape[2], slab_size):
+            slab = self.Mask[:, :, start : start + slab_size]
+            row_projections.append(slab.sum(axis=1, dtype=np.int64))
+            column_projections.append(slab.sum(axis=0, dtype=np.int64))
+
+        row_projection = np.concatenate(row_projections, axis=1)
+        column_projection = np.concatenate(column_projections, axis=1)
+
+        voxel_count = row_projection.sum(axis=0)
+        row_sum = np.arange(self.Mask.shape[0], dtype=float) @ row_projection
+        column_sum = np.arange(self.Mask.shape[1], dtype=float) @ column_projection
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            row_center = row_sum / voxel_count
+            column_center = column_sum / voxel_count
+
+        self.PatientMassCenterImage = [
+            PatientMassCenter(x=float(column_center[ind]), y=float(row_center[ind])) for ind in range(len(voxel_count))
+        ]
 
-        self.MeanHuPatientImage = list(tmp_masked_image.mean(axis=(0, 1)))
-        self.MedianHuPatientImage = list(np.ma.median(tmp_masked_image, axis=(0, 1)))
-        self.MeanHuPatientVolume = tmp_masked_image.mean(axis=None)
-        self.MedianHuPatientVolume = np.ma.median(tmp_masked_image, axis=None)
+        if self.Mask.shape[2] > 1:
+            total_count = voxel_count.sum()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.PatientMassCenterVolume = PatientMassCenter(
+                    x=float(column_sum.sum() / total_count),
+                    y=float(row_sum.sum() / total_count),
+                    z=float(np.arange(self.Mask.shape[2], dtype=float) @ voxel_count / total_count),
+                )
+        else:
+            self.PatientMassCenterVolume = self.PatientMassCenterImage[0]
 
     def _get_patient_geometrical_offset(self):
         """Calculate the patient/phantom geometrical offset from isocenter
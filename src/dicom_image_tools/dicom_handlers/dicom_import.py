@@ -1,27 +1,65 @@
 import logging
+import os
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import pydicom
 from pydicom.errors import InvalidDicomError
 
 from ..helpers.check_path_is_valid import check_path_is_valid_path
+from ..helpers.dicom_header import read_dicom_header
+from ..helpers.workers import validate_workers
 from .ct import CtSeries
 from .dicom_study import DicomStudy
 from .dose_matrix import DoseMatrix
+from .header_index import HeaderIndex
 
 logger = logging.getLogger(__name__)
 
+# Number of header reads queued per worker before the oldest result is merged
+_READ_AHEAD_PER_WORKER = 64
 
-def import_dicom_from_folder(folder: Union[Path, str], recursively: bool = True) -> Dict[str, DicomStudy]:
+
+def import_dicom_from_folder(
+    folder: Union[Path, str],
+    recursively: bool = True,
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    index: Optional[Union[HeaderIndex, Path, str]] = None,
+    compact_metadata: bool = False,
+    selective_read: bool = False,
+) -> Dict[str, DicomStudy]:
     """Go through a folder and import all valid DICOM images found
 
+    The DICOM headers can be read in parallel by specifying the number of workers. The headers are still added to the
+    studies in the order the files were found, so the result is identical to the one from a serial import.
+
+    If a header index is given, files that have not changed since they were indexed are served from the index instead
+    of being parsed again. New and modified files are parsed and added to the index. The series keep CompactMetadata
+    records of the indexed tags for files served from the index, and re-read the complete header when it is needed.
+
+    With selective_read only the header tags used by the package are parsed, which saves time and memory for headers
+    with large sequences and private blocks. The same note as for the header index applies to the series metadata.
+    The pixel data and the complete headers are still read when the image volumes are imported.
+
     Args:
         folder: Path of the folder to search for DICOM files
         recursively: Specification if the folder should be search recursively. Defaults to True
+        workers: The number of workers to read the DICOM headers with. Defaults to None, i.e., a serial import
+        use_processes: Use a process pool instead of a thread pool for the header reads. Defaults to False
+        index: A HeaderIndex, or the path to the index file, to serve unchanged headers from. Defaults to None
+        compact_metadata: Let the series keep CompactMetadata records instead of the complete datasets of the files.
+            Defaults to False
+        selective_read: Only parse the header tags used by the package when scanning the files. Defaults to False
 
     Raises:
         TypeError: If the given folder is not a Path object
+        TypeError: If workers is not an integer
+        TypeError: If index is neither a HeaderIndex nor a path
+        ValueError: If workers is less than 1
         ValueError: If the given folder is not a directory
         ValueError: If no valid DICOM files were found in the search of the given folder
 
@@ -29,10 +67,7 @@ def import_dicom_from_folder(folder: Union[Path, str], recursively: bool = True)
         A dictionary on the form {<study-instance-uid>: <DicomStudy object>}
 
     """
-    folder = check_path_is_valid_path(path_to_check=folder)
-
-    if not folder.is_dir():
-        raise ValueError("The given folder is not a directory")
+    folder = _validate_import_arguments(folder=folder, workers=workers, index=index)
 
     files = folder.iterdir()
     if recursively:
@@ -40,6 +75,176 @@ def import_dicom_from_folder(folder: Union[Path, str], recursively: bool = True)
 
     dicom_study_list = dict()
 
+    with _open_header_index(index=index) as header_index:
+        for fp, dcm in _read_dicom_headers(
+            files=_get_candidate_files(files=files),
+            workers=workers,
+            use_processes=use_processes,
+            index=header_index,
+            selective=selective_read,
+        ):
+            if dcm is None:
+                continue
+
+            if dcm.StudyInstanceUID not in dicom_study_list:
+                dicom_study_list[dcm.StudyInstanceUID] = DicomStudy(
+                    study_instance_uid=dcm.StudyInstanceUID, compact_metadata=compact_metadata
+                )
+
+            dicom_study_list[dcm.StudyInstanceUID].add_file(fp, dcm=dcm)
+
+    if not len(dicom_study_list):
+        raise ValueError("The given folder contains no valid DICOM files")
+
+    return dicom_study_list
+
+
+def iter_import_dicom_from_folder(
+    folder: Union[Path, str],
+    recursively: bool = True,
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    index: Optional[Union[HeaderIndex, Path, str]] = None,
+    group_depth: Optional[int] = 1,
+    max_open_studies: Optional[int] = None,
+    compact_metadata: bool = False,
+    selective_read: bool = False,
+) -> Iterator[DicomStudy]:
+    """Go through a folder and yield each DICOM study as soon as it is considered complete
+
+    The folder is walked depth first with the directories and files in sorted order. The walk is grouped by the
+    directories at group_depth levels below the folder, e.g., one directory per patient or study. When the walk leaves a
+    group, the studies with files in that group are considered complete and are yielded. If max_open_studies is given,
+    the least recently updated study is also yielded as soon as more studies than that are open. The remaining studies
+    are yielded when the walk is finished.
+
+    Only the studies that are open are kept in memory, which makes it possible to process archives that are too large to
+    import with :func:`~dicom_image_tools.dicom_handlers.dicom_import.import_dicom_from_folder`. Files of a study that
+    are found after the study has been yielded are returned in a new DicomStudy object with the same StudyInstanceUID.
+
+    Args:
+        folder: Path of the folder to search for DICOM files
+        recursively: Specification if the folder should be search recursively. Defaults to True
+        workers: The number of workers to read the DICOM headers with. Defaults to None, i.e., a serial import
+        use_processes: Use a process pool instead of a thread pool for the header reads. Defaults to False
+        index: A HeaderIndex, or the path to the index file, to serve unchanged headers from. Defaults to None
+        group_depth: The depth below the folder of the directories that group the studies. None disables the
+            directory grouping. Defaults to 1
+        max_open_studies: The maximum number of studies to keep open. Defaults to None, i.e., no limit
+        compact_metadata: Let the series keep CompactMetadata records instead of the complete datasets of the files.
+            Defaults to False
+        selective_read: Only parse the header tags used by the package when scanning the files. Defaults to False
+
+    Raises:
+        TypeError: If the given folder is not a Path object
+        TypeError: If workers, group_depth or max_open_studies is not an integer
+        TypeError: If index is neither a HeaderIndex nor a path
+        ValueError: If workers or max_open_studies is less than 1, or if group_depth is negative
+        ValueError: If the given folder is not a directory
+        ValueError: If no valid DICOM files were found in the search of the given folder
+
+    Returns:
+        An iterator of DicomStudy objects
+
+    """
+    folder = _validate_import_arguments(folder=folder, workers=workers, index=index)
+
+    if group_depth is not None and (not isinstance(group_depth, int) or isinstance(group_depth, bool)):
+        raise TypeError("group_depth must be given as an integer")
+
+    if group_depth is not None and group_depth < 0:
+        raise ValueError("group_depth must not be negative")
+
+    if max_open_studies is not None and (not isinstance(max_open_studies, int) or isinstance(max_open_studies, bool)):
+        raise TypeError("max_open_studies must be given as an integer")
+
+    if max_open_studies is not None and max_open_studies < 1:
+        raise ValueError("max_open_studies must be at least 1")
+
+    # Open studies in the order they were last updated, together with the group they were last updated in
+    open_studies: OrderedDict[str, Tuple[DicomStudy, Tuple[str, ...]]] = OrderedDict()
+    current_group: Optional[Tuple[str, ...]] = None
+    found_dicom = False
+
+    with _open_header_index(index=index) as header_index:
+        for fp, dcm in _read_dicom_headers(
+            files=_get_candidate_files(files=_walk_folder(folder=folder, recursively=recursively)),
+            workers=workers,
+            use_processes=use_processes,
+            index=header_index,
+            selective=selective_read,
+        ):
+            if dcm is None:
+                continue
+
+            found_dicom = True
+            group = fp.parent.relative_to(folder).parts[:group_depth] if group_depth is not None else ()
+
+            if group != current_group:
+                for study_instance_uid in [key for key, (_, grp) in open_studies.items() if grp == current_group]:
+                    logger.debug(f"Study {study_instance_uid} complete at the end of {'/'.join(current_group)}")
+                    yield open_studies.pop(study_instance_uid)[0]
+
+                current_group = group
+
+            study = open_studies.pop(dcm.StudyInstanceUID, (None, None))[0]
+            if study is None:
+                study = DicomStudy(study_instance_uid=dcm.StudyInstanceUID, compact_metadata=compact_metadata)
+
+            study.add_file(fp, dcm=dcm)
+            open_studies[dcm.StudyInstanceUID] = (study, group)
+
+            if max_open_studies is not None and len(open_studies) > max_open_studies:
+                yield open_studies.popitem(last=False)[1][0]
+
+        while open_studies:
+            yield open_studies.popitem(last=False)[1][0]
+
+    if not found_dicom:
+        raise ValueError("The given folder contains no valid DICOM files")
+
+
+def _validate_import_arguments(
+    folder: Union[Path, str], workers: Optional[int], index: Optional[Union[HeaderIndex, Path, str]]
+) -> Path:
+    folder = check_path_is_valid_path(path_to_check=folder)
+
+    if not folder.is_dir():
+        raise ValueError("The given folder is not a directory")
+
+    validate_workers(workers=workers)
+
+    if index is not None and not isinstance(index, (HeaderIndex, Path, str)):
+        raise TypeError("The index must be given as a HeaderIndex or as the path to the index file")
+
+    return folder
+
+
+@contextmanager
+def _open_header_index(index: Optional[Union[HeaderIndex, Path, str]]) -> Iterator[Optional[HeaderIndex]]:
+    header_index = HeaderIndex(index_file=index) if isinstance(index, (Path, str)) else index
+    try:
+        yield header_index
+    finally:
+        if header_index is not None:
+            header_index.commit()
+
+            if header_index is not index:
+                header_index.close()
+
+
+def _walk_folder(folder: Path, recursively: bool) -> Iterator[Path]:
+    # Depth first and sorted, so that all files of a directory tree are found after each other
+    for root, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            yield Path(root) / filename
+
+        if not recursively:
+            return
+
+
+def _get_candidate_files(files: Iterable[Path]) -> Iterator[Path]:
     for fp in files:
         if not fp.is_file():
             continue
@@ -48,20 +253,75 @@ def import_dicom_from_folder(folder: Union[Path, str], recursively: bool = True)
             logger.debug("Skipping .DS_Store file")
             continue
 
-        try:
-            dcm = pydicom.dcmread(fp=str(fp.absolute()), stop_before_pixels=True)
-        except InvalidDicomError as e:
-            continue
+        yield fp
 
-        if dcm.StudyInstanceUID not in dicom_study_list:
-            dicom_study_list[dcm.StudyInstanceUID] = DicomStudy(study_instance_uid=dcm.StudyInstanceUID)
 
-        dicom_study_list[dcm.StudyInstanceUID].add_file(fp, dcm=dcm)
+def _read_dicom_header(fp: Path, selective: bool = False) -> Optional[pydicom.FileDataset]:
+    try:
+        return read_dicom_header(file=fp, selective=selective)
+    except InvalidDicomError:
+        return None
 
-    if not len(dicom_study_list):
-        raise ValueError("The given folder contains no valid DICOM files")
 
-    return dicom_study_list
+def _read_dicom_headers(
+    files: Iterable[Path],
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    index: Optional[HeaderIndex] = None,
+    selective: bool = False,
+) -> Iterator[Tuple[Path, Optional[pydicom.FileDataset]]]:
+    """Read the DICOM headers of the given files and yield them in the same order as the files
+
+    Args:
+        files: The files to read the headers from
+        workers: The number of workers to use. None or 1 reads the headers serially
+        use_processes: Use a process pool instead of a thread pool
+        index: A header index to serve unchanged files from and to add parsed files to
+        selective: Only parse the tags used by the package
+
+    Returns:
+        An iterator of (file path, dataset) tuples where the dataset is None if the file is not a valid DICOM file
+
+    """
+    if workers is None or workers == 1:
+        for fp in files:
+            found, dcm = index.lookup(fp) if index is not None else (False, None)
+            if not found:
+                dcm = _read_dicom_header(fp, selective=selective)
+                if index is not None:
+                    index.add(fp, dcm)
+
+            yield fp, dcm
+        return
+
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=workers) if use_processes else ThreadPoolExecutor(max_workers=workers)
+    )
+
+    def _get_result(pending_read: Tuple[Path, Optional[Future], Optional[pydicom.FileDataset]]):
+        pending_fp, pending_future, indexed_dcm = pending_read
+        if pending_future is None:
+            return pending_fp, indexed_dcm
+
+        read_dcm = pending_future.result()
+        if index is not None:
+            index.add(pending_fp, read_dcm)
+
+        return pending_fp, read_dcm
+
+    with executor:
+        # Keep a bounded queue of pending reads and yield them in submission order to keep the result deterministic.
+        # The index is only accessed from this thread
+        pending = deque()
+        for fp in files:
+            found, dcm = index.lookup(fp) if index is not None else (False, None)
+            pending.append((fp, None, dcm) if found else (fp, executor.submit(_read_dicom_header, fp, selective), None))
+
+            if len(pending) >= workers * _READ_AHEAD_PER_WORKER:
+                yield _get_result(pending.popleft())
+
+        while pending:
+            yield _get_result(pending.popleft())
 
 
 def import_dicom_file(file: Union[Path, str]) -> DicomStudy:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Set, Union
 
 import numpy as np
 import pydicom
@@ -7,9 +7,12 @@ from plotly import graph_objects as go
 from pydicom import FileDataset
 
 from dicom_image_tools.plotting.colour_scales import plotly_colour_scales
+from .compact_metadata import CompactMetadata
 from .save_dicom import save_dicom
 
 from ..helpers.check_path_is_valid import check_path_is_valid_path
+from ..helpers.dicom_header import is_partial_header, read_dicom_header
+from ..helpers.tracked_list import TrackedList
 from ..helpers.voxel_data import VoxelData
 from ..roi.roi import Roi
 
@@ -19,26 +22,34 @@ class DicomSeries:
 
     Args:
         series_instance_uid: Series instance UID of the object to be created
+        compact_metadata: Keep a CompactMetadata record of the tags used by the package for each file instead of the
+            complete dataset. Defaults to False
 
     Attributes:
         SeriesInstanceUid: Series instance UID of the object
         FilePaths: Paths to the files added to the object
-        CompleteMetadata: The complete set of metadata for the added files
+        CompleteMetadata: The complete set of metadata for the added files, or CompactMetadata records if
+            UseCompactMetadata is True or if the file was added with a partial header, e.g., from a selective read or a
+            header index
+        UseCompactMetadata: Keep CompactMetadata records instead of the complete datasets
         VoxelData: Voxel size information for included image files
         ImageVolume: The Image volume of the DICOM series
         Mask: A mask of the same dimension as the image volume to apply to the image volume
 
     """
 
-    def __init__(self, series_instance_uid: str):
+    def __init__(self, series_instance_uid: str, compact_metadata: bool = False):
         if not isinstance(series_instance_uid, str):
             raise TypeError("series_instance_uid must be a string")
-        self.FilePaths: List[Path] = []
+        self._file_paths: TrackedList = TrackedList()
+        self._file_path_set: Set[Path] = set()
+        self._file_path_set_version: int = self._file_paths.version
 
         # Metadata
         self.SeriesInstanceUid: str = series_instance_uid
         self.SeriesDescription: Optional[str] = None
-        self.CompleteMetadata: List[FileDataset] = []
+        self.CompleteMetadata: List[Union[FileDataset, CompactMetadata]] = []
+        self.UseCompactMetadata: bool = compact_metadata
         self.VoxelData: List[VoxelData] = []
         self.PixelIntensityNormalized: bool = False
 
@@ -61,12 +72,12 @@ class DicomSeries:
         """
         file = check_path_is_valid_path(path_to_check=file)
 
-        if any([True if obj == file else False for obj in self.FilePaths]):
+        if self._contains_file(file):
             # Return None since the file is already in the volume
             return
 
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            dcm = read_dicom_header(file=file, selective=self.UseCompactMetadata)
 
         if dcm.SeriesInstanceUID != self.SeriesInstanceUid:
             msg = f"Wrong SeriesInstanceUID. Expected: {self.SeriesInstanceUid}; Input: {dcm.SeriesInstanceUID}"
@@ -75,7 +86,50 @@ class DicomSeries:
         if "SeriesDescription" in dcm:
             self.SeriesDescription = dcm.SeriesDescription
 
-        self.FilePaths.append(file)
+        self._append_file_path(file)
+
+    @property
+    def FilePaths(self) -> List[Path]:
+        self._finalize_file_order()
+        return self._file_paths
+
+    @FilePaths.setter
+    def FilePaths(self, file_paths: List[Path]) -> None:
+        self._file_paths = TrackedList(file_paths)
+        self._file_path_set = set(self._file_paths)
+        self._file_path_set_version = self._file_paths.version
+
+    def _contains_file(self, file: Path) -> bool:
+        # The list of file paths may have been modified directly, e.g., by replacing or removing a path in it
+        if self._file_paths.version != self._file_path_set_version:
+            self._file_path_set = set(self._file_paths)
+            self._file_path_set_version = self._file_paths.version
+
+        return file in self._file_path_set
+
+    def _append_file_path(self, file: Path) -> None:
+        self._contains_file(file)
+        self._file_paths.append(file)
+        self._file_path_set.add(file)
+        self._file_path_set_version = self._file_paths.version
+
+    def _get_metadata_record(self, file: Path, dcm: FileDataset) -> Union[FileDataset, CompactMetadata]:
+        # Partial headers are kept as compact records so that the complete header is re-read when it is needed
+        if self.UseCompactMetadata or is_partial_header(dcm):
+            return CompactMetadata(file=file, dcm=dcm)
+
+        return dcm
+
+    def _get_complete_metadata(self, index: int) -> FileDataset:
+        metadata = self.CompleteMetadata[index]
+        if isinstance(metadata, CompactMetadata):
+            return metadata.read_dataset()
+
+        return metadata
+
+    def _finalize_file_order(self) -> None:
+        """Apply any deferred ordering of the added files. Series that order their files override this method"""
+        return
 
     def normalize_pixel_intensity_relationship(self):
         """Reverse the pixel intensity for images with negative pixel intensity relationship to make the lower pixel
@@ -103,7 +157,7 @@ class DicomSeries:
         if metadata.PixelIntensityRelationshipSign == 1:
             return image
 
-        image = np.multiply(image - np.power(2, metadata.BitsAllocated), -1)
+        image = np.multiply(np.asarray(image) - np.power(2, metadata.BitsAllocated), -1)
 
         return image
 
@@ -156,5 +210,5 @@ class DicomSeries:
             else self.ImageVolume[:, :, image_index].copy()
         )
 
-        metadata: pydicom.FileDataset = self.CompleteMetadata[image_index]
+        metadata: pydicom.FileDataset = self._get_complete_metadata(index=image_index)
         save_dicom(image=image, metadata=metadata, output_path=output_path, bits_allocated=bits_allocated)
@@ -1,7 +1,6 @@
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
-import pydicom
 from pydicom import FileDataset
 
 from ..constants.SopClassUids import (
@@ -9,6 +8,8 @@ from ..constants.SopClassUids import (
     SECONDARY_CAPTURE_SOP_CLASS_UIDS,
 )
 from ..helpers.check_path_is_valid import check_path_is_valid_path
+from ..helpers.dicom_header import read_dicom_header
+from ..helpers.tracked_list import TrackedList
 from .ct import CtSeries
 from .dicom_series import DicomSeries
 from .dose_matrix import DoseMatrix
@@ -21,6 +22,8 @@ class DicomStudy:
 
     Args:
         study_instance_uid : The study instance UID of the DICOM study object that is to be created
+        compact_metadata: Let the series keep CompactMetadata records instead of the complete datasets of the files.
+            Defaults to False
 
     Attributes:
         StudyInstanceUid: The study instance UID of the DICOM study object
@@ -33,7 +36,7 @@ class DicomStudy:
 
     """
 
-    def __init__(self, study_instance_uid: str):
+    def __init__(self, study_instance_uid: str, compact_metadata: bool = False):
         if not isinstance(study_instance_uid, str):
             raise TypeError("study_instance_uid must be a string")
         # Metadata
@@ -42,6 +45,7 @@ class DicomStudy:
         self.Manufacturer: Optional[str] = None
         self.ManufacturerModelName: Optional[str] = None
         self.DoseReports: Optional[DoseReport] = DoseReport()
+        self.UseCompactMetadata: bool = compact_metadata
 
     def add_file(self, file: Union[Path, str], dcm: Optional[FileDataset] = None) -> None:
         """Add the DICOM file to the DicomStudy object after validating the study instance UID
@@ -59,7 +63,8 @@ class DicomStudy:
         file = check_path_is_valid_path(path_to_check=file)
 
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            # The complete header is only needed if the series keep it as metadata
+            dcm = read_dicom_header(file=file, selective=self.UseCompactMetadata)
 
         if dcm.StudyInstanceUID != self.StudyInstanceUid:
             raise ValueError(f"The given DICOM file is not part of the study {self.StudyInstanceUid}")
@@ -71,15 +76,39 @@ class DicomStudy:
             self.DoseReports.add_file(file=file, dataset=dcm)
             return
 
-        try:
-            index = [obj.SeriesInstanceUid for obj in self.Series].index(dcm.SeriesInstanceUID)
-        except ValueError:
+        series = self._get_series(series_instance_uid=dcm.SeriesInstanceUID)
+        if series is None:
             if dcm.Modality == "CT":
-                self.Series.append(CtSeries(series_instance_uid=dcm.SeriesInstanceUID))
+                series = CtSeries(series_instance_uid=dcm.SeriesInstanceUID, compact_metadata=self.UseCompactMetadata)
             elif dcm.Modality == "RTDOSE":
-                self.Series.append(DoseMatrix(file=file, dcm=dcm))
+                series = DoseMatrix(file=file, dcm=dcm, compact_metadata=self.UseCompactMetadata)
             else:
-                self.Series.append(ProjectionSeries(file=file, dcm=dcm))
-            index = [obj.SeriesInstanceUid for obj in self.Series].index(dcm.SeriesInstanceUID)
+                series = ProjectionSeries(file=file, dcm=dcm, compact_metadata=self.UseCompactMetadata)
 
-        self.Series[index].add_file(file=file, dcm=dcm)
+            self.Series.append(series)
+            self._series_by_uid.setdefault(series.SeriesInstanceUid, series)
+            self._series_by_uid_version = self._series.version
+
+        series.add_file(file=file, dcm=dcm)
+
+    @property
+    def Series(self) -> List[Union[DicomSeries, CtSeries, ProjectionSeries]]:
+        return self._series
+
+    @Series.setter
+    def Series(self, series: List[Union[DicomSeries, CtSeries, ProjectionSeries]]) -> None:
+        self._series = TrackedList(series)
+        self._update_series_by_uid()
+
+    def _update_series_by_uid(self) -> None:
+        self._series_by_uid: Dict[str, Union[DicomSeries, CtSeries, ProjectionSeries]] = {}
+        for series in self._series:
+            self._series_by_uid.setdefault(series.SeriesInstanceUid, series)
+        self._series_by_uid_version = self._series.version
+
+    def _get_series(self, series_instance_uid: str) -> Optional[Union[DicomSeries, CtSeries, ProjectionSeries]]:
+        # The Series list may have been modified directly, e.g., by replacing or removing a series in it
+        if self._series.version != self._series_by_uid_version:
+            self._update_series_by_uid()
+
+        return self._series_by_uid.get(series_instance_uid)
@@ -8,7 +8,8 @@ from plotly import graph_objects as go
 from pydicom import FileDataset
 
 from ..helpers.check_path_is_valid import check_path_is_valid_path
-from ..helpers.pixel_data import get_pixel_array
+from ..helpers.dicom_header import read_dicom_header
+from ..helpers.pixel_data import get_pixel_array, validate_pixel_data_dtype
 from ..helpers.voxel_data import VoxelData
 from ..plotting.plotly import show_image
 from ..roi.roi import Roi
@@ -18,16 +19,24 @@ logger = logging.getLogger(__name__)
 
 
 class DoseMatrix(DicomSeries):
-    """A class to manage dose matrix series from Treatment planning systems."""
+    """A class to manage dose matrix series from Treatment planning systems.
 
-    def __init__(self, file: Path, dcm: Optional[FileDataset] = None):
+    Args:
+        file: Path object for the file that is to be imported
+        dcm: A pydicom FileDataset object containing the file
+        compact_metadata: Keep a CompactMetadata record for each file instead of the complete dataset. Defaults to
+            False
+
+    """
+
+    def __init__(self, file: Path, dcm: Optional[FileDataset] = None, compact_metadata: bool = False):
         if dcm is None:
-            dcm = pydicom.dcmread(fp=file, stop_before_pixels=True)
+            dcm = read_dicom_header(file=Path(file), selective=compact_metadata)
 
         if "SeriesInstanceUID" not in dcm:
             raise ValueError("The DICOM file does not contain a series instance UID")
 
-        super().__init__(series_instance_uid=dcm.SeriesInstanceUID)
+        super().__init__(series_instance_uid=dcm.SeriesInstanceUID, compact_metadata=compact_metadata)
         self.DoseGridScaling: Optional[List[Optional[float]]] = []
         self.DoseSummationType: Optional[List[Optional[str]]] = []
         self.DoseType: Optional[List[Optional[str]]] = []
@@ -53,12 +62,12 @@ class DoseMatrix(DicomSeries):
         """
         file = check_path_is_valid_path(file)
 
-        if any([True if obj == file else False for obj in self.FilePaths]):
+        if self._contains_file(file):
             # Return None since the file is already in the volume
             return
 
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            dcm = read_dicom_header(file=file, selective=self.UseCompactMetadata)
 
         if dcm.SeriesInstanceUID != self.SeriesInstanceUid:
             msg = f"Wrong SeriesInstanceUID. Expected: {self.SeriesInstanceUid}; Input: {dcm.SeriesInstanceUID}"
@@ -69,7 +78,7 @@ class DoseMatrix(DicomSeries):
         self.DoseType.append(dcm.DoseType if "DoseType" in dcm else None)
         self.DoseUnit.append(dcm.DoseUnit if "DoseUnit" in dcm else None)
         self.Origin.append([float(pos) for pos in dcm.ImagePositionPatient] if "ImagePositionPatient" in dcm else None)
-        self.FilePaths.append(file)
+        self._append_file_path(file)
 
         if "PixelSpacing" in dcm:
             try:
@@ -90,25 +99,29 @@ class DoseMatrix(DicomSeries):
                 )
                 pass
 
-        self.CompleteMetadata.append(dcm)
+        self.CompleteMetadata.append(self._get_metadata_record(file=file, dcm=dcm))
 
-    def import_image_volume(self) -> None:
+    def import_image_volume(self, dtype: str = "float64") -> None:
         """Import the file/-s in the Dose matrix volume and insert the data into the ImageVolume property
 
-        Returns:
+        Args:
+            dtype: The data type to decode the dose matrix to, one of "float64", "float32" and "native". See
+                :func:`~dicom_image_tools.helpers.pixel_data.get_pixel_array`. Defaults to "float64"
 
         """
+        validate_pixel_data_dtype(dtype=dtype)
+
         for ind, fp in enumerate(self.FilePaths):
             dcm = pydicom.dcmread(fp)
 
-            self.ImageVolume.append(get_pixel_array(dcm=dcm))
+            self.ImageVolume.append(get_pixel_array(dcm=dcm, dtype=dtype))
 
-    def import_dose_matrix(self) -> None:
+    def import_dose_matrix(self, dtype: str = "float64") -> None:
         """Import the file/-s in the Dose matrix volume and insert the data into the ImageVolume property
 
         See :func:`~dicom_image_tools.dicom_handlers.dose_matrix.DoseMatrix.import_image_volume`
         """
-        self.import_image_volume()
+        self.import_image_volume(dtype=dtype)
 
     def show_image(
         self,
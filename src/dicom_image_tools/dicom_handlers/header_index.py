@@ -0,0 +1,182 @@
+import json
+import logging
+import sqlite3
+import warnings
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from pydicom import Dataset, FileDataset
+from pydicom.dataset import FileMetaDataset
+
+from ..constants.dicom_tags import HEADER_TAG_KEYWORDS, PRIVATE_HEADER_TAGS
+from ..constants.SopClassUids import (
+    RADIATION_DOSE_STRUCTURED_REPORT_SOP_CLASS_UIDS,
+    SECONDARY_CAPTURE_SOP_CLASS_UIDS,
+)
+from ..helpers.dicom_header import mark_partial_header
+
+logger = logging.getLogger(__name__)
+
+_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS headers (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    is_dicom INTEGER NOT NULL,
+    file_meta TEXT,
+    dataset TEXT
+)
+"""
+
+
+class HeaderIndex:
+    """A persistent on-disk index of DICOM headers, used to skip parsing unchanged files when a folder is imported
+    repeatedly.
+
+    Files are keyed by their absolute path, modification time and size. Only the header tags used when sorting the
+    files into studies and series are stored (see :data:`~dicom_image_tools.constants.dicom_tags.HEADER_TAG_KEYWORDS`),
+    so the datasets returned from the index do not contain the complete header. Dose reports and secondary captures are
+    never stored since their complete content is kept in the study.
+
+    Args:
+        index_file: Path to the SQLite file to store the index in. The file is created if it does not exist
+
+    Attributes:
+        IndexFile: Path to the SQLite file holding the index
+
+    """
+
+    def __init__(self, index_file: Union[Path, str]):
+        if not isinstance(index_file, (Path, str)):
+            raise TypeError("The index file must be given as a Path or a string")
+
+        self.IndexFile: Path = Path(index_file)
+        self._connection = sqlite3.connect(str(self.IndexFile))
+        self._connection.execute(_CREATE_TABLE_QUERY)
+        self._connection.commit()
+
+    def __enter__(self) -> "HeaderIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit any pending changes and close the index file"""
+        if self._connection is None:
+            return
+
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+    def commit(self) -> None:
+        """Write pending changes to the index file"""
+        self._connection.commit()
+
+    def lookup(self, file: Path) -> Tuple[bool, Optional[FileDataset]]:
+        """Look up the header of a file in the index
+
+        Args:
+            file: Path to the file to look up
+
+        Returns:
+            A tuple on the form (found, dataset). found is False if the file is not in the index or if it has been
+            modified since it was indexed. dataset is None if the file was indexed as not being a valid DICOM file
+
+        """
+        mtime_ns, size = self._get_file_signature(file)
+        row = self._connection.execute(
+            "SELECT mtime_ns, size, is_dicom, file_meta, dataset FROM headers WHERE path = ?", (self._key(file),)
+        ).fetchone()
+
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return False, None
+
+        if not row[2]:
+            return True, None
+
+        try:
+            return True, self._deserialize(file=file, file_meta=row[3], dataset=row[4])
+        except Exception:
+            logger.debug(f"Failed to restore indexed header for {file}", exc_info=True)
+            return False, None
+
+    def add(self, file: Path, dcm: Optional[FileDataset]) -> None:
+        """Add the header of a file to the index. Use None as dcm to mark the file as not being a valid DICOM file
+
+        Args:
+            file: Path to the file that the header was read from
+            dcm: The header of the file, or None if the file is not a valid DICOM file
+
+        """
+        if dcm is not None and dcm.get("SOPClassUID") in (
+            RADIATION_DOSE_STRUCTURED_REPORT_SOP_CLASS_UIDS + SECONDARY_CAPTURE_SOP_CLASS_UIDS
+        ):
+            return
+
+        mtime_ns, size = self._get_file_signature(file)
+
+        file_meta = None
+        dataset = None
+        if dcm is not None:
+            try:
+                file_meta, dataset = self._serialize(dcm)
+            except Exception:
+                logger.debug(f"Failed to serialize header of {file} for the index", exc_info=True)
+                return
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO headers (path, mtime_ns, size, is_dicom, file_meta, dataset) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self._key(file), mtime_ns, size, int(dcm is not None), file_meta, dataset),
+        )
+
+    @staticmethod
+    def _key(file: Path) -> str:
+        return str(file.absolute())
+
+    @staticmethod
+    def _get_file_signature(file: Path) -> Tuple[int, int]:
+        stat = file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _serialize(dcm: FileDataset) -> Tuple[Optional[str], str]:
+        subset = Dataset()
+        for keyword in HEADER_TAG_KEYWORDS:
+            if keyword in dcm:
+                subset[keyword] = dcm[keyword]
+
+        for tag in PRIVATE_HEADER_TAGS:
+            if tag in dcm:
+                subset[tag] = dcm[tag]
+
+        file_meta = getattr(dcm, "file_meta", None)
+
+        return (
+            json.dumps(file_meta.to_json_dict(suppress_invalid_tags=True)) if file_meta else None,
+            json.dumps(subset.to_json_dict(suppress_invalid_tags=True)),
+        )
+
+    @staticmethod
+    def _deserialize(file: Path, file_meta: Optional[str], dataset: str) -> FileDataset:
+        meta = FileMetaDataset()
+        if file_meta is not None:
+            meta = FileMetaDataset(Dataset.from_json(file_meta))
+        transfer_syntax = meta.get("TransferSyntaxUID")
+
+        with warnings.catch_warnings():
+            # The values were validated, or not, when the file was first read
+            warnings.simplefilter("ignore")
+            restored = Dataset.from_json(dataset)
+
+        return mark_partial_header(
+            FileDataset(
+                str(file.absolute()),
+                restored,
+                file_meta=meta,
+                is_implicit_VR=transfer_syntax.is_implicit_VR if transfer_syntax else True,
+                is_little_endian=transfer_syntax.is_little_endian if transfer_syntax else True,
+            )
+        )
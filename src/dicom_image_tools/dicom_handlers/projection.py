@@ -9,8 +9,13 @@ from plotly import graph_objects as go
 from pydicom import FileDataset
 
 from ..helpers.check_path_is_valid import check_path_is_valid_path
+from ..helpers.dicom_header import read_dicom_header
 from ..helpers.normalize_dicom_exposure_parameters import get_xray_tube_current_in_ma
-from ..helpers.pixel_data import get_pixel_array
+from ..helpers.pixel_data import (
+    RescaledPixelArray,
+    get_pixel_array,
+    validate_pixel_data_dtype,
+)
 from ..helpers.rotate_image import rotate_image
 from ..helpers.voxel_data import VoxelData
 from ..helpers.window import get_default_window_settings
@@ -30,6 +35,8 @@ class ProjectionSeries(DicomSeries):
     Args:
         file: Path object for the file that is to be imported
         dcm: A pydicom FileDataset object containing the file
+        compact_metadata: Keep a CompactMetadata record for each image instead of the complete dataset. Defaults to
+            False
 
     Attributes:
         kV: Tube voltage used in the image acquisition in kV
@@ -40,14 +47,14 @@ class ProjectionSeries(DicomSeries):
 
     """
 
-    def __init__(self, file: Path, dcm: Optional[FileDataset] = None):
+    def __init__(self, file: Path, dcm: Optional[FileDataset] = None, compact_metadata: bool = False):
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            dcm = read_dicom_header(file=file, selective=compact_metadata)
 
         if "SeriesInstanceUID" not in dcm:
             raise ValueError("The DICOM file does not contain a series instance UID")
 
-        super().__init__(series_instance_uid=dcm.SeriesInstanceUID)
+        super().__init__(series_instance_uid=dcm.SeriesInstanceUID, compact_metadata=compact_metadata)
 
         self.Modality = dcm.Modality
         self.Manufacturer: Optional[str] = None
@@ -91,7 +98,7 @@ class ProjectionSeries(DicomSeries):
             return
 
         if dcm is None:
-            dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+            dcm = read_dicom_header(file=file, selective=self.UseCompactMetadata)
 
         if "PixelSpacing" in dcm:
             self.VoxelData.append(VoxelData(x=float(dcm.PixelSpacing[1]), y=float(dcm.PixelSpacing[0]), z=None))
@@ -120,7 +127,7 @@ class ProjectionSeries(DicomSeries):
                 )
                 pass
 
-        self.CompleteMetadata.append(dcm)
+        self.CompleteMetadata.append(self._get_metadata_record(file=file, dcm=dcm))
 
     @staticmethod
     def _get_tag_value_as_float_or_none(tag_name: str, ds: FileDataset) -> Optional[float]:
@@ -131,14 +138,30 @@ class ProjectionSeries(DicomSeries):
 
         return float(tag_value)
 
-    def import_image(self, rotate_to_0_degrees: Optional[bool] = False) -> None:
-        """Import the pixel data into the ImageVolume property"""
+    def import_image(self, rotate_to_0_degrees: Optional[bool] = False, dtype: str = "float64") -> None:
+        """Import the pixel data into the ImageVolume property
+
+        Args:
+            rotate_to_0_degrees: Rotate the images to a field of view rotation of 0 degrees. Defaults to False
+            dtype: The data type to decode the pixel data to, one of "float64", "float32" and "native". See
+                :func:`~dicom_image_tools.helpers.pixel_data.get_pixel_array`. Defaults to "float64"
+
+        """
+        validate_pixel_data_dtype(dtype=dtype)
+
         self.ImageVolume = []
         for ind, fp in enumerate(self.FilePaths):
             dcm = pydicom.dcmread(str(fp.absolute()))
-            pixel_array = get_pixel_array(dcm=dcm)
-
-            if rotate_to_0_degrees:
+            pixel_array = get_pixel_array(dcm=dcm, dtype=dtype)
+
+            if rotate_to_0_degrees and isinstance(pixel_array, RescaledPixelArray):
+                # Rotate the stored values, the rescale is the same for the whole image
+                pixel_array = RescaledPixelArray(
+                    stored_values=rotate_image(image=pixel_array.StoredValues, metadata=self.CompleteMetadata[ind]),
+                    slope=pixel_array.Slope,
+                    intercept=pixel_array.Intercept,
+                )
+            elif rotate_to_0_degrees:
                 pixel_array = rotate_image(image=pixel_array, metadata=self.CompleteMetadata[ind])
 
             self.ImageVolume.append(pixel_array)
@@ -161,12 +184,16 @@ class ProjectionSeries(DicomSeries):
         self.FilePaths = self._reorder_list_by_index_order_list(order_list=file_order, list_to_order=self.FilePaths)
         self.ImageVolume = self._reorder_list_by_index_order_list(order_list=file_order, list_to_order=self.ImageVolume)
 
-    def get_variance_images_for_image_volume(self, window_side_x: int = 3, window_side_y: int = 3) -> list[np.ndarray]:
+    def get_variance_images_for_image_volume(
+        self, window_side_x: int = 3, window_side_y: int = 3, engine: str = "uniform_filter"
+    ) -> list[np.ndarray]:
         """Calculate the variance image for each image in the image volume
 
         Args:
             window_side_x: The horizontal side (columns) of the rolling window applied. Default = 3
             window_side_y: The vertical side (rows) of the rolling window applied. Default = 3
+            engine: The engine to calculate the variance images with, see get_variance_image_2d. Default =
+                "uniform_filter"
 
         Returns:
             A list of variance images in the same order as the images in the ImageVolume
@@ -181,7 +208,7 @@ class ProjectionSeries(DicomSeries):
             )
 
         return [
-            get_variance_image_2d(image=image, window_side_x=window_side_x, window_side_y=window_side_y)
+            get_variance_image_2d(image=image, window_side_x=window_side_x, window_side_y=window_side_y, engine=engine)
             for image in self.ImageVolume
         ]
 
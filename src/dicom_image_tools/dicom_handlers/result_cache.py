@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+# Name of the SQLite file, in the cache directory, keeping track of the cached results
+INDEX_FILE_NAME = "index.sqlite"
+
+
+class ResultCache:
+    """A persistent on-disk cache of results derived from DICOM series, e.g., patient masks and size metrics, used to
+    skip recalculating the results when the same series is analysed repeatedly.
+
+    The results are keyed by the SOPInstanceUIDs of the images they were derived from and the parameters used when
+    deriving them, see :func:`~dicom_image_tools.dicom_handlers.result_cache.ResultCache.get_key`. Each result is
+    stored as a set of numpy arrays in a ``.npz`` file in the cache directory. When the total size of the stored
+    results exceeds the maximum size, the least recently used results are removed.
+
+    Args:
+        cache_directory: The directory to store the results in. The directory is created if it does not exist
+        max_size: The maximum total size of the stored results in bytes. Defaults to 1 GiB
+
+    Attributes:
+        CacheDirectory: The directory that the results are stored in
+        MaxSize: The maximum total size of the stored results in bytes
+
+    """
+
+    def __init__(self, cache_directory: Union[Path, str], max_size: int = 1 << 30):
+        if not isinstance(cache_directory, (Path, str)):
+            raise TypeError("The cache directory must be given as a Path or a string")
+
+        if not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise TypeError("The maximum cache size must be given as an integer")
+
+        if max_size < 0:
+            raise ValueError("The maximum cache size must not be negative")
+
+        self.CacheDirectory: Path = Path(cache_directory)
+        self.CacheDirectory.mkdir(parents=True, exist_ok=True)
+        self.MaxSize: int = max_size
+
+        self._connection = sqlite3.connect(str(self.CacheDirectory / INDEX_FILE_NAME))
+        self._connection.execute(_CREATE_TABLE_QUERY)
+        self._connection.commit()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit any pending changes and close the cache index"""
+        if self._connection is None:
+            return
+
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+    @staticmethod
+    def get_key(name: str, sop_instance_uids: List[str], **parameters: Any) -> str:
+        """Get the cache key of a result
+
+        Args:
+            name: The name of the result, e.g., "patient_mask"
+            sop_instance_uids: The SOPInstanceUIDs of the images that the result is derived from, in slice order
+            **parameters: The parameters used when deriving the result. The values must be JSON serializable
+
+        Returns:
+            The cache key as a hexadecimal SHA-256 digest
+
+        """
+        content = json.dumps(
+            {"name": name, "sop_instance_uids": list(sop_instance_uids), "parameters": parameters}, sort_keys=True
+        )
+
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load a result from the cache
+
+        Args:
+            key: The cache key of the result
+
+        Returns:
+            The arrays of the result, or None if the result is not in the cache
+
+        """
+        row = self._connection.execute("SELECT key FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        try:
+            with np.load(self._get_result_file(key), allow_pickle=False) as result_file:
+                result = {name: result_file[name] for name in result_file.files}
+        except (OSError, ValueError):
+            logger.debug(f"Failed to load cached result {key}", exc_info=True)
+            self._remove(key)
+            return None
+
+        self._connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._connection.commit()
+        logger.debug(f"Loaded cached result {key}")
+
+        return result
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Store a result in the cache and remove the least recently used results if the cache is full
+
+        Args:
+            key: The cache key of the result
+            arrays: The arrays of the result
+
+        """
+        result_file = self._get_result_file(key)
+        with open(result_file, "wb") as fp:
+            np.savez(fp, **arrays)
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results (key, size, last_access) VALUES (?, ?, ?)",
+            (key, result_file.stat().st_size, time.time()),
+        )
+        self._connection.commit()
+        logger.debug(f"Stored result {key} in the cache")
+
+        self._evict()
+
+    def _evict(self) -> None:
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total_size <= self.MaxSize:
+            return
+
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+            logger.debug(f"Removing least recently used result {key} from the cache")
+            self._remove(key)
+            total_size -= size
+            if total_size <= self.MaxSize:
+                break
+
+    def _remove(self, key: str) -> None:
+        self._get_result_file(key).unlink(missing_ok=True)
+        self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+        self._connection.commit()
+
+    def _get_result_file(self, key: str) -> Path:
+        return self.CacheDirectory / f"{key}.npz"
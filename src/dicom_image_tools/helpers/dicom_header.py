@@ -0,0 +1,79 @@
+import logging
+from pathlib import Path
+
+import pydicom
+from pydicom import FileDataset
+from pydicom.tag import Tag
+
+from ..constants.dicom_tags import HEADER_TAG_KEYWORDS, PRIVATE_HEADER_TAGS
+from ..constants.SopClassUids import (
+    RADIATION_DOSE_STRUCTURED_REPORT_SOP_CLASS_UIDS,
+    SECONDARY_CAPTURE_SOP_CLASS_UIDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# The tags read in a selective header read, converted once instead of on every read
+SELECTIVE_READ_TAGS = [Tag(keyword) for keyword in HEADER_TAG_KEYWORDS] + [Tag(tag) for tag in PRIVATE_HEADER_TAGS]
+
+# The attribute that marks datasets holding only the header tags used by the package, see mark_partial_header
+_PARTIAL_HEADER_ATTRIBUTE = "_partial_header"
+
+
+def read_dicom_header(file: Path, selective: bool = False) -> FileDataset:
+    """Read the header of a DICOM file, i.e., everything before the pixel data
+
+    A selective read only parses the tags used when sorting the files into studies and series and by the series
+    classes, see :data:`~dicom_image_tools.constants.dicom_tags.HEADER_TAG_KEYWORDS`, and the returned dataset is
+    marked as a partial header, see :func:`mark_partial_header`. Dose reports and secondary captures are always read
+    completely since their complete content is kept.
+
+    Args:
+        file: Path to the DICOM file
+        selective: Only parse the tags used by the package. Defaults to False
+
+    Raises:
+        InvalidDicomError: If the file is not a valid DICOM file
+
+    Returns:
+        The header of the file
+
+    """
+    if not selective:
+        return pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+
+    dcm = pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True, specific_tags=SELECTIVE_READ_TAGS)
+
+    if dcm.get("SOPClassUID") in RADIATION_DOSE_STRUCTURED_REPORT_SOP_CLASS_UIDS + SECONDARY_CAPTURE_SOP_CLASS_UIDS:
+        logger.debug(f"Reading complete header of dose report {file}")
+        return pydicom.dcmread(fp=str(file.absolute()), stop_before_pixels=True)
+
+    return mark_partial_header(dcm)
+
+
+def mark_partial_header(dcm: FileDataset) -> FileDataset:
+    """Mark a dataset as only holding the header tags used by the package, e.g., from a selective read or a header
+    index, so that the series keep it as a CompactMetadata record and re-read the complete header when it is needed
+
+    Args:
+        dcm: The dataset to mark
+
+    Returns:
+        The marked dataset
+
+    """
+    setattr(dcm, _PARTIAL_HEADER_ATTRIBUTE, True)
+    return dcm
+
+
+def is_partial_header(dcm: FileDataset) -> bool:
+    """Check if a dataset has been marked as only holding the header tags used by the package
+
+    Args:
+        dcm: The dataset to check
+
+    Returns:
+        True if the dataset is marked as a partial header, otherwise False
+
+    """
+    return bool(getattr(dcm, _PARTIAL_HEADER_ATTRIBUTE, False))
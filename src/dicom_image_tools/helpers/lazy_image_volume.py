@@ -0,0 +1,169 @@
+import logging
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pydicom
+from numpy.typing import DTypeLike
+
+from .pixel_data import RescaledPixelArray, get_pixel_array, validate_pixel_data_dtype
+
+log = logging.getLogger(__name__)
+
+
+class LazyImageVolume:
+    """An image volume of the shape (rows, columns, slices) where each slice is decoded from its DICOM file the first
+    time it is accessed.
+
+    The decoded slices are kept in a backing store of the given data type, either in memory or in a memory-mapped
+    temporary file. The slices are stored contiguously in the backing store so that accessing a single slice only
+    touches the part of the file holding that slice.
+
+    Indexing the volume returns numpy arrays, e.g., ``volume[:, :, 3]``. Converting the volume to a numpy array decodes
+    all slices and returns a view of the complete backing store.
+
+    With the "native" pixel data type the backing store holds the stored pixel values, and the rescale slope and
+    intercept of each slice are applied when the volume is accessed.
+
+    Args:
+        file_paths: Paths to the DICOM files of the slices, in slice order
+        shape: The shape of the image volume given as (rows, columns, slices)
+        dtype: The data type of the backing store, e.g., numpy.float32 or numpy.int16. Defaults to numpy.float32
+        memory_map: Keep the backing store in a memory-mapped temporary file. Defaults to True
+        directory: The directory to create the temporary file in. Defaults to the system temporary directory
+        pixel_dtype: The pixel data type to decode the slices to, see
+            :func:`~dicom_image_tools.helpers.pixel_data.get_pixel_array`. Defaults to "float64"
+
+    Attributes:
+        FilePaths: Paths to the DICOM files of the slices, in slice order
+
+    """
+
+    def __init__(
+        self,
+        file_paths: List[Path],
+        shape: Tuple[int, int, int],
+        dtype: DTypeLike = np.float32,
+        memory_map: bool = True,
+        directory: Optional[Union[Path, str]] = None,
+        pixel_dtype: str = "float64",
+    ):
+        if len(shape) != 3 or shape[2] != len(file_paths):
+            raise ValueError("The shape must be (rows, columns, slices) with one file path per slice")
+
+        validate_pixel_data_dtype(dtype=pixel_dtype)
+
+        self.FilePaths: List[Path] = list(file_paths)
+        self._dtype = np.dtype(dtype)
+        self._pixel_dtype = pixel_dtype
+        self._decoded = np.zeros(shape[2], dtype=bool)
+        # Rescale applied on access for the native pixel data type
+        self._slope = np.ones((1, 1, shape[2]))
+        self._intercept = np.zeros((1, 1, shape[2]))
+        self._file = None
+
+        storage_shape = (shape[2], shape[0], shape[1])
+        if memory_map:
+            self._file = tempfile.TemporaryFile(dir=directory)
+            self._storage = np.memmap(self._file, dtype=self._dtype, mode="w+", shape=storage_shape)
+        else:
+            self._storage = np.empty(storage_shape, dtype=self._dtype)
+
+        # View of the backing store in the (rows, columns, slices) layout used for image volumes
+        self._volume = self._storage.transpose(1, 2, 0)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._volume.shape
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(float) if self._pixel_dtype == "native" else self._dtype
+
+    @property
+    def size(self) -> int:
+        return self._volume.size
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key) -> np.ndarray:
+        self.load_slices(self._get_slice_indices(key))
+
+        if self._pixel_dtype == "native":
+            return RescaledPixelArray(self._volume, slope=self._slope, intercept=self._intercept)[key]
+
+        return np.asarray(self._volume[key])
+
+    def __array__(self, dtype: Optional[DTypeLike] = None, copy: Optional[bool] = None) -> np.ndarray:
+        self.load_slices()
+
+        if self._pixel_dtype == "native":
+            volume = np.asarray(RescaledPixelArray(self._volume, slope=self._slope, intercept=self._intercept))
+            return volume if dtype is None else volume.astype(dtype)
+
+        volume = np.asarray(self._volume)
+
+        if dtype is not None and np.dtype(dtype) != volume.dtype:
+            return volume.astype(dtype)
+
+        return volume.copy() if copy else volume
+
+    def is_loaded(self, index: int) -> bool:
+        """Check if the slice with the given index has been decoded"""
+        return bool(self._decoded[index])
+
+    def load_slices(self, indices: Optional[Union[List[int], np.ndarray]] = None) -> None:
+        """Decode the slices with the given indices that have not been decoded yet
+
+        Args:
+            indices: Indices of the slices to decode. Defaults to None, i.e., all slices
+
+        """
+        if indices is None:
+            indices = np.arange(self.shape[2])
+
+        for ind in np.unique(np.asarray(indices, dtype=int)):
+            if self._decoded[ind]:
+                continue
+
+            self._load_slice(int(ind))
+
+    def _load_slice(self, index: int) -> None:
+        fp = self.FilePaths[index]
+        log.debug(f"Decoding slice {index} from {fp}")
+
+        px = get_pixel_array(dcm=pydicom.dcmread(fp=str(fp.absolute())), dtype=self._pixel_dtype)
+
+        if isinstance(px, RescaledPixelArray):
+            self._slope[0, 0, index] = px.Slope
+            self._intercept[0, 0, index] = px.Intercept
+            px = px.StoredValues
+
+        if np.issubdtype(self._dtype, np.integer):
+            px = np.rint(px)
+
+        self._storage[index] = px
+        self._decoded[index] = True
+
+    def _get_slice_indices(self, key) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if any(obj is None for obj in key):
+            # New axes shift the slice axis, decode all slices
+            return np.arange(self.shape[2])
+
+        if any(obj is Ellipsis for obj in key):
+            ellipsis_index = [ind for ind, obj in enumerate(key) if obj is Ellipsis][0]
+            key = key[:ellipsis_index] + (slice(None),) * (3 - len(key) + 1) + key[ellipsis_index + 1 :]
+
+        if len(key) < 3:
+            return np.arange(self.shape[2])
+
+        return np.atleast_1d(np.arange(self.shape[2])[key[2]])
@@ -0,0 +1,140 @@
+import logging
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+logger = logging.getLogger(__name__)
+
+# Largest value range for which the whole-volume median is taken from a histogram instead of the sorted values
+MAX_HISTOGRAM_BINS = 1 << 24
+
+
+@dataclass
+class MaskedStatistics:
+    """Mean and median of the masked voxels of an image volume, per slice and for the whole volume
+
+    Attributes:
+        slice_mean: The mean of the masked voxels of each slice. NaN for slices without masked voxels
+        slice_median: The median of the masked voxels of each slice. NaN for slices without masked voxels
+        volume_mean: The mean of all masked voxels
+        volume_median: The median of all masked voxels
+
+    """
+
+    slice_mean: List[float]
+    slice_median: List[float]
+    volume_mean: float
+    volume_median: float
+
+
+def get_masked_statistics(image_volume: ArrayLike, mask: np.ndarray, per_slice: bool = True) -> MaskedStatistics:
+    """Calculate the mean and median of the masked voxels of an image volume of the shape (rows, columns, slices)
+
+    The masked voxels are extracted one slice at a time and the slice medians are found by partitioning, so no masked
+    copy of the volume is created. If all masked voxels have integer values, the whole-volume median is found from a
+    histogram of the values. Otherwise the masked voxels of all slices are collected and partitioned.
+
+    Args:
+        image_volume: The image volume. Any object that returns numpy arrays for ``image_volume[:, :, index]``
+        mask: A boolean mask of the same shape as the image volume
+        per_slice: If False, only the whole-volume mean and median are calculated and the per-slice lists are empty.
+            Defaults to True
+
+    Raises:
+        ValueError: If the mask does not have the same shape as the image volume
+
+    Returns:
+        The per-slice and whole-volume mean and median
+
+    """
+    if tuple(mask.shape) != tuple(image_volume.shape):
+        raise ValueError("The mask must have the same shape as the image volume")
+
+    slice_count = mask.shape[2]
+    slice_mean = []
+    slice_median = []
+    total_count = 0
+    total_sum = 0.0
+    min_value = np.inf
+    max_value = -np.inf
+    integral = True
+
+    for ind in range(slice_count):
+        values = _get_masked_slice_values(image_volume=image_volume, mask=mask, index=ind)
+
+        if not values.size:
+            if per_slice:
+                slice_mean.append(np.nan)
+                slice_median.append(np.nan)
+            continue
+
+        values_sum = float(np.sum(values, dtype=float))
+        if per_slice:
+            slice_mean.append(values_sum / values.size)
+            slice_median.append(_get_median(values))
+
+        total_count += values.size
+        total_sum += values_sum
+        min_value = min(min_value, float(values.min()))
+        max_value = max(max_value, float(values.max()))
+        integral = integral and (np.issubdtype(values.dtype, np.integer) or bool(np.all(np.mod(values, 1) == 0)))
+
+    if not total_count:
+        return MaskedStatistics(
+            slice_mean=slice_mean, slice_median=slice_median, volume_mean=np.nan, volume_median=np.nan
+        )
+
+    if integral and max_value - min_value < MAX_HISTOGRAM_BINS:
+        volume_median = _get_histogram_median(
+            image_volume=image_volume, mask=mask, min_value=int(min_value), max_value=int(max_value)
+        )
+    else:
+        logger.debug("Calculating the volume median from the sorted masked values")
+        volume_median = _get_median(
+            np.concatenate(
+                [
+                    _get_masked_slice_values(image_volume=image_volume, mask=mask, index=ind)
+                    for ind in range(slice_count)
+                ]
+            )
+        )
+
+    return MaskedStatistics(
+        slice_mean=slice_mean,
+        slice_median=slice_median,
+        volume_mean=total_sum / total_count,
+        volume_median=volume_median,
+    )
+
+
+def _get_masked_slice_values(image_volume: ArrayLike, mask: np.ndarray, index: int) -> np.ndarray:
+    return np.asarray(image_volume[:, :, index])[mask[:, :, index]]
+
+
+def _get_median(values: np.ndarray) -> float:
+    # Same result as np.median, without sorting more of the values than needed
+    middle = values.size // 2
+    if values.size % 2:
+        return float(np.partition(values, middle)[middle])
+
+    partitioned = np.partition(values, [middle - 1, middle])
+    return (float(partitioned[middle - 1]) + float(partitioned[middle])) / 2.0
+
+
+def _get_histogram_median(image_volume: ArrayLike, mask: np.ndarray, min_value: int, max_value: int) -> float:
+    histogram = np.zeros(max_value - min_value + 1, dtype=np.int64)
+    for ind in range(mask.shape[2]):
+        values = _get_masked_slice_values(image_volume=image_volume, mask=mask, index=ind)
+        if values.size:
+            histogram += np.bincount(values.astype(np.int64) - min_value, minlength=histogram.size)
+
+    cumulative_count = np.cumsum(histogram)
+    total_count = int(cumulative_count[-1])
+
+    # The values at the (zero-based) positions (n - 1) // 2 and n // 2 in sorted order
+    lower = int(np.searchsorted(cumulative_count, (total_count - 1) // 2, side="right")) + min_value
+    upper = int(np.searchsorted(cumulative_count, total_count // 2, side="right")) + min_value
+
+    return (lower + upper) / 2.0
@@ -0,0 +1,125 @@
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+
+class PackedMask:
+    """A boolean mask of the shape (rows, columns, slices) stored with one bit per voxel
+
+    The mask is packed along the column axis with numpy.packbits, which makes it 8 times smaller than a boolean array.
+    Indexing the mask returns boolean numpy arrays, e.g., ``mask[:, :, 3]``, and only unpacks the part of the mask that
+    is indexed when the rows and slices are given as integers or slices. Converting the mask to a numpy array unpacks
+    the complete mask.
+
+    Args:
+        shape: The shape of the mask given as (rows, columns, slices)
+
+    Attributes:
+        Packed: The packed mask of the shape (rows, ceil(columns / 8), slices)
+
+    """
+
+    def __init__(self, shape: Tuple[int, int, int]):
+        if len(shape) != 3:
+            raise ValueError("The shape must be given as (rows, columns, slices)")
+
+        self._shape: Tuple[int, int, int] = (int(shape[0]), int(shape[1]), int(shape[2]))
+        self.Packed: np.ndarray = np.zeros((self._shape[0], (self._shape[1] + 7) // 8, self._shape[2]), dtype=np.uint8)
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> "PackedMask":
+        """Create a packed mask from a boolean array of the shape (rows, columns, slices)"""
+        packed_mask = cls(shape=mask.shape)
+        packed_mask.set_slices(start=0, mask=mask)
+        return packed_mask
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(bool)
+
+    @property
+    def size(self) -> int:
+        return self._shape[0] * self._shape[1] * self._shape[2]
+
+    @property
+    def nbytes(self) -> int:
+        return self.Packed.nbytes
+
+    def __len__(self) -> int:
+        return self._shape[0]
+
+    def set_slices(self, start: int, mask: np.ndarray) -> None:
+        """Pack the given mask slices into the mask, starting at the slice with the index start
+
+        Args:
+            start: Index of the first slice to set
+            mask: Boolean mask of the shape (rows, columns, number of slices to set)
+
+        """
+        self.Packed[:, :, start : start + mask.shape[2]] = np.packbits(mask.astype(bool, copy=False), axis=1)
+
+    def count_nonzero(self) -> int:
+        """Count the voxels in the mask without unpacking it"""
+        return int(np.bitwise_count(self.Packed).sum(dtype=np.int64))
+
+    def __array__(self, dtype: Optional[DTypeLike] = None, copy: Optional[bool] = None) -> np.ndarray:
+        mask = np.unpackbits(self.Packed, axis=1, count=self._shape[1]).view(bool)
+        return mask if dtype is None else mask.astype(dtype)
+
+    def __getitem__(self, key) -> np.ndarray:
+        key = self._expand_key(key)
+        if key is None or not all(isinstance(obj, (int, np.integer, slice)) for obj in key):
+            return np.asarray(self)[key]
+
+        row_key, column_key, slice_key = [
+            self._as_slice(obj, length) if not isinstance(obj, slice) else obj for obj, length in zip(key, self._shape)
+        ]
+
+        start, stop, step = column_key.indices(self._shape[1])
+        if step < 0:
+            mask = np.unpackbits(self.Packed[row_key, :, slice_key], axis=1, count=self._shape[1]).view(bool)
+            mask = mask[:, column_key, :]
+        elif start >= stop:
+            mask = np.zeros(
+                (len(range(*row_key.indices(self._shape[0]))), 0, len(range(*slice_key.indices(self._shape[2])))),
+                dtype=bool,
+            )
+        else:
+            # Only unpack the bytes holding the indexed columns
+            first_byte = start // 8
+            last_byte = (stop - 1) // 8 + 1
+            mask = np.unpackbits(self.Packed[row_key, first_byte:last_byte, slice_key], axis=1).view(bool)
+            mask = mask[:, start - first_byte * 8 : stop - first_byte * 8 : step, :]
+
+        # Remove the axes that were indexed with integers
+        return mask[tuple(0 if isinstance(obj, (int, np.integer)) else slice(None) for obj in key)]
+
+    def _expand_key(self, key) -> Optional[tuple]:
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if any(obj is None for obj in key):
+            return None
+
+        if any(obj is Ellipsis for obj in key):
+            ellipsis_index = [ind for ind, obj in enumerate(key) if obj is Ellipsis][0]
+            key = key[:ellipsis_index] + (slice(None),) * (3 - len(key) + 1) + key[ellipsis_index + 1 :]
+
+        return key + (slice(None),) * (3 - len(key))
+
+    @staticmethod
+    def _as_slice(index: int, length: int) -> slice:
+        if not -length <= index < length:
+            raise IndexError(f"index {index} is out of bounds for axis with size {length}")
+
+        index = int(index) % length
+        return slice(index, index + 1)
@@ -0,0 +1,410 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy import ndimage
+from skimage import morphology
+
+from .packed_mask import PackedMask
+
+logger = logging.getLogger(__name__)
+
+
+def remove_table(mask: np.ndarray) -> np.ndarray:
+    """Remove the CT table from a thresholded mask of the shape (rows, columns, slices)
+
+    The mask is eroded, the connected component at the centre of the central slice is kept and the result is dilated.
+
+    Args:
+        mask: The thresholded mask
+
+    Returns:
+        The mask without the table
+
+    """
+    return dilate_mask(mask=select_central_component(mask=erode_mask(mask=mask)))
+
+
+def erode_mask(mask: np.ndarray) -> np.ndarray:
+    """Erode a mask of the shape (rows, columns, slices) as the first step of removing the CT table
+
+    Masks with more than two slices are eroded with a cube, other masks slice by slice with a disk.
+
+    Args:
+        mask: The thresholded mask
+
+    Returns:
+        The eroded mask
+
+    """
+    if mask.shape[2] > 2:
+        return morphology.binary_erosion(image=mask, footprint=morphology.cube(width=3))
+
+    for i in range(mask.shape[2]):
+        mask[:, :, i] = morphology.binary_erosion(image=mask[:, :, i], footprint=morphology.disk(radius=3))
+
+    return mask
+
+
+def select_central_component(mask: np.ndarray) -> np.ndarray:
+    """Select the connected component at the centre of the central slice of an eroded mask
+
+    Of the components in the central 5x5 pixels, the one labelled last is selected. If the centre only contains
+    background, the complete volume is selected.
+
+    Args:
+        mask: The eroded mask
+
+    Returns:
+        The mask of the selected component
+
+    """
+    labels, _ = ndimage.label(mask)
+
+    central_position = _get_central_position(shape=labels.shape)
+
+    central_blob = np.max(
+        labels[
+            (central_position[0] - 2) : (central_position[0] + 3),
+            (central_position[1] - 2) : (central_position[1] + 3),
+            central_position[2],
+        ]
+    )
+
+    if central_blob == 0:
+        return np.ones(labels.shape, dtype=bool)
+
+    return labels == central_blob
+
+
+def dilate_mask(mask: np.ndarray) -> np.ndarray:
+    """Dilate the selected component of a mask of the shape (rows, columns, slices) as the last step of removing the
+    CT table
+
+    Masks with more than two slices are dilated with a cube, other masks slice by slice with a disk.
+
+    Args:
+        mask: The mask of the selected component
+
+    Returns:
+        The dilated mask
+
+    """
+    if mask.shape[2] > 2:
+        return morphology.binary_dilation(image=mask, footprint=morphology.cube(width=3))
+
+    for i in range(mask.shape[2]):
+        mask[:, :, i] = morphology.binary_dilation(image=mask[:, :, i], footprint=morphology.disk(radius=3))
+
+    return mask
+
+
+def insert_slice_in_table_removed_mask(
+    image_volume: np.ndarray, mask: np.ndarray, eroded_mask: np.ndarray, index: int, threshold: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Update a patient mask with the table removed, and with the holes of each slice filled, for a slice inserted in
+    the image volume
+
+    Gives the same result as segmenting the complete image volume again, but only the slices next to the inserted
+    slice are eroded. The central component is selected again and only the slices where the selected component has
+    changed, and their neighbours, are dilated and filled. Both the image volume before and after the insertion must
+    have more than two slices.
+
+    Args:
+        image_volume: The image volume, including the inserted slice
+        mask: The patient mask of the image volume without the inserted slice
+        eroded_mask: The eroded mask of the image volume without the inserted slice, see erode_mask
+        index: The index of the inserted slice in the image volume
+        threshold: HU value used as threshold when creating the patient mask
+
+    Returns:
+        The updated patient mask and eroded mask, and the indices of the slices of the patient mask that were updated
+
+    """
+    slice_count = image_volume.shape[2]
+    previous_selected = np.insert(select_central_component(mask=eroded_mask), index, False, axis=2)
+
+    # The erosion of the slices next to the inserted slice depends on the inserted slice
+    eroded_mask = np.insert(eroded_mask, index, False, axis=2)
+    start = max(index - 1, 0)
+    stop = min(index + 2, slice_count)
+    eroded_mask[:, :, start:stop] = _erode_slices(
+        image_volume=image_volume, threshold=threshold, start=start, stop=stop
+    )
+
+    selected = select_central_component(mask=eroded_mask)
+
+    changed = np.union1d(np.flatnonzero(np.any(selected != previous_selected, axis=(0, 1))), [index])
+    updated = np.unique(np.clip(np.add.outer(changed, [-1, 0, 1]).ravel(), 0, slice_count - 1))
+
+    mask = np.insert(mask, index, False, axis=2)
+    for run in np.split(updated, np.flatnonzero(np.diff(updated) > 1) + 1):
+        run_start = int(run[0])
+        run_stop = int(run[-1]) + 1
+        extended_start = max(run_start - 1, 0)
+        extended_stop = min(run_stop + 1, slice_count)
+
+        dilated = morphology.binary_dilation(
+            image=selected[:, :, extended_start:extended_stop], footprint=morphology.cube(width=3)
+        )
+        mask[:, :, run_start:run_stop] = fill_holes_slice_wise(
+            mask=dilated[:, :, run_start - extended_start : run_stop - extended_start]
+        )
+
+    return mask, eroded_mask, updated
+
+
+def fill_holes_slice_wise(mask: np.ndarray) -> np.ndarray:
+    """Fill the holes in each slice of the mask, same as ndimage.binary_fill_holes applied to each slice
+
+    The background of all slices is labelled in one pass with a structure that only connects voxels within a
+    slice. Background regions that touch the edge of their slice are outside the patient, all other background
+    regions are holes.
+
+    Args:
+        mask: The mask of the shape (rows, columns, slices)
+
+    Returns:
+        The boolean mask with the holes of each slice filled
+
+    """
+    mask = mask.astype(bool, copy=False)
+
+    structure = np.zeros((3, 3, 3), dtype=bool)
+    structure[:, :, 1] = ndimage.generate_binary_structure(rank=2, connectivity=1)
+
+    background_labels, _ = ndimage.label(np.logical_not(mask), structure=structure)
+
+    edge_labels = np.unique(
+        np.concatenate(
+            [
+                background_labels[0, :, :].ravel(),
+                background_labels[-1, :, :].ravel(),
+                background_labels[:, 0, :].ravel(),
+                background_labels[:, -1, :].ravel(),
+            ]
+        )
+    )
+    edge_labels = edge_labels[edge_labels > 0]
+
+    # Look up the outside regions in a table indexed by label instead of comparing each label
+    outside = np.zeros(int(background_labels.max()) + 1, dtype=bool)
+    outside[edge_labels] = True
+
+    return np.logical_not(outside[background_labels])
+
+
+def get_patient_mask_chunked(
+    image_volume: ArrayLike, threshold: int, remove_table_from_mask: bool = False, slab_size: int = 64
+) -> PackedMask:
+    """Segment an image volume of the shape (rows, columns, slices) in slabs of slices and return a packed mask
+
+    The result is the same as thresholding the complete volume, optionally removing the table with
+    :func:`~dicom_image_tools.helpers.patient_segmentation.remove_table`, and filling the holes of each slice, but
+    only a slab of slices, plus one slice of overlap on each side for the 3D erosion and dilation, is held unpacked at
+    a time. The connected components of the eroded slabs are joined across the slab boundaries so that the component
+    at the centre of the volume is selected over all slabs. The slabs are read with
+    ``image_volume[:, :, start:stop]``, so lazy image volumes are decoded one slab at a time.
+
+    Volumes with two slices or less are segmented in memory.
+
+    Args:
+        image_volume: The image volume
+        threshold: HU value to use as threshold
+        remove_table_from_mask: Remove the CT table from the mask. Defaults to False
+        slab_size: The number of slices to segment at a time. Defaults to 64
+
+    Raises:
+        TypeError: If slab_size is not an integer
+        ValueError: If slab_size is smaller than 1
+
+    Returns:
+        The patient mask packed with one bit per voxel
+
+    """
+    if not isinstance(slab_size, int) or isinstance(slab_size, bool):
+        raise TypeError("The slab size must be given as an integer")
+
+    if slab_size < 1:
+        raise ValueError("The slab size must be at least 1")
+
+    shape = tuple(image_volume.shape)
+    packed_mask = PackedMask(shape=shape)
+    slab_starts = list(range(0, shape[2], slab_size))
+
+    if remove_table_from_mask and shape[2] <= 2:
+        mask = remove_table(mask=np.asarray(image_volume) >= threshold)
+        packed_mask.set_slices(start=0, mask=fill_holes_slice_wise(mask=mask))
+        return packed_mask
+
+    if not remove_table_from_mask:
+        for start in slab_starts:
+            stop = min(start + slab_size, shape[2])
+            mask = np.asarray(image_volume[:, :, start:stop]) >= threshold
+            packed_mask.set_slices(start=start, mask=fill_holes_slice_wise(mask=mask))
+        return packed_mask
+
+    components = _SlabComponents(image_volume=image_volume, threshold=threshold, slab_size=slab_size)
+    central_component = components.get_central_component()
+
+    logger.debug(f"Dilating and filling the patient mask in {len(slab_starts)} slabs")
+
+    # The dilation of a slab needs the selected component in the last slice of the previous slab and in the first
+    # slice of the next slab
+    previous_last_slice = None
+    current = components.get_selected_slab(index=0, component=central_component)
+    for ind, start in enumerate(slab_starts):
+        following = (
+            components.get_selected_slab(index=ind + 1, component=central_component)
+            if ind + 1 < len(slab_starts)
+            else None
+        )
+
+        parts = [current]
+        if previous_last_slice is not None:
+            parts.insert(0, previous_last_slice)
+        if following is not None:
+            parts.append(following[:, :, :1])
+
+        dilated = morphology.binary_dilation(image=np.concatenate(parts, axis=2), footprint=morphology.cube(width=3))
+        first = 0 if previous_last_slice is None else 1
+        dilated = dilated[:, :, first : first + current.shape[2]]
+
+        packed_mask.set_slices(start=start, mask=fill_holes_slice_wise(mask=dilated))
+
+        previous_last_slice = current[:, :, -1:]
+        current = following
+
+    return packed_mask
+
+
+def _erode_slices(image_volume: ArrayLike, threshold: int, start: int, stop: int) -> np.ndarray:
+    # Erode with one slice of overlap on each side so that the eroded slices equal the eroded complete volume
+    extended_start = max(start - 1, 0)
+    extended_stop = min(stop + 1, image_volume.shape[2])
+
+    mask = np.asarray(image_volume[:, :, extended_start:extended_stop]) >= threshold
+    eroded = morphology.binary_erosion(image=mask, footprint=morphology.cube(width=3))
+
+    return eroded[:, :, start - extended_start : stop - extended_start]
+
+
+def _get_central_position(shape) -> List[int]:
+    return [
+        int(np.floor(np.divide(float(shape[0]), 2.0))),
+        int(np.floor(np.divide(float(shape[1]), 2.0))),
+        int(np.floor(np.divide(float(shape[2]), 2.0))),
+    ]
+
+
+class _SlabComponents:
+    """The connected components of the eroded, thresholded image volume, labelled one slab at a time
+
+    The labels of each slab are offset to be unique over the volume and the components that continue across a slab
+    boundary are joined with a union-find structure. The first voxel of each component, in the C-order of the complete
+    volume, is kept so that the components can be ordered the same way as when labelling the complete volume.
+    """
+
+    def __init__(self, image_volume: ArrayLike, threshold: int, slab_size: int):
+        self._image_volume = image_volume
+        self._threshold = threshold
+        self._slab_size = slab_size
+        self._shape = tuple(image_volume.shape)
+
+        # Index 0 is the background
+        self._parent: List[int] = [0]
+        self._first_voxel: List[int] = [-1]
+        self._offsets: List[int] = []
+        self._central_labels: Optional[np.ndarray] = None
+
+        self._label_slabs()
+
+    def get_central_component(self) -> int:
+        """Get the root of the component in the central patch that is labelled last, or 0 for the background"""
+        labels = np.unique(self._central_labels)
+        labels = labels[labels > 0]
+
+        if not labels.size:
+            return 0
+
+        roots = {self._find(int(label)) for label in labels}
+        return max(roots, key=lambda root: self._first_voxel[root])
+
+    def get_selected_slab(self, index: int, component: int) -> np.ndarray:
+        """Get the mask of the given component in the slab with the index. Component 0 selects the complete slab"""
+        labels, count = self._get_slab_labels(index=index)
+
+        if component == 0:
+            return np.ones(labels.shape, dtype=bool)
+
+        offset = self._offsets[index]
+        selected = np.zeros(count + 1, dtype=bool)
+        selected[1:] = [self._find(offset + label) == component for label in range(1, count + 1)]
+
+        return selected[labels]
+
+    def _label_slabs(self) -> None:
+        central_position = _get_central_position(shape=self._shape)
+        previous_last_slice = None
+
+        for ind, start in enumerate(range(0, self._shape[2], self._slab_size)):
+            labels, count = self._get_slab_labels(index=ind)
+            offset = len(self._parent) - 1
+            self._offsets.append(offset)
+
+            # First voxel of each component in the C-order of the complete volume
+            unique_labels, first_index = np.unique(labels.ravel(), return_index=True)
+            rows, columns, slices = np.unravel_index(first_index, labels.shape)
+            first_voxel = (rows * self._shape[1] + columns) * self._shape[2] + start + slices
+            first_voxel_by_label: Dict[int, int] = dict(zip(unique_labels.tolist(), first_voxel.tolist()))
+
+            for label in range(1, count + 1):
+                self._parent.append(offset + label)
+                self._first_voxel.append(first_voxel_by_label[label])
+
+            first_slice = np.where(labels[:, :, 0] > 0, labels[:, :, 0] + offset, 0)
+            if previous_last_slice is not None:
+                connected = (previous_last_slice > 0) & (first_slice > 0)
+                pairs = np.unique(np.stack([previous_last_slice[connected], first_slice[connected]]), axis=1)
+                for previous_label, label in pairs.T:
+                    self._union(int(previous_label), int(label))
+
+            previous_last_slice = np.where(labels[:, :, -1] > 0, labels[:, :, -1] + offset, 0)
+
+            if start <= central_position[2] < start + labels.shape[2]:
+                self._central_labels = labels[
+                    (central_position[0] - 2) : (central_position[0] + 3),
+                    (central_position[1] - 2) : (central_position[1] + 3),
+                    central_position[2] - start,
+                ]
+                self._central_labels = np.where(self._central_labels > 0, self._central_labels + offset, 0)
+
+    def _get_slab_labels(self, index: int):
+        start = index * self._slab_size
+        stop = min(start + self._slab_size, self._shape[2])
+
+        return ndimage.label(
+            _erode_slices(image_volume=self._image_volume, threshold=self._threshold, start=start, stop=stop)
+        )
+
+    def _find(self, label: int) -> int:
+        root = label
+        while self._parent[root] != root:
+            root = self._parent[root]
+
+        # Compress the path
+        while self._parent[label] != root:
+            self._parent[label], label = root, self._parent[label]
+
+        return root
+
+    def _union(self, label: int, other: int) -> None:
+        root = self._find(label)
+        other_root = self._find(other)
+
+        if root == other_root:
+            return
+
+        self._parent[other_root] = root
+        self._first_voxel[root] = min(self._first_voxel[root], self._first_voxel[other_root])
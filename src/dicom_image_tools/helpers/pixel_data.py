@@ -1,25 +1,142 @@
 import logging
+from typing import Optional, Union
 
 import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+from numpy.typing import ArrayLike, DTypeLike
 from pydicom import Dataset
 
 log = logging.getLogger(__name__)
 
+# Data types that the pixel data can be decoded to. "native" keeps the stored values and applies the rescale lazily
+PIXEL_DATA_DTYPES = ["float64", "float32", "native"]
 
-def get_pixel_array(dcm: Dataset) -> np.ndarray:
+
+class RescaledPixelArray(NDArrayOperatorsMixin):
+    """Stored pixel values together with the rescale slope and intercept that maps them to output values, e.g., HU.
+
+    The rescale is applied when the values are accessed, so indexing returns rescaled values in float64 while only the
+    stored values are kept in memory. Converting the object to a numpy array, or using it in numpy arithmetic,
+    returns the complete rescaled array.
+
+    Args:
+        stored_values: The stored pixel values
+        slope: The rescale slope, given as a scalar or as an array that can be broadcast to the stored values
+        intercept: The rescale intercept, given as a scalar or as an array that can be broadcast to the stored values
+
+    Attributes:
+        StoredValues: The stored pixel values
+        Slope: The rescale slope
+        Intercept: The rescale intercept
+
+    """
+
+    def __init__(self, stored_values: np.ndarray, slope: ArrayLike = 1.0, intercept: ArrayLike = 0.0):
+        self.StoredValues: np.ndarray = stored_values
+        self.Slope: np.ndarray = np.asarray(slope, dtype=float)
+        self.Intercept: np.ndarray = np.asarray(intercept, dtype=float)
+
+    @property
+    def shape(self):
+        return self.StoredValues.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.StoredValues.ndim
+
+    @property
+    def size(self) -> int:
+        return self.StoredValues.size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(float)
+
+    def __len__(self) -> int:
+        return len(self.StoredValues)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self._rescale(
+            self.StoredValues[key],
+            slope=self.Slope if self.Slope.ndim == 0 else np.broadcast_to(self.Slope, self.shape)[key],
+            intercept=self.Intercept if self.Intercept.ndim == 0 else np.broadcast_to(self.Intercept, self.shape)[key],
+        )
+
+    def __array__(self, dtype: Optional[DTypeLike] = None, copy: Optional[bool] = None) -> np.ndarray:
+        values = self._rescale(self.StoredValues, slope=self.Slope, intercept=self.Intercept)
+
+        return values if dtype is None else values.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(np.asarray(obj) if isinstance(obj, RescaledPixelArray) else obj for obj in inputs)
+
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def copy(self) -> np.ndarray:
+        return np.asarray(self)
+
+    @staticmethod
+    def _rescale(values: np.ndarray, slope: np.ndarray, intercept: np.ndarray) -> np.ndarray:
+        # Same operations, in the same order, as when rescaling in get_pixel_array
+        values = values.astype(float)
+        values *= slope
+        values += intercept
+
+        return values
+
+
+def validate_pixel_data_dtype(dtype: str) -> None:
+    """Validate that the given data type is one of the supported pixel data types
+
+    Args:
+        dtype: The data type to validate
+
+    Raises:
+        TypeError: If the data type is not given as a string
+        ValueError: If the data type is not one of the supported pixel data types
+
+    """
+    if not isinstance(dtype, str):
+        raise TypeError(f"The pixel data type must be given as one of the strings {', '.join(PIXEL_DATA_DTYPES)}")
+
+    if dtype not in PIXEL_DATA_DTYPES:
+        raise ValueError(f"The pixel data type must be one of {', '.join(PIXEL_DATA_DTYPES)}")
+
+
+def get_pixel_array(dcm: Dataset, dtype: str = "float64") -> Union[np.ndarray, RescaledPixelArray]:
     """Take a DICOM dataset, extract the pixels, rescale the values according to metadata. Return the extracted image
-    as a numpy ndarray of int16 values
+    as a numpy ndarray of the requested data type
 
     Args:
         dcm: The DICOM dataset from which the image should be extracted
+        dtype: The data type of the returned image, one of "float64", "float32" and "native". For "native" the stored
+            pixel values are kept and returned in a RescaledPixelArray that applies the rescale when accessed.
+            Defaults to "float64"
 
     Returns:
-        Extracted image as a numpy ndarray of int16 numbers
+        Extracted image as a numpy ndarray, or as a RescaledPixelArray if dtype is "native"
 
     """
-    px = dcm.pixel_array.astype(float)
+    validate_pixel_data_dtype(dtype=dtype)
+
+    is_dose_matrix = "Modality" in dcm and dcm.Modality.casefold() == "RTDOSE".casefold()
+
+    if dtype == "native":
+        if is_dose_matrix:
+            return RescaledPixelArray(
+                stored_values=dcm.pixel_array,
+                slope=float(dcm.DoseGridScaling) if "DoseGridScaling" in dcm else 1.0,
+            )
 
-    if "Modality" in dcm and dcm.Modality.casefold() == "RTDOSE".casefold():
+        return RescaledPixelArray(
+            stored_values=dcm.pixel_array,
+            slope=float(dcm.RescaleSlope) if "RescaleSlope" in dcm else 1.0,
+            intercept=float(dcm.RescaleIntercept) if "RescaleIntercept" in dcm else 0.0,
+        )
+
+    px = dcm.pixel_array.astype(np.float32 if dtype == "float32" else float)
+
+    if is_dose_matrix:
         return rescale_dose_matrix_pixel_array(pixel_array=px, dcm=dcm)
 
     if "RescaleSlope" in dcm:
@@ -41,12 +158,16 @@ def rescale_dose_matrix_pixel_array(pixel_array: np.ndarray, dcm: Dataset) -> np
         dcm: The dataset containing information on the dose matrix
 
     Returns:
-        The rescaled dose matrix as a numpy.ndarray of int16 numbers
+        The rescaled dose matrix as a numpy.ndarray of floats. Float32 dose matrices are kept as float32
 
     """
     if "DoseGridScaling" in dcm:
         scaling_factor = dcm.DoseGridScaling
         log.debug(f"Rescaling dose matrix by DoseGridScaling of {scaling_factor}")
-        pixel_array = pixel_array.astype(float) * float(scaling_factor)
+
+        if pixel_array.dtype != np.float32:
+            pixel_array = pixel_array.astype(float)
+
+        pixel_array = pixel_array * float(scaling_factor)
 
     return pixel_array
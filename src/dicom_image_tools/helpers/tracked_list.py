@@ -0,0 +1,74 @@
+from typing import Any, Iterable
+
+
+class TrackedList(list):
+    """A list that counts the changes made to it, so that lookups built from the list can tell when they are out of date
+
+    The version is increased by every method that changes the content or order of the list, including item and slice
+    assignment and deletion.
+
+    Args:
+        iterable: The initial items of the list
+
+    Attributes:
+        version: The number of changes made to the list
+
+    """
+
+    def __init__(self, iterable: Iterable = ()):
+        super().__init__(iterable)
+        self.version: int = 0
+
+    def _changed(self) -> None:
+        self.version = getattr(self, "version", 0) + 1
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, other: Iterable) -> "TrackedList":
+        result = super().__iadd__(other)
+        self._changed()
+        return result
+
+    def __imul__(self, other: int) -> "TrackedList":
+        result = super().__imul__(other)
+        self._changed()
+        return result
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._changed()
+
+    def extend(self, other: Iterable) -> None:
+        super().extend(other)
+        self._changed()
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, item)
+        self._changed()
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def validate_workers(workers: Optional[int]) -> None:
+    """Validate the number of workers given for a parallel operation
+
+    Args:
+        workers: The number of workers. None means that the operation is run serially
+
+    Raises:
+        TypeError: If workers is not an integer
+        ValueError: If workers is less than 1
+
+    """
+    if workers is None:
+        return
+
+    if not isinstance(workers, int) or isinstance(workers, bool):
+        raise TypeError("workers must be given as an integer")
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
@@ -1,14 +1,18 @@
 import logging
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from scipy.stats import sem
 
 from ..helpers.point import Point
 from ..helpers.voxel_data import VoxelData
+from ..helpers.workers import validate_workers
+from ..roi.integral_image_statistics import IntegralImageStatistics
 from ..roi.square_roi import SquareRoi
 
 FloatListType = Union[float, List[float]]
+RandomStateType = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
 
 LCD_CONSTANT = 3.29  # Value from A. Radice et al. (2016) Physica Medica (32)
 
@@ -44,14 +48,35 @@ def lcd_statistical_random(
     object_size: float,
     rois: Optional[int] = 1000,
     return_rois: Optional[bool] = False,
+    rng: RandomStateType = None,
 ) -> Dict[str, Union[str, float, List[float]]]:
     """Implements a statistical method for determining the low contrast detectability (LCD) or low contrast limit (LCL)
 
+    The analysis matrix is covered by a grid of square ROIs, and the remaining ROIs are placed randomly. The ROIs are
+    placed as SquareRoi objects with resize_too_big_roi=True, but their statistics are calculated for all ROIs at once
+    from integral images of the analysis matrix, see
+    :class:`~dicom_image_tools.roi.integral_image_statistics.IntegralImageStatistics`. SquareRoi objects are only
+    created if return_rois is True.
+
+    The random ROIs are placed with the given random number generator, or a generator seeded with the given seed, to
+    make the results reproducible. Without one, the global numpy random state is used.
+
+    The x coordinates of all random ROIs are drawn in one batch, followed by the y coordinates, instead of drawing
+    both coordinates ROI by ROI as in earlier versions. The same global numpy seed therefore places the random ROIs
+    differently than before, while the results of the structured grid of ROIs are unchanged.
+
     Args:
         analysis_matrix: Matrix of the homogeneous image area that is to be analysed
         pixel_size: The voxel data for the analysis_matrix
         object_size: The side of the object to analyse for in mm
         rois: The number of ROIs to include in the analysis
+        return_rois: Include the ROIs used in the output. Defaults to False
+        rng: A numpy random Generator, or a seed or SeedSequence to create one from, used for placing the random ROIs.
+            Defaults to None, i.e., the global numpy random state
+
+    Raises:
+        TypeError: If any of the arguments is of the wrong type
+        ValueError: If the object size is smaller than one pixel
 
     Returns:
         Dictionary containing the mean, standard deviation, standard error and LCD on the form
@@ -79,6 +104,183 @@ def lcd_statistical_random(
     if not isinstance(rois, int):
         raise TypeError("The number of ROIs (rois) must be an integer")
 
+    generator = _get_generator(rng=rng)
+
+    return _lcd_statistical_random(
+        statistics=_RoiStatisticsCalculator(analysis_matrix=analysis_matrix),
+        pixel_size=pixel_size,
+        object_size=object_size,
+        rois=rois,
+        return_rois=return_rois,
+        rng=generator,
+    )
+
+
+def lcd_statistical_random_sweep(
+    analysis_matrix: np.ndarray,
+    pixel_size: VoxelData,
+    object_sizes: List[float],
+    rois: Optional[int] = 1000,
+    return_rois: Optional[bool] = False,
+    workers: Optional[int] = None,
+    rng: RandomStateType = None,
+) -> List[Dict[str, Union[str, float, List[float]]]]:
+    """Determine the low contrast detectability (LCD) for a set of object sizes, e.g., to get the LCD curve of an image
+
+    Gives the same results as calling lcd_statistical_random once per object size, but the integral images of the
+    analysis matrix are only calculated once and shared by all object sizes. The object sizes can be analysed in
+    parallel threads by specifying the number of workers.
+
+    If a random number generator or seed is given, each object size gets an independent random stream spawned from it,
+    so the results do not depend on the number of workers. Without one, the global numpy random state is shared by
+    the object sizes and the results of a parallel sweep are not reproducible. As for lcd_statistical_random, a given
+    global numpy seed places the random ROIs differently than in earlier versions.
+
+    Args:
+        analysis_matrix: Matrix of the homogeneous image area that is to be analysed
+        pixel_size: The voxel data for the analysis_matrix
+        object_sizes: The sides of the objects to analyse for in mm
+        rois: The number of ROIs to include in the analysis of each object size
+        return_rois: Include the ROIs used in the output. Defaults to False
+        workers: The number of threads to analyse the object sizes with. Defaults to None, i.e., a serial analysis
+        rng: A numpy random Generator, or a seed or SeedSequence to create one from, to spawn the random streams of the
+            object sizes from. Defaults to None, i.e., the global numpy random state
+
+    Raises:
+        TypeError: If any of the arguments is of the wrong type
+        ValueError: If any object size is smaller than one pixel or if workers is less than 1
+
+    Returns:
+        The output of lcd_statistical_random for each object size, in the order the object sizes were given
+
+    """
+    if not isinstance(analysis_matrix, np.ndarray):
+        raise TypeError("The analysis matrix must be a numpy ndarray")
+
+    if not isinstance(pixel_size, VoxelData):
+        raise TypeError("The pixel_size must be given as a VoxelData object")
+
+    if not isinstance(object_sizes, list) or not all(isinstance(object_size, float) for object_size in object_sizes):
+        raise TypeError("The object sizes must be given as a list of floats")
+
+    if not isinstance(rois, int):
+        raise TypeError("The number of ROIs (rois) must be an integer")
+
+    validate_workers(workers=workers)
+
+    generators = _spawn_generators(rng=rng, count=len(object_sizes))
+    statistics = _RoiStatisticsCalculator(analysis_matrix=analysis_matrix)
+
+    def analyse(
+        object_size: float, generator: Optional[np.random.Generator]
+    ) -> Dict[str, Union[str, float, List[float]]]:
+        return _lcd_statistical_random(
+            statistics=statistics,
+            pixel_size=pixel_size,
+            object_size=object_size,
+            rois=rois,
+            return_rois=return_rois,
+            rng=generator,
+        )
+
+    if workers is None or workers == 1:
+        return [analyse(object_size, generator) for object_size, generator in zip(object_sizes, generators)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyse, object_sizes, generators))
+
+
+def lcd_statistical_random_batch(
+    analysis_matrices: List[np.ndarray],
+    pixel_size: VoxelData,
+    object_sizes: List[float],
+    rois: Optional[int] = 1000,
+    seed: Optional[Union[int, np.random.SeedSequence]] = None,
+    workers: Optional[int] = None,
+) -> List[List[Dict[str, Union[str, float, List[float]]]]]:
+    """Determine the LCD curves of a set of images, e.g., the slices of a phantom series, in parallel processes
+
+    Each image is analysed with lcd_statistical_random_sweep in a separate process. The random streams of the images are
+    spawned from the seed, so the results are reproducible for a given seed and do not depend on the number of
+    workers.
+
+    Args:
+        analysis_matrices: The matrices of the homogeneous image areas that are to be analysed
+        pixel_size: The voxel data for the analysis matrices
+        object_sizes: The sides of the objects to analyse for in mm
+        rois: The number of ROIs to include in the analysis of each object size
+        seed: The seed, or SeedSequence, to spawn the random streams of the images from. Defaults to None, i.e., fresh
+            entropy from the operating system
+        workers: The number of processes to analyse the images with. Defaults to None, i.e., a serial analysis
+
+    Raises:
+        TypeError: If any of the arguments is of the wrong type
+        ValueError: If any object size is smaller than one pixel or if workers is less than 1
+
+    Returns:
+        The output of lcd_statistical_random_sweep for each image, in the order the images were given
+
+    """
+    if not isinstance(analysis_matrices, list) or not all(isinstance(obj, np.ndarray) for obj in analysis_matrices):
+        raise TypeError("The analysis matrices must be given as a list of numpy ndarrays")
+
+    if seed is not None and not isinstance(seed, np.random.SeedSequence) and not _is_integer(seed):
+        raise TypeError("The seed must be given as an integer or a numpy SeedSequence")
+
+    validate_workers(workers=workers)
+
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    arguments = [
+        dict(analysis_matrix=analysis_matrix, pixel_size=pixel_size, object_sizes=object_sizes, rois=rois, rng=child)
+        for analysis_matrix, child in zip(analysis_matrices, seed_sequence.spawn(len(analysis_matrices)))
+    ]
+
+    if workers is None or workers == 1:
+        return [_lcd_statistical_random_sweep_from_arguments(obj) for obj in arguments]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_lcd_statistical_random_sweep_from_arguments, arguments))
+
+
+def _lcd_statistical_random_sweep_from_arguments(
+    arguments: Dict[str, Any],
+) -> List[Dict[str, Union[str, float, List[float]]]]:
+    # Module level function that can be pickled and run in a worker process
+    return lcd_statistical_random_sweep(**arguments)
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _get_generator(rng: RandomStateType) -> Optional[np.random.Generator]:
+    if rng is None or isinstance(rng, np.random.Generator):
+        return rng
+
+    if not isinstance(rng, np.random.SeedSequence) and not _is_integer(rng):
+        raise TypeError("rng must be given as a numpy Generator, a SeedSequence or an integer seed")
+
+    return np.random.default_rng(rng)
+
+
+def _spawn_generators(rng: RandomStateType, count: int) -> List[Optional[np.random.Generator]]:
+    generator = _get_generator(rng=rng)
+    if generator is None:
+        return [None] * count
+
+    return generator.spawn(count)
+
+
+def _lcd_statistical_random(
+    statistics: "_RoiStatisticsCalculator",
+    pixel_size: VoxelData,
+    object_size: float,
+    rois: int,
+    return_rois: bool,
+    rng: Optional[np.random.Generator],
+) -> Dict[str, Union[str, float, List[float]]]:
+    analysis_matrix_shape = statistics.shape
+
     output = {
         "Hole Diameter": f"{object_size:.2f}mm",
         "ROI Box Size": f"{int(np.floor(object_size / pixel_size.x))}pixel",
@@ -89,75 +291,131 @@ def lcd_statistical_random(
         "Perc Contrast At 95 Perc CL": float(),
     }
 
-    result = {
-        "Mean": [],
-        "SD": [],
-        "Std Error Mean": [],
-        "ROIs": [],
-    }
-
     log.info(f"Calculating LCD from a set of {rois} ROIs of size {object_size:.3f} mm")
 
     # Place ROIs and get ROI statistics
     roi_size = [np.floor(np.divide(object_size, pixel_size.x)), np.floor(np.divide(object_size, pixel_size.y))]
-    structured_rois = [analysis_matrix.shape[1] // roi_size[0], analysis_matrix.shape[0] // roi_size[1]]
+    if roi_size[0] < 1 or roi_size[1] < 1:
+        raise ValueError("The object size must correspond to at least one pixel")
+
+    structured_rois = [analysis_matrix_shape[1] // roi_size[0], analysis_matrix_shape[0] // roi_size[1]]
     random_rois = int(np.floor(rois - structured_rois[0] * structured_rois[1]))
 
+    # The size of the ROIs in pixels as calculated by SquareRoi
+    roi_pixels = (int(np.floor(object_size / pixel_size.y + 0.5)), int(np.floor(object_size / pixel_size.x + 0.5)))
+
     # Determine the mean values and standard deviation for a structured ROI set
-    for col in range(int(structured_rois[0])):
-        for row in range(int(structured_rois[1])):
-            roi = SquareRoi(
-                center=Point(
-                    x=int(col * roi_size[0] + np.ceil(roi_size[0] / 2)),
-                    y=int(row * roi_size[1] + np.ceil(roi_size[1] / 2)),
-                ),
+    columns, rows = np.meshgrid(np.arange(int(structured_rois[0])), np.arange(int(structured_rois[1])), indexing="ij")
+    structured_x = (columns.ravel() * roi_size[0] + np.ceil(roi_size[0] / 2)).astype(np.int64)
+    structured_y = (rows.ravel() * roi_size[1] + np.ceil(roi_size[1] / 2)).astype(np.int64)
+    structured_mean, structured_sd, structured_sem = statistics.get(
+        center_x=structured_x, center_y=structured_y, roi_pixels=roi_pixels
+    )
+
+    # Determine the mean value and standard deviation in a set of randomly placed ROIs. ROIs that give NaN statistics
+    # are placed again, up to 1000 times each. The coordinates are drawn in batches, x before y, which consumes the
+    # random numbers in another order than placing the ROIs one by one
+    random_rois = max(random_rois, 0)
+    random_x = np.zeros(random_rois, dtype=np.int64)
+    random_y = np.zeros(random_rois, dtype=np.int64)
+    random_mean = np.full(random_rois, np.nan)
+    random_sd = np.full(random_rois, np.nan)
+    random_sem = np.full(random_rois, np.nan)
+    valid = np.zeros(random_rois, dtype=bool)
+
+    pending = np.arange(random_rois)
+    for _ in range(1000):
+        if not pending.size:
+            break
+
+        random_x[pending] = _get_random_integers(rng=rng, high=analysis_matrix_shape[1], size=pending.size) + int(
+            np.ceil(np.divide(roi_size[0], 2))
+        )
+        random_y[pending] = _get_random_integers(rng=rng, high=analysis_matrix_shape[0], size=pending.size) + int(
+            np.ceil(np.divide(roi_size[1], 2))
+        )
+        mean, sd, std_error = statistics.get(
+            center_x=random_x[pending], center_y=random_y[pending], roi_pixels=roi_pixels
+        )
+
+        placed = ~np.isnan(mean) & ~np.isnan(sd) & ~np.isnan(std_error)
+        random_mean[pending[placed]] = mean[placed]
+        random_sd[pending[placed]] = sd[placed]
+        random_sem[pending[placed]] = std_error[placed]
+        valid[pending[placed]] = True
+        pending = pending[~placed]
+
+    result_mean = np.concatenate([structured_mean, random_mean[valid]])
+    result_sd = np.concatenate([structured_sd, random_sd[valid]])
+    result_sem = np.concatenate([structured_sem, random_sem[valid]])
+
+    # Calculate the mean value and related values from the ROIs
+    output["Mean"] = np.mean(result_mean)
+    output["Std Error Mean"] = np.mean(result_sem)
+    output["SD"] = np.mean(result_sd)
+    output["Error SD"] = sem(result_sd)
+    output["Perc Contrast At 95 Perc CL"] = lcd_statistical(stderr=output["Std Error Mean"])
+
+    if return_rois:
+        output["ROIs"] = [
+            SquareRoi(
+                center=Point(x=int(x), y=int(y)),
                 height=object_size,
                 width=object_size,
                 pixel_size=pixel_size,
                 resize_too_big_roi=True,
             )
-            result["Mean"].append(roi.get_mean(analysis_matrix))
-            result["SD"].append(roi.get_stdev(analysis_matrix))
-            result["Std Error Mean"].append(roi.get_std_error_of_the_mean(analysis_matrix))
-            result["ROIs"].append(roi)
-
-    if random_rois > 0:
-        # Determine the mean value and standard deviation in a set of randomly placed ROIs
-        for _ in range(random_rois):
-            valid_roi = False
-            n = 0
-            while not valid_roi and n < 1000:
-                roi = SquareRoi(
-                    center=Point(
-                        x=int(np.random.randint(0, analysis_matrix.shape[1]) + np.ceil(np.divide(roi_size[0], 2))),
-                        y=int(np.random.randint(0, analysis_matrix.shape[0]) + np.ceil(np.divide(roi_size[1], 2))),
-                    ),
-                    height=object_size,
-                    width=object_size,
-                    pixel_size=pixel_size,
-                    resize_too_big_roi=True,
-                )
-                tmp_mean = roi.get_mean(analysis_matrix)
-                tmp_sd = roi.get_stdev(analysis_matrix)
-                tmp_sem = roi.get_std_error_of_the_mean(analysis_matrix)
-
-                n += 1
-                valid_roi = not np.isnan(tmp_mean) and not np.isnan(tmp_sd) and not np.isnan(tmp_sem)
-
-            if valid_roi:
-                result["Mean"].append(tmp_mean)
-                result["SD"].append(tmp_sd)
-                result["Std Error Mean"].append(tmp_sem)
-                result["ROIs"].append(roi)
+            for x, y in zip(
+                np.concatenate([structured_x, random_x[valid]]), np.concatenate([structured_y, random_y[valid]])
+            )
+        ]
 
-    # Calculate the mean value and related values from the ROIs
-    output["Mean"] = np.mean(result["Mean"])
-    output["Std Error Mean"] = np.mean(result["Std Error Mean"])
-    output["SD"] = np.mean(result["SD"])
-    output["Error SD"] = sem(result["SD"])
-    output["Perc Contrast At 95 Perc CL"] = lcd_statistical(stderr=output["Std Error Mean"])
+    return output
 
-    if return_rois:
-        output["ROIs"] = result["ROIs"]
 
-    return output
+def _get_random_integers(rng: Optional[np.random.Generator], high: int, size: int) -> np.ndarray:
+    if rng is None:
+        return np.random.randint(0, high, size=size)
+
+    return rng.integers(0, high, size=size)
+
+
+class _RoiStatisticsCalculator:
+    """Calculates the mean, standard deviation and standard error of the mean of square ROIs placed as by SquareRoi,
+    with resize_too_big_roi=True, from integral images of the analysis matrix. ROIs containing NaN values get NaN
+    statistics"""
+
+    def __init__(self, analysis_matrix: np.ndarray):
+        self.shape: Tuple[int, int] = analysis_matrix.shape
+
+        nan_values = np.isnan(analysis_matrix)
+        self._nan_statistics = None
+        if np.any(nan_values):
+            self._nan_statistics = IntegralImageStatistics(image=nan_values.astype(float))
+            analysis_matrix = np.where(nan_values, 0.0, analysis_matrix)
+
+        self._statistics = IntegralImageStatistics(image=analysis_matrix)
+
+    def get(
+        self, center_x: np.ndarray, center_y: np.ndarray, roi_pixels: Tuple[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        height_pixels = max(roi_pixels[0] - 1, 0)
+        width_pixels = max(roi_pixels[1] - 1, 0)
+
+        left = np.maximum(np.floor(center_x - width_pixels / 2 + 0.5), 0).astype(np.int64)
+        top = np.maximum(np.floor(center_y - height_pixels / 2 + 0.5), 0).astype(np.int64)
+        right = np.floor(center_x + width_pixels / 2 + 0.5).astype(np.int64) + 1
+        bottom = np.floor(center_y + height_pixels / 2 + 0.5).astype(np.int64) + 1
+
+        if np.any(left > self.shape[1]) or np.any(top > self.shape[0]):
+            raise ValueError("Entire image outside of the image")
+
+        statistics = self._statistics.get_box_statistics(top=top, bottom=bottom, left=left, right=right)
+        mean, sd, std_error = statistics.mean, statistics.stdev, statistics.std_error_of_the_mean
+
+        if self._nan_statistics is not None:
+            # The NaN counts are only integral to within floating point precision
+            nan_count = self._nan_statistics.get_box_statistics(top=top, bottom=bottom, left=left, right=right).sum
+            mean, sd, std_error = [np.where(nan_count > 0.5, np.nan, values) for values in (mean, sd, std_error)]
+
+        return mean, sd, std_error
@@ -1,15 +1,33 @@
+import logging
+from typing import Optional, Tuple
+
 import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
 from scipy import ndimage
 
+log = logging.getLogger(__name__)
+
+# Engines available for calculating variance images
+VARIANCE_IMAGE_ENGINES = ["uniform_filter", "generic_filter"]
+
 
-def get_variance_image_2d(image: np.ndarray, window_side_x: int = 3, window_side_y: int = 3) -> np.ndarray:
+def get_variance_image_2d(
+    image: np.ndarray, window_side_x: int = 3, window_side_y: int = 3, engine: str = "uniform_filter"
+) -> np.ndarray:
     """Calculates and returns a variance image using a rolling window with the side lengths specified. Returns a
     variance image of the same dimensions as the input image
 
+    The "uniform_filter" engine calculates the variance as the local mean of the squared pixel values minus the squared
+    local mean, with both local means from running sums. It gives the same result as the "generic_filter" engine,
+    which calls numpy.var for the window of each pixel, to within floating point precision and is orders of magnitude
+    faster. Both engines reflect the image at its edges.
+
     Args:
         image: An image for which the variance image should be calculated
         window_side_x: The horizontal side (columns) of the rolling window applied. Default = 3
         window_side_y: The vertical side (rows) of the rolling window applied. Default = 3
+        engine: The engine to calculate the variance image with, "uniform_filter" or "generic_filter". Default =
+            "uniform_filter"
 
     Returns:
         A numpy ndarray of the same dimensions as the input image showing the variance at each pixel
@@ -21,5 +39,144 @@ def get_variance_image_2d(image: np.ndarray, window_side_x: int = 3, window_side
             f"The window sides have to be specified as integers. Current types: window_side_x={type(window_side_x)}, "
             f"window_side_y={type(window_side_y)}"
         )
+    if engine not in VARIANCE_IMAGE_ENGINES:
+        raise ValueError(f"The engine must be one of {', '.join(VARIANCE_IMAGE_ENGINES)}")
+
+    if engine == "generic_filter":
+        return ndimage.generic_filter(image.astype(float), np.var, size=(window_side_y, window_side_x))
+
+    return _get_local_variance(image=image.astype(float), size=(window_side_y, window_side_x))
+
+
+def get_variance_volume(
+    image_volume: ArrayLike,
+    window_side_x: int = 3,
+    window_side_y: int = 3,
+    window_side_z: int = 1,
+    mask: Optional[ArrayLike] = None,
+    standard_deviation: bool = False,
+    slab_size: Optional[int] = None,
+    dtype: DTypeLike = np.float64,
+) -> np.ndarray:
+    """Calculate the local variance, or noise, of each voxel in an image volume of the shape (rows, columns, slices)
+    using a rolling window with the side lengths specified
+
+    With a window side of 1 in z, the variance is calculated in each slice with a two-dimensional window, as by
+    get_variance_image_2d, but for all slices at once. Larger window sides in z give a three-dimensional window. The
+    variance is calculated from running sums as by the "uniform_filter" engine of get_variance_image_2d and the volume
+    is reflected at its edges.
+
+    If a mask is given, e.g., the patient mask of a CtSeries, only the masked voxels in each window are included and
+    the voxels outside of the mask get NaN, so the air surrounding the patient does not increase the variance at the
+    patient edge.
+
+    The volume can be processed slab_size slices at a time to bound the memory used for the intermediate results. The
+    slabs are extended with the slices needed by the window in z, so the result is the same as for the complete volume.
+
+    Args:
+        image_volume: The image volume. Any object that returns numpy arrays for ``image_volume[:, :, start:stop]``,
+            e.g., the ImageVolume of a CtSeries
+        window_side_x: The horizontal side (columns) of the rolling window applied. Default = 3
+        window_side_y: The vertical side (rows) of the rolling window applied. Default = 3
+        window_side_z: The side of the rolling window applied along the slices. Default = 1, i.e., slice by slice
+        mask: A boolean mask of the same shape as the image volume to restrict the windows to. Default = None
+        standard_deviation: Return the local standard deviation, i.e., a noise map, instead of the variance. Default =
+            False
+        slab_size: The number of slices to process at a time. Default = None, i.e., all slices at once
+        dtype: The data type of the returned volume. Default = numpy.float64
+
+    Raises:
+        TypeError: If the window sides or the slab size are not integers
+        ValueError: If the image volume is not three-dimensional, if the mask does not have the same shape as the image
+            volume or if the window sides or the slab size are less than 1
+
+    Returns:
+        A numpy ndarray of the same shape as the image volume with the local variance, or standard deviation, of each
+        voxel
+
+    """
+    shape = tuple(image_volume.shape)
+    if len(shape) != 3:
+        raise ValueError("The image volume must be three-dimensional")
+
+    _validate_positive_integer(name="window_side_x", value=window_side_x)
+    _validate_positive_integer(name="window_side_y", value=window_side_y)
+    _validate_positive_integer(name="window_side_z", value=window_side_z)
+    if slab_size is not None:
+        _validate_positive_integer(name="slab_size", value=slab_size)
+
+    if mask is not None and tuple(mask.shape) != shape:
+        raise ValueError("The mask must have the same shape as the image volume")
+
+    size = (window_side_y, window_side_x, window_side_z)
+    slab_size = max(shape[2], 1) if slab_size is None else slab_size
+
+    # The window reaches window_side_z // 2 slices before and (window_side_z - 1) // 2 slices after each slice
+    before = window_side_z // 2
+    after = (window_side_z - 1) // 2
+
+    log.debug(f"Calculating the local variance of a volume of shape {shape} with the window {size}")
+
+    variance_volume = np.empty(shape, dtype=dtype)
+    for start in range(0, shape[2], slab_size):
+        stop = min(start + slab_size, shape[2])
+        extended_start = max(start - before, 0)
+        extended_stop = min(stop + after, shape[2])
+
+        slab = np.asarray(image_volume[:, :, extended_start:extended_stop], dtype=float)
+        slab_mask = None if mask is None else np.asarray(mask[:, :, extended_start:extended_stop], dtype=bool)
+
+        variance = _get_local_variance(image=slab, size=size, mask=slab_mask)
+        variance = variance[:, :, start - extended_start : stop - extended_start]
+        variance_volume[:, :, start:stop] = np.sqrt(variance) if standard_deviation else variance
+
+    return variance_volume
+
+
+def _validate_positive_integer(name: str, value: int) -> None:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f"{name} must be given as an integer")
+
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1")
+
+
+def _get_local_variance(image: np.ndarray, size: Tuple[int, ...], mask: Optional[np.ndarray] = None) -> np.ndarray:
+    if mask is not None:
+        return _get_masked_local_variance(image=image, size=size, mask=mask)
+
+    # Windows containing NaN get NaN variance, as with numpy.var. The NaN values are replaced before filtering since the
+    # running sums of uniform_filter would otherwise spread them along the rest of the line
+    nan_values = np.isnan(image)
+    contains_nan = np.any(nan_values)
+    if contains_nan:
+        image = np.where(nan_values, 0.0, image)
+
+    # Shift the values by their mean to reduce the loss of precision when subtracting the squared mean
+    shifted = image - np.mean(image)
+    mean = ndimage.uniform_filter(shifted, size=size)
+    mean_of_squares = ndimage.uniform_filter(np.square(shifted), size=size)
+    variance = np.maximum(mean_of_squares - np.square(mean), 0.0)
+
+    if contains_nan:
+        variance[ndimage.maximum_filter(nan_values, size=size)] = np.nan
+
+    return variance
+
+
+def _get_masked_local_variance(image: np.ndarray, size: Tuple[int, ...], mask: np.ndarray) -> np.ndarray:
+    # The local sums are only taken over the masked voxels, and NaN values are excluded from the mask
+    mask = mask & ~np.isnan(image)
+    offset = float(np.mean(image[mask])) if np.any(mask) else 0.0
+    shifted = np.where(mask, image - offset, 0.0)
+
+    window_size = int(np.prod(size))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = np.rint(ndimage.uniform_filter(mask.astype(float), size=size) * window_size)
+        mean = ndimage.uniform_filter(shifted, size=size) * window_size / count
+        mean_of_squares = ndimage.uniform_filter(np.square(shifted), size=size) * window_size / count
+        variance = np.maximum(mean_of_squares - np.square(mean), 0.0)
+
+    variance[~mask] = np.nan
 
-    return ndimage.generic_filter(image.astype(float), np.var, size=(window_side_y, window_side_x))
+    return variance
@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .square_roi import SquareRoi
+
+
+@dataclass
+class RoiStatistics:
+    """Statistics of the pixel values in a set of rectangular image regions, one value per region
+
+    Attributes:
+        pixel_count: The number of pixels in each region
+        sum: The sum of the pixel values in each region
+        mean: The mean of the pixel values in each region. NaN for empty regions
+        stdev: The (population) standard deviation of the pixel values in each region. NaN for empty regions
+        std_error_of_the_mean: The standard error of the mean of the pixel values in each region. NaN for regions with
+            less than two pixels
+
+    """
+
+    pixel_count: np.ndarray
+    sum: np.ndarray
+    mean: np.ndarray
+    stdev: np.ndarray
+    std_error_of_the_mean: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pixel_count)
+
+
+class IntegralImageStatistics:
+    """Statistics of the pixel values in rectangular regions of an image, e.g., square ROIs, calculated from integral
+    images
+
+    The integral images (summed-area tables) of the pixel values and of the squared pixel values are calculated once,
+    after which the sum, mean, standard deviation and standard error of the mean of any rectangular region are given
+    by four table lookups each. The pixel values are shifted by the image mean before the tables are calculated to
+    reduce the loss of precision when the variance is calculated from the sums. The means, standard deviations and
+    standard errors of the mean are the same as those of the corresponding SquareRoi methods to within floating point
+    precision. The sums are the totals of each region, not the per-row sums returned by SquareRoi.get_sum.
+
+    Args:
+        image: The two-dimensional image. Must not contain NaN values
+
+    Raises:
+        TypeError: If the image is not a numpy ndarray
+        ValueError: If the image is not two-dimensional
+
+    """
+
+    def __init__(self, image: np.ndarray):
+        if not isinstance(image, np.ndarray):
+            raise TypeError("The image must be a numpy ndarray")
+
+        if image.ndim != 2:
+            raise ValueError("The image must be two-dimensional")
+
+        self._image = image
+        self._offset = float(np.mean(image, dtype=float)) if image.size else 0.0
+
+        shifted = image.astype(float) - self._offset
+        self._sum_table = _get_summed_area_table(shifted)
+        self._square_sum_table = _get_summed_area_table(np.square(shifted))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self._image.shape
+
+    def get_mean(self, roi: SquareRoi) -> float:
+        """Calculates the mean of the pixel values contained in the ROI, see SquareRoi.get_mean"""
+        return float(self.get_statistics(rois=[roi]).mean[0])
+
+    def get_stdev(self, roi: SquareRoi) -> float:
+        """Calculates the standard deviation of the pixel values contained in the ROI, see SquareRoi.get_stdev"""
+        return float(self.get_statistics(rois=[roi]).stdev[0])
+
+    def get_std_error_of_the_mean(self, roi: SquareRoi) -> float:
+        """Calculates the standard error of the mean of the pixel values contained in the ROI, see
+        SquareRoi.get_std_error_of_the_mean"""
+        return float(self.get_statistics(rois=[roi]).std_error_of_the_mean[0])
+
+    def get_total_sum(self, roi: SquareRoi) -> float:
+        """Calculates the total sum of all pixel values contained in the ROI. Unlike SquareRoi.get_sum, which sums over
+        a single axis, a scalar is returned"""
+        return float(self.get_statistics(rois=[roi]).sum[0])
+
+    def get_statistics(self, rois: List[SquareRoi]) -> RoiStatistics:
+        """Calculate the statistics of the pixel values contained in each of the given ROIs
+
+        The ROIs are placed in the image as by the SquareRoi methods, i.e., ROIs reaching outside of the image are
+        either cropped or rejected depending on their ResizeTooBigRoi attribute.
+
+        Args:
+            rois: The ROIs
+
+        Raises:
+            TypeError: If rois is not a list of SquareRoi objects
+            ValueError: If a ROI reaches outside of the image and is not to be resized
+
+        Returns:
+            The statistics of the ROIs, in the order the ROIs were given
+
+        """
+        if not isinstance(rois, list) or not all(isinstance(roi, SquareRoi) for roi in rois):
+            raise TypeError("The ROIs must be given as a list of SquareRoi objects")
+
+        bounds = np.zeros((len(rois), 4), dtype=np.int64)
+        for ind, roi in enumerate(rois):
+            x2, y2 = roi._check_roi_placement(image=self._image)
+            bounds[ind] = [roi.UpperLeft.y, y2 + 1, roi.UpperLeft.x, x2 + 1]
+
+        return self.get_box_statistics(top=bounds[:, 0], bottom=bounds[:, 1], left=bounds[:, 2], right=bounds[:, 3])
+
+    def get_box_statistics(self, top: ArrayLike, bottom: ArrayLike, left: ArrayLike, right: ArrayLike) -> RoiStatistics:
+        """Calculate the statistics of the pixel values in the regions image[top:bottom, left:right]
+
+        The bounds follow the slicing rules of numpy for non-negative indices, i.e., the bottom and right bounds are
+        exclusive and the bounds are cropped to the image.
+
+        Args:
+            top: The index of the first row of each region
+            bottom: The index after the last row of each region
+            left: The index of the first column of each region
+            right: The index after the last column of each region
+
+        Raises:
+            ValueError: If any bound is negative or if the bounds do not have the same shape
+
+        Returns:
+            The statistics of the regions
+
+        """
+        top, bottom, left, right = [np.asarray(bound, dtype=np.int64) for bound in (top, bottom, left, right)]
+        if not top.shape == bottom.shape == left.shape == right.shape:
+            raise ValueError("The bounds must have the same shape")
+
+        if any(np.any(bound < 0) for bound in (top, bottom, left, right)):
+            raise ValueError("The bounds must not be negative")
+
+        rows, columns = self.shape
+        top, bottom = np.minimum(top, rows), np.clip(bottom, np.minimum(top, rows), rows)
+        left, right = np.minimum(left, columns), np.clip(right, np.minimum(left, columns), columns)
+
+        pixel_count = (bottom - top) * (right - left)
+        shifted_sum = _get_region_sums(table=self._sum_table, top=top, bottom=bottom, left=left, right=right)
+        square_sum = _get_region_sums(table=self._square_sum_table, top=top, bottom=bottom, left=left, right=right)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            shifted_mean = shifted_sum / pixel_count
+            variance = np.maximum(square_sum / pixel_count - np.square(shifted_mean), 0.0)
+            stdev = np.sqrt(variance)
+            std_error_of_the_mean = np.where(pixel_count > 1, stdev / np.sqrt(pixel_count - 1), np.nan)
+
+        return RoiStatistics(
+            pixel_count=pixel_count,
+            sum=shifted_sum + pixel_count * self._offset,
+            mean=shifted_mean + self._offset,
+            stdev=stdev,
+            std_error_of_the_mean=std_error_of_the_mean,
+        )
+
+
+def _get_summed_area_table(image: np.ndarray) -> np.ndarray:
+    # Padded with a leading row and column of zeros so that table[y, x] is the sum of image[:y, :x]
+    table = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=float)
+    np.cumsum(np.cumsum(image, axis=0, dtype=float), axis=1, out=table[1:, 1:])
+    return table
+
+
+def _get_region_sums(
+    table: np.ndarray, top: np.ndarray, bottom: np.ndarray, left: np.ndarray, right: np.ndarray
+) -> np.ndarray:
+    return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
@@ -202,7 +202,7 @@ class SquareRoi(Roi):
 
         x2, y2 = self._check_roi_placement(image=image)
 
-        image = color.gray2rgb(image)
+        image = color.gray2rgb(np.asarray(image))
 
         image[self.UpperLeft.y : y2 + 1, self.UpperLeft.x : x2 + 1] = roi_color
         return image
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Tuple
 
 import numpy as np
@@ -8,8 +9,10 @@ from dicom_image_tools.ct_tools.patient_equivalent_diameter import (
     SinogramData,
     _calculate_slice_area_equivalent_diameter,
     calculate_area_equivalent_diameter,
+    calculate_volume_area_equivalent_diameter,
 )
 from dicom_image_tools.dicom_handlers.ct import CtSeries
+from dicom_image_tools.dicom_handlers.result_cache import ResultCache
 from dicom_image_tools.helpers.voxel_data import VoxelData
 
 
@@ -100,3 +103,89 @@ def test_calculate_area_equivalent_diameter_and_hough(ct_series):
 
     assert len(actual) == 4
     assert actual[0] == expected
+
+
+def test_calculate_area_equivalent_diameter_with_workers_gives_same_result_as_serial(ct_series):
+    # Arrange
+    expected_ead, expected_radon, expected_hough = calculate_area_equivalent_diameter(
+        ct=ct_series, use_radon=True, use_hough=True
+    )
+
+    # Act
+    actual_ead, actual_radon, actual_hough = calculate_area_equivalent_diameter(
+        ct=ct_series, use_radon=True, use_hough=True, workers=2
+    )
+
+    # Assert
+    assert actual_ead == expected_ead
+    assert actual_radon == expected_radon
+    assert actual_hough == expected_hough
+
+
+@pytest.mark.parametrize("slab_size", [1, 64])
+def test_calculate_volume_area_equivalent_diameter_gives_same_result_as_slice_wise_calculation(ct_series, slab_size):
+    # Arrange
+    expected, _, _ = calculate_area_equivalent_diameter(ct=ct_series)
+
+    # Act
+    actual = calculate_volume_area_equivalent_diameter(ct=ct_series, slab_size=slab_size)
+
+    # Assert
+    assert len(actual) == 4
+    assert isinstance(actual.EAD_cm, np.ndarray)
+    assert actual.to_list() == expected
+
+
+def test_calculate_area_equivalent_diameter_with_convex_hull_engine_gives_same_result_as_radon(ct_series):
+    # Arrange
+    _, expected, _ = calculate_area_equivalent_diameter(ct=ct_series, use_radon=True)
+
+    # Act
+    _, actual, _ = calculate_area_equivalent_diameter(ct=ct_series, use_radon=True, sinogram_engine="convex_hull")
+
+    # Assert
+    assert all(isinstance(actual_slice, SinogramData) for actual_slice in actual)
+    assert actual == expected
+
+
+def test_calculate_area_equivalent_diameter_loads_results_from_cache(tmp_path):
+    # Arrange
+    folder = Path(__file__).parent.parent.parent / "test_data" / "ct_study" / "GE" / "serie1"
+    expected_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    actual_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    for ind in range(1, 5):
+        expected_series.add_file(file=folder / str(ind))
+        actual_series.add_file(file=folder / str(ind))
+
+    with ResultCache(cache_directory=tmp_path) as cache:
+        expected = calculate_area_equivalent_diameter(ct=expected_series, use_radon=True, cache=cache)
+
+    # Act
+    with ResultCache(cache_directory=tmp_path) as cache:
+        actual = calculate_area_equivalent_diameter(ct=actual_series, use_radon=True, cache=cache)
+
+    # Assert
+    assert actual == expected
+
+
+def test_calculate_volume_area_equivalent_diameter_after_patient_mask_loaded_from_cache(tmp_path):
+    # Arrange
+    folder = Path(__file__).parent.parent.parent / "test_data" / "ct_study" / "GE" / "serie1"
+    expected_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    actual_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    for ind in range(1, 5):
+        expected_series.add_file(file=folder / str(ind))
+        actual_series.add_file(file=folder / str(ind))
+
+    with ResultCache(cache_directory=tmp_path) as cache:
+        expected_series.get_patient_mask(remove_table=True, cache=cache)
+    expected = calculate_volume_area_equivalent_diameter(ct=expected_series)
+
+    with ResultCache(cache_directory=tmp_path) as cache:
+        actual_series.get_patient_mask(remove_table=True, cache=cache)
+
+    # Act
+    actual = calculate_volume_area_equivalent_diameter(ct=actual_series)
+
+    # Assert
+    assert actual.to_list() == expected.to_list()
@@ -0,0 +1,72 @@
+import sys
+
+import numpy as np
+import pytest
+
+from dicom_image_tools.ct_tools.patient_equivalent_diameter import (
+    calculate_area_equivalent_diameter,
+    calculate_volume_area_equivalent_diameter,
+)
+from dicom_image_tools.ct_tools.size_metrics_export import get_size_metrics_table, save_size_metrics
+
+
+def test_get_size_metrics_table_has_one_row_per_slice_with_series_and_size_metrics(ct_series):
+    # Arrange
+    ead_data, radon_data, _ = calculate_area_equivalent_diameter(ct=ct_series, use_radon=True)
+
+    # Act
+    actual = get_size_metrics_table(ct=ct_series, ead_data=ead_data, radon_data=radon_data)
+
+    # Assert
+    assert len(actual) == 4
+    assert "Hough_MaxCm" not in actual.dtype.names
+    np.testing.assert_array_equal(actual["SlicePosition"], ct_series.SlicePosition)
+    np.testing.assert_array_equal(actual["kV"], ct_series.kV)
+    np.testing.assert_array_equal(actual["WED_cm"], [obj.WED_cm for obj in ead_data])
+    np.testing.assert_array_equal(actual["Radon_MaxPixels"], [obj.MaxPixels for obj in radon_data])
+
+
+def test_get_size_metrics_table_gives_same_table_for_volume_data(ct_series):
+    # Arrange
+    ead_data, _, _ = calculate_area_equivalent_diameter(ct=ct_series)
+    expected = get_size_metrics_table(ct=ct_series, ead_data=ead_data)
+
+    # Act
+    actual = get_size_metrics_table(ct=ct_series, ead_data=calculate_volume_area_equivalent_diameter(ct=ct_series))
+
+    # Assert
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_get_size_metrics_table_raises_valueerror_on_slice_count_mismatch(ct_series):
+    ead_data, _, _ = calculate_area_equivalent_diameter(ct=ct_series)
+
+    with pytest.raises(ValueError):
+        get_size_metrics_table(ct=ct_series, ead_data=ead_data[:2])
+
+
+def test_save_size_metrics_to_npy_file(ct_series, tmp_path):
+    # Arrange
+    ead_data, _, _ = calculate_area_equivalent_diameter(ct=ct_series)
+    expected = get_size_metrics_table(ct=ct_series, ead_data=ead_data)
+
+    # Act
+    save_size_metrics(table=expected, output_path=tmp_path / "size_metrics.npy")
+
+    # Assert
+    np.testing.assert_array_equal(np.load(tmp_path / "size_metrics.npy"), expected)
+
+
+def test_save_size_metrics_to_parquet_raises_importerror_without_pyarrow(ct_series, tmp_path, monkeypatch):
+    ead_data, _, _ = calculate_area_equivalent_diameter(ct=ct_series)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError):
+        save_size_metrics(
+            table=get_size_metrics_table(ct=ct_series, ead_data=ead_data), output_path=tmp_path / "size_metrics.parquet"
+        )
+
+
+def test_save_size_metrics_raises_valueerror_on_unknown_file_format(tmp_path):
+    with pytest.raises(ValueError):
+        save_size_metrics(table=np.zeros(1, dtype=[("EAD_cm", float)]), output_path=tmp_path / "size_metrics.csv")
@@ -1,9 +1,18 @@
 from pathlib import Path
 
+import numpy as np
+import pydicom
 import pytest
 from numpy import floor
 
+from dicom_image_tools.dicom_handlers.compact_metadata import CompactMetadata
 from dicom_image_tools.dicom_handlers.ct import CtSeries
+from dicom_image_tools.dicom_handlers.result_cache import ResultCache
+from dicom_image_tools.helpers import patient_segmentation
+from dicom_image_tools.helpers.lazy_image_volume import LazyImageVolume
+from dicom_image_tools.helpers.packed_mask import PackedMask
+from dicom_image_tools.helpers.pixel_data import RescaledPixelArray
+from dicom_image_tools.image_quality.variance_image import get_variance_volume
 
 
 @pytest.fixture()
@@ -60,6 +69,34 @@ def test_ct_series_add_file_sorts_on_instance_number_when_slice_location_and_ima
     assert actual == expected
 
 
+def test_ct_series_add_file_sorts_files_added_in_any_order_on_slice_position(example_data_path_fixture):
+    # Arrange
+    expected_names = ["1", "2", "3", "4"]
+    ct_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+
+    # Act
+    for name in ["3", "1", "4", "2"]:
+        ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / name)
+
+    # Assert
+    assert [fp.name for fp in ct_series.FilePaths] == expected_names
+    assert ct_series.SlicePosition == [-7.5, -2.5, 2.5, 7.5]
+
+
+def test_ct_series_add_file_ignores_file_already_in_series(example_data_path_fixture):
+    # Arrange
+    ct_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    fp = example_data_path_fixture["ct"] / "GE" / "serie1" / "1"
+    ct_series.add_file(file=fp)
+
+    # Act
+    ct_series.add_file(file=fp)
+
+    # Assert
+    assert len(ct_series.FilePaths) == 1
+    assert len(ct_series.SlicePosition) == 1
+
+
 def test_ct_series_raises_error_on_adding_file_from_other_series(example_data_path_fixture):
     ct_series = CtSeries(series_instance_uid="WrongSeriesInstanceUid")
     with pytest.raises(ValueError):
@@ -149,3 +186,396 @@ def test_ct_series_get_patient_mask_imports_image_volume_if_not_already_imported
     ct_series.get_patient_mask(threshold=-500, remove_table=False)
 
     assert ct_series.MaskSuccess is True
+
+
+def _get_ct_series_with_two_slices(example_data_path_fixture) -> CtSeries:
+    ct_series = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+    ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "2")
+    return ct_series
+
+
+def test_ct_series_import_image_volume_lazy_only_decodes_accessed_slices(example_data_path_fixture):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+
+    # Act
+    ct_series.import_image_volume(lazy=True)
+    _ = ct_series.ImageVolume[:, :, 1]
+
+    # Assert
+    assert isinstance(ct_series.ImageVolume, LazyImageVolume)
+    assert ct_series.ImageVolume.shape == (512, 512, 2)
+    assert not ct_series.ImageVolume.is_loaded(0)
+    assert ct_series.ImageVolume.is_loaded(1)
+    assert ct_series.kV == [120, 120]
+    assert len(ct_series.CompleteMetadata) == 2
+
+
+@pytest.mark.parametrize("backing_dtype", [np.float32, np.int16])
+def test_ct_series_import_image_volume_lazy_gives_same_image_volume_as_eager_import(
+    example_data_path_fixture, backing_dtype
+):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume()
+    expected = ct_series.ImageVolume.copy()
+
+    # Act
+    ct_series.import_image_volume(lazy=True, backing_dtype=backing_dtype)
+    actual = np.asarray(ct_series.ImageVolume)
+
+    # Assert
+    assert actual.dtype == backing_dtype
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_ct_series_get_patient_mask_with_lazy_image_volume(example_data_path_fixture):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume(lazy=True, memory_map=True)
+
+    # Act
+    ct_series.get_patient_mask(threshold=-500, remove_table=True)
+
+    # Assert
+    assert ct_series.MaskSuccess is True
+    assert ct_series.MedianHuPatientVolume == 125.0
+    assert floor(ct_series.MeanHuPatientVolume) == 85.0
+
+
+@pytest.mark.parametrize("dtype", ["float32", "native"])
+def test_ct_series_get_patient_mask_gives_same_statistics_for_all_pixel_data_types(example_data_path_fixture, dtype):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume(dtype=dtype)
+
+    # Act
+    ct_series.get_patient_mask(threshold=-500, remove_table=True)
+
+    # Assert
+    assert ct_series.MaskSuccess is True
+    assert ct_series.MedianHuPatientVolume == 125.0
+    assert floor(ct_series.MeanHuPatientVolume) == 85.0
+
+
+def test_ct_series_import_image_volume_native_keeps_stored_values(example_data_path_fixture):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume()
+    expected = ct_series.ImageVolume.copy()
+
+    # Act
+    ct_series.import_image_volume(dtype="native")
+
+    # Assert
+    assert isinstance(ct_series.ImageVolume, RescaledPixelArray)
+    assert np.issubdtype(ct_series.ImageVolume.StoredValues.dtype, np.integer)
+    np.testing.assert_array_equal(np.asarray(ct_series.ImageVolume), expected)
+    np.testing.assert_array_equal(ct_series.ImageVolume[:, :, 1], expected[:, :, 1])
+
+
+@pytest.mark.parametrize("dtype", ["float64", "native"])
+def test_ct_series_import_image_volume_with_workers_gives_same_result_as_serial_import(
+    example_data_path_fixture, dtype
+):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume(dtype=dtype)
+    expected_volume = np.asarray(ct_series.ImageVolume)
+    expected_slice_position = list(ct_series.SlicePosition)
+    expected_sop_instance_uids = [dcm.SOPInstanceUID for dcm in ct_series.CompleteMetadata]
+
+    # Act
+    ct_series.import_image_volume(dtype=dtype, workers=4)
+
+    # Assert
+    np.testing.assert_array_equal(np.asarray(ct_series.ImageVolume), expected_volume)
+    assert ct_series.SlicePosition == expected_slice_position
+    assert [dcm.SOPInstanceUID for dcm in ct_series.CompleteMetadata] == expected_sop_instance_uids
+    assert len(ct_series.kV) == len(ct_series.mA) == len(ct_series.VoxelData) == 2
+
+
+@pytest.mark.parametrize("workers, error", [(0, ValueError), (2.0, TypeError)])
+def test_ct_series_import_image_volume_raises_error_on_invalid_workers(example_data_path_fixture, workers, error):
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+
+    with pytest.raises(error):
+        ct_series.import_image_volume(workers=workers)
+
+
+def test_ct_series_with_compact_metadata_gives_same_patient_mask_results(example_data_path_fixture):
+    # Arrange
+    expected = _get_ct_series_with_two_slices(example_data_path_fixture)
+    expected.import_image_volume()
+    expected.get_patient_mask(threshold=-500, remove_table=True)
+
+    actual = CtSeries(
+        series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617", compact_metadata=True
+    )
+    actual.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+    actual.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "2")
+
+    # Act
+    actual.import_image_volume()
+    actual.get_patient_mask(threshold=-500, remove_table=True)
+
+    # Assert
+    assert all(isinstance(metadata, CompactMetadata) for metadata in actual.CompleteMetadata)
+    assert actual.MedianHuPatientVolume == expected.MedianHuPatientVolume
+    assert actual.PatientGeometricalOffset == expected.PatientGeometricalOffset
+    assert actual._get_default_window_settings(index=0) == expected._get_default_window_settings(index=0)
+
+
+def test_ct_series_with_compact_metadata_saves_image_with_complete_dataset(example_data_path_fixture, tmp_path):
+    # Arrange
+    ct_series = CtSeries(
+        series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617", compact_metadata=True
+    )
+    ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+    ct_series.import_image_volume()
+    expected = pydicom.dcmread(example_data_path_fixture["ct"] / "GE" / "serie1" / "1", stop_before_pixels=True)
+
+    # Act
+    ct_series.save_image(image_index=0, output_path=tmp_path / "saved.dcm")
+    actual = pydicom.dcmread(tmp_path / "saved.dcm")
+
+    # Assert
+    assert actual.PatientID == expected.PatientID
+    assert actual.SOPInstanceUID == expected.SOPInstanceUID
+
+
+@pytest.mark.parametrize("remove_table", [False, True])
+def test_ct_series_get_patient_mask_vectorized_engine_gives_same_results_as_loop_engine(
+    example_data_path_fixture, remove_table
+):
+    # Arrange
+    expected = _get_ct_series_with_two_slices(example_data_path_fixture)
+    expected.get_patient_mask(threshold=-500, remove_table=remove_table, engine="loop")
+    actual = _get_ct_series_with_two_slices(example_data_path_fixture)
+
+    # Act
+    actual.get_patient_mask(threshold=-500, remove_table=remove_table, engine="vectorized")
+
+    # Assert
+    assert actual.Mask.dtype == bool
+    np.testing.assert_array_equal(actual.Mask, expected.Mask)
+    assert actual.MaskSuccess == expected.MaskSuccess
+    assert actual.PatientClipped == expected.PatientClipped
+    assert actual.PatientMassCenterImage == expected.PatientMassCenterImage
+    assert actual.PatientMassCenterVolume == expected.PatientMassCenterVolume
+    np.testing.assert_allclose(actual.MeanHuPatientImage, expected.MeanHuPatientImage)
+    np.testing.assert_array_equal(actual.MedianHuPatientImage, expected.MedianHuPatientImage)
+    assert actual.MeanHuPatientVolume == pytest.approx(expected.MeanHuPatientVolume)
+    assert actual.MedianHuPatientVolume == expected.MedianHuPatientVolume
+
+
+@pytest.mark.parametrize("slab_size", [1, 3])
+@pytest.mark.parametrize("remove_table", [False, True])
+def test_ct_series_get_patient_mask_chunked_engine_gives_same_results_as_loop_engine(
+    example_data_path_fixture, remove_table, slab_size
+):
+    # Arrange
+    expected = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    actual = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    for ind in range(1, 5):
+        expected.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / str(ind))
+        actual.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / str(ind))
+    expected.get_patient_mask(threshold=-500, remove_table=remove_table, engine="loop")
+
+    # Act
+    actual.get_patient_mask(threshold=-500, remove_table=remove_table, engine="chunked", slab_size=slab_size)
+
+    # Assert
+    assert isinstance(actual.Mask, PackedMask)
+    np.testing.assert_array_equal(np.asarray(actual.Mask), expected.Mask)
+    assert actual.MaskSuccess == expected.MaskSuccess
+    assert actual.PatientClipped == expected.PatientClipped
+    assert actual.PatientMassCenterImage == expected.PatientMassCenterImage
+    assert actual.PatientMassCenterVolume == expected.PatientMassCenterVolume
+    np.testing.assert_allclose(actual.MeanHuPatientImage, expected.MeanHuPatientImage)
+    np.testing.assert_array_equal(actual.MedianHuPatientImage, expected.MedianHuPatientImage)
+    assert actual.MeanHuPatientVolume == pytest.approx(expected.MeanHuPatientVolume)
+    assert actual.MedianHuPatientVolume == expected.MedianHuPatientVolume
+
+
+@pytest.mark.parametrize("engine", ["loop", "chunked"])
+def test_ct_series_get_patient_mask_loads_results_from_cache(example_data_path_fixture, tmp_path, monkeypatch, engine):
+    # Arrange
+    expected = _get_ct_series_with_two_slices(example_data_path_fixture)
+    with ResultCache(cache_directory=tmp_path) as cache:
+        expected.get_patient_mask(threshold=-500, remove_table=True, engine=engine, cache=cache)
+    actual = _get_ct_series_with_two_slices(example_data_path_fixture)
+    _fail_on_segmentation(monkeypatch)
+
+    # Act
+    with ResultCache(cache_directory=tmp_path) as cache:
+        actual.get_patient_mask(threshold=-500, remove_table=True, engine=engine, cache=cache)
+
+    # Assert
+    assert type(actual.ImageVolume) is type(expected.ImageVolume)
+    np.testing.assert_array_equal(actual.ImageVolume, expected.ImageVolume)
+    assert actual.VoxelData == expected.VoxelData
+    assert actual.SlicePosition == expected.SlicePosition
+    assert len(actual.CompleteMetadata) == len(expected.CompleteMetadata)
+    assert type(actual.Mask) is type(expected.Mask)
+    np.testing.assert_array_equal(np.asarray(actual.Mask), np.asarray(expected.Mask))
+    assert actual.MaskSuccess == expected.MaskSuccess
+    assert actual.PatientClipped == expected.PatientClipped
+    assert actual.PatientMassCenterImage == expected.PatientMassCenterImage
+    assert actual.PatientMassCenterVolume == expected.PatientMassCenterVolume
+    assert actual.PatientGeometricalOffset == expected.PatientGeometricalOffset
+    np.testing.assert_array_equal(actual.MeanHuPatientImage, expected.MeanHuPatientImage)
+    np.testing.assert_array_equal(actual.MedianHuPatientImage, expected.MedianHuPatientImage)
+    assert actual.MeanHuPatientVolume == expected.MeanHuPatientVolume
+    assert actual.MedianHuPatientVolume == expected.MedianHuPatientVolume
+
+
+@pytest.mark.parametrize(
+    "import_parameters, mask_parameters",
+    [
+        ({}, dict(remove_table=False)),
+        ({}, dict(threshold=-400)),
+        (dict(dtype="float32"), {}),
+        (dict(lazy=True), {}),
+    ],
+)
+def test_ct_series_get_patient_mask_does_not_load_results_for_other_parameters_from_cache(
+    example_data_path_fixture, tmp_path, monkeypatch, import_parameters, mask_parameters
+):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    with ResultCache(cache_directory=tmp_path) as cache:
+        ct_series.get_patient_mask(threshold=-500, remove_table=True, cache=cache)
+    actual = _get_ct_series_with_two_slices(example_data_path_fixture)
+    if import_parameters:
+        actual.import_image_volume(**import_parameters)
+    image_volume_type = type(actual.ImageVolume)
+    restored = []
+    monkeypatch.setattr(CtSeries, "_restore_patient_mask_result", lambda *args, **kwargs: restored.append(True))
+
+    # Act
+    with ResultCache(cache_directory=tmp_path) as cache:
+        actual.get_patient_mask(**{**dict(threshold=-500, remove_table=True, cache=cache), **mask_parameters})
+
+    # Assert
+    assert not restored
+    if import_parameters:
+        assert type(actual.ImageVolume) is image_volume_type
+
+
+def _fail_on_segmentation(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("The patient mask was calculated instead of loaded from the cache")
+
+    monkeypatch.setattr(patient_segmentation, "erode_mask", fail)
+    monkeypatch.setattr(patient_segmentation, "get_patient_mask_chunked", fail)
+
+
+def test_ct_series_get_patient_mask_raises_value_error_on_unknown_engine(example_data_path_fixture):
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+
+    with pytest.raises(ValueError):
+        ct_series.get_patient_mask(threshold=-500, engine="unknown")
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+@pytest.mark.parametrize("remove_table", [False, True])
+@pytest.mark.parametrize("initial_files, added_file", [([1, 3, 4], 2), ([2, 3, 4], 1), ([1, 2, 3], 4), ([1, 3], 2)])
+def test_ct_series_add_file_incremental_gives_same_results_as_complete_import(
+    example_data_path_fixture, engine, remove_table, initial_files, added_file
+):
+    # Arrange
+    expected = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    for ind in sorted(initial_files + [added_file]):
+        expected.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / str(ind))
+    expected.import_image_volume()
+    expected.get_patient_mask(threshold=-500, remove_table=remove_table, engine=engine)
+
+    actual = CtSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    for ind in initial_files:
+        actual.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / str(ind))
+    actual.import_image_volume()
+    actual.get_patient_mask(threshold=-500, remove_table=remove_table, engine=engine)
+
+    # Act
+    actual.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / str(added_file), incremental=True)
+
+    # Assert
+    assert actual.FilePaths == expected.FilePaths
+    assert actual.SlicePosition == expected.SlicePosition
+    np.testing.assert_array_equal(actual.ImageVolume, expected.ImageVolume)
+    assert actual.kV == expected.kV
+    assert actual.mA == expected.mA
+    assert actual.VoxelData == expected.VoxelData
+    assert [dcm.SOPInstanceUID for dcm in actual.CompleteMetadata] == [
+        dcm.SOPInstanceUID for dcm in expected.CompleteMetadata
+    ]
+    np.testing.assert_array_equal(actual.Mask, expected.Mask)
+    assert actual.MaskSuccess == expected.MaskSuccess
+    assert actual.PatientClipped == expected.PatientClipped
+    assert actual.PatientMassCenterImage == expected.PatientMassCenterImage
+    assert actual.PatientMassCenterVolume == expected.PatientMassCenterVolume
+    assert actual.PatientGeometricalOffset == expected.PatientGeometricalOffset
+    np.testing.assert_allclose(actual.MeanHuPatientImage, expected.MeanHuPatientImage)
+    np.testing.assert_array_equal(actual.MedianHuPatientImage, expected.MedianHuPatientImage)
+    assert actual.MeanHuPatientVolume == pytest.approx(expected.MeanHuPatientVolume)
+    assert actual.MedianHuPatientVolume == expected.MedianHuPatientVolume
+
+
+def test_ct_series_add_file_incremental_only_decodes_added_slice(example_data_path_fixture, monkeypatch):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume()
+    read_files = []
+    read_slice = CtSeries._read_slice
+
+    def read_slice_spy(fp, *args, **kwargs):
+        read_files.append(fp)
+        return read_slice(fp, *args, **kwargs)
+
+    monkeypatch.setattr(CtSeries, "_read_slice", staticmethod(read_slice_spy))
+
+    # Act
+    ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "3", incremental=True)
+
+    # Assert
+    assert read_files == [example_data_path_fixture["ct"] / "GE" / "serie1" / "3"]
+    assert ct_series.ImageVolume.shape[2] == 3
+
+
+def test_ct_series_add_file_empties_imported_data_for_lazy_image_volume(example_data_path_fixture):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.import_image_volume(lazy=True, memory_map=False)
+
+    # Act
+    ct_series.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "3", incremental=True)
+
+    # Assert
+    assert ct_series.ImageVolume is None
+    assert ct_series.kV == []
+
+
+def test_ct_series_get_variance_volume_restricted_to_patient_mask(example_data_path_fixture):
+    # Arrange
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+    ct_series.get_patient_mask(threshold=-500, remove_table=True)
+    expected = get_variance_volume(
+        ct_series.ImageVolume, window_side_x=5, window_side_y=5, window_side_z=2, mask=ct_series.Mask
+    )
+
+    # Act
+    actual = ct_series.get_variance_volume(window_side_x=5, window_side_y=5, window_side_z=2, masked=True, slab_size=1)
+
+    # Assert
+    assert actual.shape == ct_series.ImageVolume.shape
+    assert np.all(np.isnan(actual[~ct_series.Mask]))
+    np.testing.assert_allclose(actual, expected)
+
+
+def test_ct_series_get_variance_volume_raises_value_error_when_masked_without_patient_mask(example_data_path_fixture):
+    ct_series = _get_ct_series_with_two_slices(example_data_path_fixture)
+
+    with pytest.raises(ValueError):
+        ct_series.get_variance_volume(masked=True)
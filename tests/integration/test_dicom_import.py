@@ -1,12 +1,16 @@
 import logging
 from pathlib import Path
 
+import numpy as np
+import pydicom
 import pytest
 from pydicom.errors import InvalidDicomError
 
+from dicom_image_tools.dicom_handlers.compact_metadata import CompactMetadata
 from dicom_image_tools.dicom_handlers.dicom_import import (
     import_dicom_file,
     import_dicom_from_folder,
+    iter_import_dicom_from_folder,
 )
 from dicom_image_tools.dicom_handlers.dicom_study import DicomStudy
 from dicom_image_tools.dicom_handlers.dose_matrix import DoseMatrix
@@ -220,3 +224,153 @@ def test_import_dicom_from_folder_correctly_imports_dose_matrix_files():
 
     # Assert
     assert isinstance(actual, DoseMatrix)
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_import_dicom_from_folder_with_workers_gives_same_result_as_serial_import(use_processes):
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "ct_study"
+    expected = import_dicom_from_folder(folder=folder, recursively=True)
+
+    # Act
+    actual = import_dicom_from_folder(folder=folder, recursively=True, workers=3, use_processes=use_processes)
+
+    # Assert
+    assert list(actual.keys()) == list(expected.keys())
+    for study_instance_uid, study in expected.items():
+        assert [series.SeriesInstanceUid for series in actual[study_instance_uid].Series] == [
+            series.SeriesInstanceUid for series in study.Series
+        ]
+        assert [series.FilePaths for series in actual[study_instance_uid].Series] == [
+            series.FilePaths for series in study.Series
+        ]
+        assert actual[study_instance_uid].DoseReports.RdsrFilePaths == study.DoseReports.RdsrFilePaths
+
+
+def test_import_dicom_from_folder_raises_type_error_if_workers_is_not_an_integer():
+    folder = Path(__file__).parent.parent / "test_data" / "dose_matrix"
+
+    with pytest.raises(TypeError) as excinfo:
+        # noinspection PyTypeChecker
+        import_dicom_from_folder(folder=folder, workers="2")
+
+    assert "workers must be given as an integer" in str(excinfo.value)
+
+
+def test_import_dicom_from_folder_raises_value_error_if_workers_is_less_than_one():
+    folder = Path(__file__).parent.parent / "test_data" / "dose_matrix"
+
+    with pytest.raises(ValueError) as excinfo:
+        import_dicom_from_folder(folder=folder, workers=0)
+
+    assert "workers must be at least 1" in str(excinfo.value)
+
+
+def _get_series_file_paths(studies) -> dict:
+    file_paths = dict()
+    for study in studies:
+        for series in study.Series:
+            file_paths.setdefault(series.SeriesInstanceUid, set()).update(series.FilePaths)
+
+    return file_paths
+
+
+@pytest.mark.parametrize("group_depth, max_open_studies", [(None, None), (1, None), (2, None), (None, 1), (0, 2)])
+def test_iter_import_dicom_from_folder_finds_same_files_as_import_dicom_from_folder(group_depth, max_open_studies):
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "ct_study"
+    expected = _get_series_file_paths(import_dicom_from_folder(folder=folder, recursively=True).values())
+
+    # Act
+    actual = _get_series_file_paths(
+        iter_import_dicom_from_folder(
+            folder=folder, recursively=True, group_depth=group_depth, max_open_studies=max_open_studies
+        )
+    )
+
+    # Assert
+    assert actual == expected
+
+
+def test_iter_import_dicom_from_folder_without_grouping_yields_each_study_once():
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "ct_study"
+    expected = sorted(import_dicom_from_folder(folder=folder, recursively=True).keys())
+
+    # Act
+    actual = sorted(study.StudyInstanceUid for study in iter_import_dicom_from_folder(folder=folder, group_depth=None))
+
+    # Assert
+    assert actual == expected
+
+
+def test_iter_import_dicom_from_folder_yields_study_before_walk_is_finished():
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "ct_study"
+
+    # Act
+    studies = iter_import_dicom_from_folder(folder=folder, max_open_studies=1)
+    first = next(studies)
+
+    # Assert
+    assert isinstance(first, DicomStudy)
+    studies.close()
+
+
+def test_iter_import_dicom_from_folder_raises_value_error_if_no_dicom_files_found(tmp_path):
+    (tmp_path / "not_dicom.txt").write_text("irrelevant string")
+
+    with pytest.raises(ValueError) as excinfo:
+        list(iter_import_dicom_from_folder(folder=tmp_path))
+
+    assert "contains no valid DICOM files" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [(dict(max_open_studies=0), ValueError), (dict(group_depth=-1), ValueError), (dict(group_depth="1"), TypeError)],
+)
+def test_iter_import_dicom_from_folder_raises_error_on_invalid_flush_policy(kwargs, error):
+    folder = Path(__file__).parent.parent / "test_data" / "dose_matrix"
+
+    with pytest.raises(error):
+        next(iter_import_dicom_from_folder(folder=folder, **kwargs))
+
+
+def test_import_dicom_from_folder_with_selective_read_gives_same_studies_and_series():
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "ct_study"
+    expected = import_dicom_from_folder(folder=folder, recursively=True)
+
+    # Act
+    actual = import_dicom_from_folder(folder=folder, recursively=True, selective_read=True)
+
+    # Assert
+    assert list(actual.keys()) == list(expected.keys())
+    for study_instance_uid, study in expected.items():
+        assert [series.FilePaths for series in actual[study_instance_uid].Series] == [
+            series.FilePaths for series in study.Series
+        ]
+        assert actual[study_instance_uid].DoseReports.RdsrFilePaths == study.DoseReports.RdsrFilePaths
+
+
+def test_image_saved_after_selective_read_import_can_be_read_back(tmp_path):
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "io"
+    expected_series = next(iter(import_dicom_from_folder(folder=folder, recursively=False).values())).Series[0]
+    expected_series.import_image()
+    expected_series.save_image(image_index=0, output_path=tmp_path / "expected.dcm")
+    expected = pydicom.dcmread(tmp_path / "expected.dcm")
+
+    studies = import_dicom_from_folder(folder=folder, recursively=False, selective_read=True)
+    series = next(iter(studies.values())).Series[0]
+    series.import_image()
+
+    # Act
+    series.save_image(image_index=0, output_path=tmp_path / "actual.dcm")
+
+    # Assert
+    actual = pydicom.dcmread(tmp_path / "actual.dcm")
+    assert isinstance(series.CompleteMetadata[0], CompactMetadata)
+    assert set(actual.keys()) == set(expected.keys())
+    np.testing.assert_array_equal(actual.pixel_array, expected.pixel_array)
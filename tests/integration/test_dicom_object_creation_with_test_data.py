@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from dicom_image_tools.dicom_handlers.dicom_study import DicomSeries, DicomStudy
+from dicom_image_tools.dicom_handlers.dicom_study import CtSeries, DicomSeries, DicomStudy
 
 
 @pytest.fixture()
@@ -31,6 +31,39 @@ def test_dicom_series_add_file_already_in_series_ignores_file(example_data_path_
     assert len(dcm_series.FilePaths) == 1
 
 
+def test_dicom_series_add_file_detects_duplicates_after_file_path_replaced_in_place(example_data_path_fixture):
+    # Arrange
+    dcm_series = DicomSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    first_file = example_data_path_fixture["ct"] / "GE" / "serie1" / "1"
+    second_file = example_data_path_fixture["ct"] / "GE" / "serie1" / "2"
+    dcm_series.add_file(file=first_file)
+    dcm_series.FilePaths[0] = second_file
+
+    # Act
+    dcm_series.add_file(file=second_file)
+    dcm_series.add_file(file=first_file)
+
+    # Assert
+    assert sorted(dcm_series.FilePaths) == sorted([first_file, second_file])
+
+
+def test_dicom_series_add_file_detects_duplicates_after_file_path_removed_and_appended(example_data_path_fixture):
+    # Arrange
+    dcm_series = DicomSeries(series_instance_uid="1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617")
+    first_file = example_data_path_fixture["ct"] / "GE" / "serie1" / "1"
+    second_file = example_data_path_fixture["ct"] / "GE" / "serie1" / "2"
+    dcm_series.add_file(file=first_file)
+    dcm_series.FilePaths.remove(first_file)
+    dcm_series.FilePaths.append(second_file)
+
+    # Act
+    dcm_series.add_file(file=second_file)
+    dcm_series.add_file(file=first_file)
+
+    # Assert
+    assert dcm_series.FilePaths == [second_file, first_file]
+
+
 def test_dicom_series_add_file_wrong_series_instance_uid(example_data_path_fixture):
     dcm_series = DicomSeries(series_instance_uid="some-uid")
 
@@ -48,6 +81,66 @@ def test_dicom_study_add_file(example_data_path_fixture):
     assert dcm_study.Series[0].SeriesInstanceUid == expected_series_instance_uid
 
 
+def test_dicom_study_add_file_routes_files_of_same_series_to_one_series(example_data_path_fixture):
+    # Arrange
+    dcm_study = DicomStudy("1.2.826.0.1.3680043.8.971.19037936343369135096938015896747654128")
+
+    # Act
+    for name in ["1", "2", "3"]:
+        dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / name)
+
+    # Assert
+    assert len(dcm_study.Series) == 1
+    assert len(dcm_study.Series[0].FilePaths) == 3
+
+
+def test_dicom_study_add_file_uses_series_appended_directly_to_series_list(example_data_path_fixture):
+    # Arrange
+    series_instance_uid = "1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617"
+    dcm_study = DicomStudy("1.2.826.0.1.3680043.8.971.19037936343369135096938015896747654128")
+    series = CtSeries(series_instance_uid=series_instance_uid)
+    dcm_study.Series.append(series)
+
+    # Act
+    dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+
+    # Assert
+    assert dcm_study.Series == [series]
+    assert len(series.FilePaths) == 1
+
+
+def test_dicom_study_add_file_uses_series_replaced_in_series_list(example_data_path_fixture):
+    # Arrange
+    series_instance_uid = "1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617"
+    dcm_study = DicomStudy("1.2.826.0.1.3680043.8.971.19037936343369135096938015896747654128")
+    dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+    series = CtSeries(series_instance_uid=series_instance_uid)
+    dcm_study.Series[0] = series
+
+    # Act
+    dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "2")
+
+    # Assert
+    assert dcm_study.Series == [series]
+    assert len(series.FilePaths) == 1
+
+
+def test_dicom_study_add_file_uses_series_assigned_to_series_list(example_data_path_fixture):
+    # Arrange
+    series_instance_uid = "1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617"
+    dcm_study = DicomStudy("1.2.826.0.1.3680043.8.971.19037936343369135096938015896747654128")
+    dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "1")
+    series = CtSeries(series_instance_uid=series_instance_uid)
+    dcm_study.Series = [series]
+
+    # Act
+    dcm_study.add_file(file=example_data_path_fixture["ct"] / "GE" / "serie1" / "2")
+
+    # Assert
+    assert dcm_study.Series == [series]
+    assert len(series.FilePaths) == 1
+
+
 def test_dicom_study_add_file_wrong_study_instance_uid(example_data_path_fixture):
     dcm_study = DicomStudy("some-uid")
     with pytest.raises(ValueError):
@@ -0,0 +1,117 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pydicom
+import pytest
+
+from dicom_image_tools.dicom_handlers.compact_metadata import CompactMetadata
+from dicom_image_tools.dicom_handlers.dicom_import import import_dicom_from_folder
+from dicom_image_tools.dicom_handlers.header_index import HeaderIndex
+
+CT_FOLDER = Path(__file__).parent.parent / "test_data" / "ct_study"
+
+
+def test_import_dicom_from_folder_with_index_gives_same_result_as_without_index(tmp_path):
+    # Arrange
+    index_file = tmp_path / "index.sqlite"
+    expected = import_dicom_from_folder(folder=CT_FOLDER, recursively=True)
+
+    # Act
+    _ = import_dicom_from_folder(folder=CT_FOLDER, recursively=True, index=index_file)
+    actual = import_dicom_from_folder(folder=CT_FOLDER, recursively=True, index=index_file)
+
+    # Assert
+    assert list(actual.keys()) == list(expected.keys())
+    for study_instance_uid, study in expected.items():
+        actual_study = actual[study_instance_uid]
+        assert actual_study.Manufacturer == study.Manufacturer
+        assert [series.SeriesInstanceUid for series in actual_study.Series] == [
+            series.SeriesInstanceUid for series in study.Series
+        ]
+        assert [series.FilePaths for series in actual_study.Series] == [series.FilePaths for series in study.Series]
+        assert [series.SlicePosition for series in actual_study.Series] == [
+            series.SlicePosition for series in study.Series
+        ]
+        assert len(actual_study.DoseReports.Rdsr) == len(study.DoseReports.Rdsr)
+        assert len(actual_study.DoseReports.SecondaryCapture) == len(study.DoseReports.SecondaryCapture)
+
+
+def test_import_dicom_from_folder_serves_unchanged_files_from_index(tmp_path):
+    # Arrange
+    file = CT_FOLDER / "GE" / "serie1" / "1"
+
+    with HeaderIndex(tmp_path / "index.sqlite") as index:
+        # Act
+        _ = import_dicom_from_folder(folder=file.parent, recursively=False, index=index, workers=2)
+        found, dcm = index.lookup(file)
+
+    # Assert
+    assert found
+    assert dcm.SeriesInstanceUID == "1.2.826.0.1.3680043.8.971.31305363770056566540494760179678687617"
+    assert "PixelData" not in dcm
+
+
+def test_header_index_lookup_misses_modified_files(tmp_path):
+    # Arrange
+    file = tmp_path / "1"
+    shutil.copy(CT_FOLDER / "GE" / "serie1" / "1", file)
+
+    with HeaderIndex(tmp_path / "index.sqlite") as index:
+        _ = import_dicom_from_folder(folder=tmp_path, recursively=False, index=index)
+        stat = file.stat()
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # Act
+        found, _ = index.lookup(file)
+
+    # Assert
+    assert not found
+
+
+def test_header_index_remembers_files_that_are_not_dicom_files(tmp_path):
+    # Arrange
+    file = tmp_path / "not_dicom.txt"
+    file.write_text("Not a DICOM file")
+
+    with HeaderIndex(tmp_path / "index.sqlite") as index:
+        # Act
+        with pytest.raises(ValueError):
+            _ = import_dicom_from_folder(folder=tmp_path, recursively=False, index=index)
+        found, dcm = index.lookup(file)
+
+    # Assert
+    assert found
+    assert dcm is None
+
+
+def test_import_dicom_from_folder_raises_type_error_for_invalid_index():
+    with pytest.raises(TypeError) as excinfo:
+        # noinspection PyTypeChecker
+        import_dicom_from_folder(folder=CT_FOLDER, index=123)
+
+    assert "The index must be given as a HeaderIndex or as the path to the index file" in str(excinfo.value)
+
+
+def test_image_saved_after_import_from_index_can_be_read_back(tmp_path):
+    # Arrange
+    folder = Path(__file__).parent.parent / "test_data" / "io"
+    index_file = tmp_path / "index.sqlite"
+    expected_series = next(iter(import_dicom_from_folder(folder=folder, recursively=False).values())).Series[0]
+    expected_series.import_image()
+    expected_series.save_image(image_index=0, output_path=tmp_path / "expected.dcm")
+    expected = pydicom.dcmread(tmp_path / "expected.dcm")
+
+    _ = import_dicom_from_folder(folder=folder, recursively=False, index=index_file)
+    series = next(iter(import_dicom_from_folder(folder=folder, recursively=False, index=index_file).values())).Series[0]
+    series.import_image()
+
+    # Act
+    series.save_image(image_index=0, output_path=tmp_path / "actual.dcm")
+
+    # Assert
+    actual = pydicom.dcmread(tmp_path / "actual.dcm")
+    assert isinstance(series.CompleteMetadata[0], CompactMetadata)
+    assert set(actual.keys()) == set(expected.keys())
+    np.testing.assert_array_equal(actual.pixel_array, expected.pixel_array)
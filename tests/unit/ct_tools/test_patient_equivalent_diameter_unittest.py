@@ -4,8 +4,10 @@ import pytest
 from dicom_image_tools.ct_tools.patient_equivalent_diameter import (
     SinogramData,
     calculate_area_equivalent_diameter,
+    calculate_max_min_lat_ap_convex_hull,
     calculate_max_min_lat_ap_hough,
     calculate_max_min_lat_ap_radon,
+    calculate_volume_area_equivalent_diameter,
 )
 from dicom_image_tools.dicom_handlers.ct import CtSeries
 from dicom_image_tools.helpers.voxel_data import VoxelData
@@ -164,3 +166,83 @@ def test_calculate_max_min_lat_ap_radon():
     actual = calculate_max_min_lat_ap_radon(mask=matrix, voxel_data=voxel_data)
 
     assert actual == expected
+
+
+@pytest.mark.parametrize("workers, expected_error", [(1.5, TypeError), (0, ValueError)])
+def test_calculate_area_equivalent_diameter_raises_on_invalid_workers(workers, expected_error):
+    with pytest.raises(expected_error):
+        calculate_area_equivalent_diameter(ct=CtSeries(series_instance_uid="some_UID"), workers=workers)
+
+
+def test_calculate_volume_area_equivalent_diameter_raises_typeerror_ct():
+    with pytest.raises(TypeError):
+        calculate_volume_area_equivalent_diameter(ct="Invalid argument")
+
+
+@pytest.mark.parametrize("slab_size, expected_error", [(1.5, TypeError), (0, ValueError)])
+def test_calculate_volume_area_equivalent_diameter_raises_on_invalid_slab_size(slab_size, expected_error):
+    with pytest.raises(expected_error):
+        calculate_volume_area_equivalent_diameter(ct=CtSeries(series_instance_uid="some_UID"), slab_size=slab_size)
+
+
+def test_calculate_max_min_lat_ap_convex_hull_raises_typeerror_mask():
+    voxel_data = VoxelData(x=1.0, y=1.0)
+    with pytest.raises(TypeError):
+        calculate_max_min_lat_ap_convex_hull(mask="Invalid type", voxel_data=voxel_data)
+
+
+def test_calculate_max_min_lat_ap_convex_hull_gives_same_result_as_radon():
+    # Arrange
+    matrix = np.array(
+        [
+            [0, 0, 0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 1, 1, 0, 0, 0],
+            [0, 0, 1, 1, 1, 1, 1, 0, 0],
+            [0, 0, 1, 1, 1, 1, 1, 0, 0],
+            [0, 0, 1, 1, 1, 1, 1, 0, 0],
+            [0, 0, 0, 1, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 1, 0, 0, 0, 0],
+        ]
+    )
+    voxel_data = VoxelData(x=1.0, y=1.0)
+    expected = calculate_max_min_lat_ap_radon(mask=matrix, voxel_data=voxel_data)
+
+    # Act
+    actual = calculate_max_min_lat_ap_convex_hull(mask=matrix, voxel_data=voxel_data)
+
+    # Assert
+    assert actual == expected
+
+
+@pytest.mark.parametrize("rotation", [0.0, 0.3, 1.1, 2.0])
+@pytest.mark.parametrize("shape", [(96, 96), (80, 96), (96, 90)])
+def test_calculate_max_min_lat_ap_convex_hull_gives_same_result_as_radon_for_ellipse(rotation, shape):
+    # Arrange
+    rows, columns = np.mgrid[: shape[0], : shape[1]]
+    x, y = columns - shape[1] / 2 + 0.3, rows - shape[0] / 2 - 0.2
+    u, v = x * np.cos(rotation) + y * np.sin(rotation), y * np.cos(rotation) - x * np.sin(rotation)
+    matrix = (u / 34.5) ** 2 + (v / 21.0) ** 2 <= 1
+    voxel_data = VoxelData(x=0.7, y=0.7)
+    expected = calculate_max_min_lat_ap_radon(mask=matrix.astype(float), voxel_data=voxel_data)
+
+    # Act
+    actual = calculate_max_min_lat_ap_convex_hull(mask=matrix, voxel_data=voxel_data)
+
+    # Assert
+    assert actual == expected
+    assert isinstance(actual.MaxPixels, np.int64)
+    assert isinstance(actual.MinPixels, np.int64)
+
+
+def test_calculate_max_min_lat_ap_convex_hull_returns_zero_for_empty_mask():
+    actual = calculate_max_min_lat_ap_convex_hull(mask=np.zeros((9, 9)), voxel_data=VoxelData(x=1.0, y=1.0))
+
+    assert actual.MaxPixels == 0
+    assert actual.MinPixels == 0
+
+
+def test_calculate_area_equivalent_diameter_raises_valueerror_sinogram_engine():
+    with pytest.raises(ValueError):
+        calculate_area_equivalent_diameter(ct=CtSeries(series_instance_uid="some_UID"), sinogram_engine="unknown")
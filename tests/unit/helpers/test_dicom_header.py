@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pydicom
+from pydicom.uid import ImplicitVRLittleEndian
+
+from dicom_image_tools.constants.dicom_tags import HEADER_TAG_KEYWORDS
+from dicom_image_tools.helpers.dicom_header import is_partial_header, read_dicom_header
+
+TEST_DATA = Path(__file__).parent.parent.parent / "test_data" / "ct_study"
+
+
+def test_read_dicom_header_selective_only_parses_header_tags():
+    # Arrange
+    file = TEST_DATA / "GE" / "serie1" / "1"
+    expected = pydicom.dcmread(file, stop_before_pixels=True)
+
+    # Act
+    actual = read_dicom_header(file=file, selective=True)
+
+    # Assert
+    assert "PatientID" not in actual
+    assert len(actual) < len(expected)
+    for keyword in HEADER_TAG_KEYWORDS:
+        assert (keyword in actual) == (keyword in expected)
+    assert actual[0x00431031].value == expected[0x00431031].value
+    assert is_partial_header(actual)
+
+
+def test_read_dicom_header_selective_decodes_private_tags_in_implicit_vr_file(tmp_path):
+    # Arrange
+    dcm = pydicom.dcmread(TEST_DATA / "GE" / "serie1" / "1")
+    dcm.file_meta.TransferSyntaxUID = ImplicitVRLittleEndian
+    file = tmp_path / "implicit_vr.dcm"
+    dcm.save_as(file, enforce_file_format=True)
+
+    # Act
+    actual = read_dicom_header(file=file, selective=True)
+
+    # Assert
+    assert actual[0x00431031].VR == "DS"
+    assert list(actual[0x00431031].value) == list(dcm[0x00431031].value)
+
+
+def test_read_dicom_header_reads_complete_header_when_not_selective():
+    # Arrange
+    file = TEST_DATA / "GE" / "serie1" / "1"
+
+    # Act
+    actual = read_dicom_header(file=file)
+
+    # Assert
+    assert "PatientID" in actual
+    assert "PixelData" not in actual
+    assert not is_partial_header(actual)
+
+
+def test_read_dicom_header_selective_reads_complete_dose_report():
+    # Arrange
+    file = TEST_DATA / "SeriesWithDoseReport" / "Z2379"
+    expected = pydicom.dcmread(file, stop_before_pixels=True)
+
+    # Act
+    actual = read_dicom_header(file=file, selective=True)
+
+    # Assert
+    assert len(actual) == len(expected)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from dicom_image_tools.helpers.masked_statistics import get_masked_statistics
+
+
+def _get_masked_array_statistics(image_volume: np.ndarray, mask: np.ndarray):
+    masked = np.ma.array(image_volume, mask=np.logical_not(mask))
+    return (
+        list(masked.mean(axis=(0, 1))),
+        list(np.ma.median(masked, axis=(0, 1))),
+        masked.mean(axis=None),
+        np.ma.median(masked, axis=None),
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.int16, np.float64])
+def test_get_masked_statistics_gives_same_result_as_masked_arrays(dtype):
+    # Arrange
+    rng = np.random.default_rng(seed=42)
+    image_volume = rng.integers(low=-1024, high=3000, size=(20, 16, 5)).astype(dtype)
+    mask = rng.random(size=image_volume.shape) > 0.4
+    expected_mean, expected_median, expected_volume_mean, expected_volume_median = _get_masked_array_statistics(
+        image_volume=image_volume, mask=mask
+    )
+
+    # Act
+    actual = get_masked_statistics(image_volume=image_volume, mask=mask)
+
+    # Assert
+    np.testing.assert_allclose(actual.slice_mean, expected_mean)
+    np.testing.assert_array_equal(actual.slice_median, expected_median)
+    assert actual.volume_mean == pytest.approx(expected_volume_mean)
+    assert actual.volume_median == expected_volume_median
+
+
+def test_get_masked_statistics_gives_same_median_as_masked_arrays_for_non_integer_values():
+    # Arrange
+    rng = np.random.default_rng(seed=7)
+    image_volume = rng.normal(size=(10, 10, 4))
+    mask = rng.random(size=image_volume.shape) > 0.5
+    _, expected_median, _, expected_volume_median = _get_masked_array_statistics(image_volume=image_volume, mask=mask)
+
+    # Act
+    actual = get_masked_statistics(image_volume=image_volume, mask=mask)
+
+    # Assert
+    np.testing.assert_array_equal(actual.slice_median, expected_median)
+    assert actual.volume_median == expected_volume_median
+
+
+def test_get_masked_statistics_gives_nan_for_slices_without_masked_voxels():
+    # Arrange
+    image_volume = np.arange(2 * 2 * 3, dtype=float).reshape((2, 2, 3))
+    mask = np.ones(image_volume.shape, dtype=bool)
+    mask[:, :, 1] = False
+
+    # Act
+    actual = get_masked_statistics(image_volume=image_volume, mask=mask)
+
+    # Assert
+    assert np.isnan(actual.slice_mean[1])
+    assert np.isnan(actual.slice_median[1])
+    assert actual.volume_median == np.median(image_volume[mask])
+
+
+def test_get_masked_statistics_raises_value_error_on_shape_mismatch():
+    with pytest.raises(ValueError):
+        get_masked_statistics(image_volume=np.zeros((2, 2, 2)), mask=np.zeros((2, 2, 3), dtype=bool))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from dicom_image_tools.helpers.packed_mask import PackedMask
+
+
+@pytest.fixture
+def mask():
+    rng = np.random.default_rng(seed=3)
+    return rng.random(size=(12, 21, 5)) > 0.5
+
+
+def test_packed_mask_as_array_gives_original_mask(mask):
+    # Act
+    actual = PackedMask.from_array(mask)
+
+    # Assert
+    np.testing.assert_array_equal(np.asarray(actual), mask)
+    assert actual.shape == mask.shape
+    assert actual.dtype == bool
+    assert actual.nbytes == 12 * 3 * 5
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        (slice(None), slice(None), 3),
+        (0, slice(None), slice(None)),
+        (-1, slice(None), slice(None)),
+        (slice(None), 0, slice(None)),
+        (slice(None), -1, slice(None)),
+        (slice(None), slice(None), slice(1, 4)),
+        (slice(2, 9), slice(5, 19, 2), slice(None)),
+        (slice(None), slice(None, None, -1), 1),
+        (slice(None), slice(10, 3), slice(None)),
+        (Ellipsis, 2),
+        4,
+        (slice(None), slice(None), np.array([True, False, True, False, True])),
+    ],
+)
+def test_packed_mask_indexing_gives_same_result_as_array(mask, key):
+    # Arrange
+    packed_mask = PackedMask.from_array(mask)
+
+    # Act
+    actual = packed_mask[key]
+
+    # Assert
+    np.testing.assert_array_equal(actual, mask[key])
+
+
+def test_packed_mask_set_slices_only_changes_given_slices(mask):
+    # Arrange
+    packed_mask = PackedMask(shape=mask.shape)
+
+    # Act
+    packed_mask.set_slices(start=2, mask=mask[:, :, 2:4])
+
+    # Assert
+    np.testing.assert_array_equal(packed_mask[:, :, 2:4], mask[:, :, 2:4])
+    assert not np.any(packed_mask[:, :, [0, 1, 4]])
+
+
+def test_packed_mask_count_nonzero(mask):
+    assert PackedMask.from_array(mask).count_nonzero() == np.count_nonzero(mask)
+
+
+def test_packed_mask_raises_index_error_for_index_out_of_bounds(mask):
+    with pytest.raises(IndexError):
+        _ = PackedMask.from_array(mask)[:, :, 5]
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from dicom_image_tools.helpers.patient_segmentation import (
+    erode_mask,
+    fill_holes_slice_wise,
+    get_patient_mask_chunked,
+    insert_slice_in_table_removed_mask,
+    remove_table,
+)
+
+
+def _get_image_volume(seed: int, slices: int) -> np.ndarray:
+    rng = np.random.default_rng(seed=seed)
+    return np.where(rng.random(size=(20, 19, slices)) > 0.35, 100.0, -1000.0)
+
+
+@pytest.mark.parametrize("slab_size", [1, 2, 3, 64])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_get_patient_mask_chunked_gives_same_mask_as_complete_volume_with_table_removal(seed, slab_size):
+    # Arrange
+    image_volume = _get_image_volume(seed=seed, slices=9)
+    expected = fill_holes_slice_wise(mask=remove_table(mask=image_volume >= 0))
+
+    # Act
+    actual = get_patient_mask_chunked(
+        image_volume=image_volume, threshold=0, remove_table_from_mask=True, slab_size=slab_size
+    )
+
+    # Assert
+    np.testing.assert_array_equal(np.asarray(actual), expected)
+
+
+@pytest.mark.parametrize("slab_size", [1, 4])
+def test_get_patient_mask_chunked_gives_same_mask_as_complete_volume_without_table_removal(slab_size):
+    # Arrange
+    image_volume = _get_image_volume(seed=5, slices=7)
+    expected = fill_holes_slice_wise(mask=image_volume >= 0)
+
+    # Act
+    actual = get_patient_mask_chunked(image_volume=image_volume, threshold=0, slab_size=slab_size)
+
+    # Assert
+    np.testing.assert_array_equal(np.asarray(actual), expected)
+
+
+@pytest.mark.parametrize("slab_size, expected_error", [(1.5, TypeError), (True, TypeError), (0, ValueError)])
+def test_get_patient_mask_chunked_raises_on_invalid_slab_size(slab_size, expected_error):
+    with pytest.raises(expected_error):
+        get_patient_mask_chunked(image_volume=np.zeros((4, 4, 3)), threshold=0, slab_size=slab_size)
+
+
+def _get_phantom_volume(seed: int, slices: int, hollow: bool = False) -> np.ndarray:
+    # A patient block above a table, with noise that connects and disconnects parts of them between slices
+    rng = np.random.default_rng(seed=seed)
+    image_volume = np.full((20, 19, slices), -1000.0)
+    image_volume[1:15, 2:17, :] = 100.0
+    image_volume[16:, :, :] = 100.0
+    if hollow:
+        image_volume[7:13, 6:13, :] = -1000.0
+
+    noise = rng.random(size=image_volume.shape) > 0.98
+    image_volume[noise] = np.where(image_volume[noise] > 0, -1000.0, 100.0)
+    return image_volume
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_get_patient_mask_chunked_selects_complete_volume_when_centre_is_background(seed):
+    # Arrange
+    image_volume = _get_phantom_volume(seed=seed, slices=6, hollow=True)
+    expected = fill_holes_slice_wise(mask=remove_table(mask=image_volume >= 0))
+
+    # Act
+    actual = get_patient_mask_chunked(image_volume=image_volume, threshold=0, remove_table_from_mask=True, slab_size=2)
+
+    # Assert
+    np.testing.assert_array_equal(np.asarray(actual), expected)
+
+
+@pytest.mark.parametrize("index", [0, 1, 4, 8])
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+@pytest.mark.parametrize("hollow", [False, True])
+def test_insert_slice_in_table_removed_mask_gives_same_mask_as_complete_volume(seed, index, hollow):
+    # Arrange
+    image_volume = _get_phantom_volume(seed=seed, slices=9, hollow=hollow)
+    previous_volume = np.delete(image_volume, index, axis=2)
+    previous_mask = fill_holes_slice_wise(mask=remove_table(mask=previous_volume >= 0))
+    expected = fill_holes_slice_wise(mask=remove_table(mask=image_volume >= 0))
+
+    # Act
+    actual, eroded_mask, updated = insert_slice_in_table_removed_mask(
+        image_volume=image_volume,
+        mask=previous_mask,
+        eroded_mask=erode_mask(mask=previous_volume >= 0),
+        index=index,
+        threshold=0,
+    )
+
+    # Assert
+    np.testing.assert_array_equal(actual, expected)
+    np.testing.assert_array_equal(eroded_mask, erode_mask(mask=image_volume >= 0))
+    assert index in updated
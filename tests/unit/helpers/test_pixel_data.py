@@ -1,12 +1,18 @@
 import tempfile
 
 import numpy as np
+import pytest
 from pydicom import Dataset
+from pydicom.dataset import FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian
 
 from dicom_image_tools.helpers.pixel_data import (
+    RescaledPixelArray,
     get_pixel_array,
     rescale_dose_matrix_pixel_array,
 )
+from dicom_image_tools.helpers.voxel_data import VoxelData
+from dicom_image_tools.roi.square_roi import SquareRoi
 
 
 def test_rescale_dose_matrix_pixel_array_rescales_the_pixel_array_by_the_dose_grid_scaling_factor(dose_matrix):
@@ -48,3 +54,78 @@ def test_get_pixel_array_rescales_by_DoseGridScaling_when_rtdose_modality(dose_m
 
     # Assert
     assert actual == expected
+
+
+def test_get_pixel_array_returns_float32_array_when_dtype_float32(dose_matrix_file):
+    # Arrange
+    ds = dose_matrix_file.copy()
+    ds.DoseGridScaling = 0.12
+    ds.BitsStored = 12
+    expected = get_pixel_array(dcm=ds)
+
+    # Act
+    actual = get_pixel_array(dcm=ds, dtype="float32")
+
+    # Assert
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+def test_get_pixel_array_keeps_stored_values_when_dtype_native():
+    # Arrange
+    ds = _get_ct_image_dataset(stored_values=np.arange(16, dtype=np.int16).reshape((4, 4)))
+    expected = get_pixel_array(dcm=ds)
+
+    # Act
+    actual = get_pixel_array(dcm=ds, dtype="native")
+
+    # Assert
+    assert isinstance(actual, RescaledPixelArray)
+    assert actual.StoredValues.dtype == np.int16
+    np.testing.assert_array_equal(np.asarray(actual), expected)
+    np.testing.assert_array_equal(actual[1:3, 2], expected[1:3, 2])
+
+
+def test_get_pixel_array_raises_value_error_on_unknown_dtype(dose_matrix_file):
+    with pytest.raises(ValueError):
+        get_pixel_array(dcm=dose_matrix_file, dtype="int8")
+
+
+def test_get_pixel_array_raises_type_error_on_non_string_dtype(dose_matrix_file):
+    with pytest.raises(TypeError):
+        get_pixel_array(dcm=dose_matrix_file, dtype=np.float32)
+
+
+def test_square_roi_statistics_are_the_same_for_native_and_float64_pixel_data():
+    # Arrange
+    ds = _get_ct_image_dataset(stored_values=np.arange(64, dtype=np.int16).reshape((8, 8)) * 7)
+    roi = SquareRoi(center=dict(x=3, y=3, z=None), height=4, width=4, pixel_size=VoxelData(x=1.0, y=1.0, z=None))
+    expected = get_pixel_array(dcm=ds)
+
+    # Act
+    actual = get_pixel_array(dcm=ds, dtype="native")
+
+    # Assert
+    assert roi.get_mean(actual) == roi.get_mean(expected)
+    assert roi.get_stdev(actual) == roi.get_stdev(expected)
+    assert roi.get_std_error_of_the_mean(actual) == roi.get_std_error_of_the_mean(expected)
+    np.testing.assert_array_equal(roi.get_sum(actual), roi.get_sum(expected))
+
+
+def _get_ct_image_dataset(stored_values: np.ndarray) -> Dataset:
+    ds = Dataset()
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds.Modality = "CT"
+    ds.Rows, ds.Columns = stored_values.shape
+    ds.BitsAllocated = 16
+    ds.BitsStored = 16
+    ds.HighBit = 15
+    ds.PixelRepresentation = 1
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.RescaleSlope = 1.5
+    ds.RescaleIntercept = -1024
+    ds.PixelData = stored_values.astype(np.int16).tobytes()
+
+    return ds
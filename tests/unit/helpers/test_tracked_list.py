@@ -0,0 +1,47 @@
+import pickle
+
+import pytest
+
+from dicom_image_tools.helpers.tracked_list import TrackedList
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda items: items.__setitem__(0, 5),
+        lambda items: items.__setitem__(slice(0, 2), [5, 6]),
+        lambda items: items.__delitem__(0),
+        lambda items: items.__iadd__([5]),
+        lambda items: items.__imul__(2),
+        lambda items: items.append(5),
+        lambda items: items.extend([5]),
+        lambda items: items.insert(0, 5),
+        lambda items: items.pop(),
+        lambda items: items.remove(2),
+        lambda items: items.clear(),
+        lambda items: items.sort(reverse=True),
+        lambda items: items.reverse(),
+    ],
+)
+def test_tracked_list_increases_version_on_change(change):
+    # Arrange
+    items = TrackedList([1, 2, 3])
+
+    # Act
+    change(items)
+
+    # Assert
+    assert items.version == 1
+
+
+def test_tracked_list_keeps_items_and_version_when_pickled():
+    # Arrange
+    items = TrackedList([1, 2, 3])
+    items.append(4)
+
+    # Act
+    actual = pickle.loads(pickle.dumps(items))
+
+    # Assert
+    assert actual == [1, 2, 3, 4]
+    assert actual.version == items.version
@@ -1,9 +1,15 @@
 import numpy as np
 import pytest
+from scipy.stats import sem
 
 from dicom_image_tools import SquareRoi
 from dicom_image_tools.helpers.voxel_data import VoxelData
-from dicom_image_tools.image_quality.lcd import lcd_statistical, lcd_statistical_random
+from dicom_image_tools.image_quality.lcd import (
+    lcd_statistical,
+    lcd_statistical_random,
+    lcd_statistical_random_batch,
+    lcd_statistical_random_sweep,
+)
 
 TEST_MATRIX = np.asarray(
     [
@@ -103,3 +109,210 @@ def test_lcd_statistical_random_returns_rois():
     assert rois is not None
     assert len(rois) == expected_rois
     assert all([isinstance(roi, SquareRoi) for roi in rois])
+
+
+def test_lcd_statistical_random_gives_same_statistics_as_square_roi_methods():
+    # Arrange
+    np.random.seed(3)
+    analysis_matrix = TEST_MATRIX.astype(float)
+
+    # Act
+    res = lcd_statistical_random(
+        analysis_matrix=analysis_matrix,
+        pixel_size=VoxelData(x=0.5, y=0.5),
+        object_size=2.0,
+        rois=200,
+        return_rois=True,
+    )
+
+    # Assert
+    rois = res.get("ROIs")
+    assert len(rois) == 200
+    assert res.get("Mean") == pytest.approx(np.mean([roi.get_mean(analysis_matrix) for roi in rois]))
+    assert res.get("SD") == pytest.approx(np.mean([roi.get_stdev(analysis_matrix) for roi in rois]))
+    assert res.get("Std Error Mean") == pytest.approx(
+        np.mean([roi.get_std_error_of_the_mean(analysis_matrix) for roi in rois])
+    )
+
+
+def test_lcd_statistical_random_places_structured_rois_as_square_rois():
+    # Arrange
+    expected = [
+        SquareRoi(
+            center=dict(x=int(col * 3 + 2), y=int(row * 3 + 2), z=None),
+            height=3.0,
+            width=3.0,
+            pixel_size=VoxelData(x=1.0, y=1.0),
+            resize_too_big_roi=True,
+        )
+        for col in range(6)
+        for row in range(6)
+    ]
+
+    # Act
+    res = lcd_statistical_random(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=3.0, rois=36, return_rois=True
+    )
+
+    # Assert
+    assert [(roi.UpperLeft.x, roi.UpperLeft.y) for roi in res.get("ROIs")] == [
+        (roi.UpperLeft.x, roi.UpperLeft.y) for roi in expected
+    ]
+    assert res.get("Mean") == pytest.approx(np.mean([roi.get_mean(TEST_MATRIX) for roi in expected]))
+    assert res.get("Error SD") == pytest.approx(sem([roi.get_stdev(TEST_MATRIX) for roi in expected]))
+
+
+def test_lcd_statistical_random_replaces_random_rois_containing_nan():
+    # Arrange
+    np.random.seed(0)
+    analysis_matrix = TEST_MATRIX.astype(float)
+    analysis_matrix[:, 19:] = np.nan
+
+    # Act
+    res = lcd_statistical_random(
+        analysis_matrix=analysis_matrix, pixel_size=VoxelData(x=1.0, y=1.0), object_size=3.0, rois=500
+    )
+
+    # Assert
+    assert not np.isnan(res.get("Std Error Mean"))
+
+
+def test_lcd_statistical_random_raises_value_error_for_object_smaller_than_pixel():
+    with pytest.raises(ValueError):
+        lcd_statistical_random(analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=0.5)
+
+
+def test_lcd_statistical_random_sweep_gives_same_results_as_separate_calls():
+    # Arrange
+    object_sizes = [2.0, 3.0, 5.0]
+    np.random.seed(7)
+    expected = [
+        lcd_statistical_random(analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=size)
+        for size in object_sizes
+    ]
+    np.random.seed(7)
+
+    # Act
+    actual = lcd_statistical_random_sweep(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=object_sizes
+    )
+
+    # Assert
+    np.testing.assert_equal(actual, expected)
+
+
+def test_lcd_statistical_random_sweep_with_workers_gives_same_results_as_serial_sweep():
+    # Arrange
+    object_sizes = [2.0, 3.0, 4.0, 6.0]
+    expected = lcd_statistical_random_sweep(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=object_sizes, rois=0
+    )
+
+    # Act
+    actual = lcd_statistical_random_sweep(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=object_sizes, rois=0, workers=3
+    )
+
+    # Assert
+    np.testing.assert_equal(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "object_sizes, workers, expected_error",
+    [(3.0, None, TypeError), ([3.0, 4], None, TypeError), ([3.0], 0, ValueError), ([3.0], 1.5, TypeError)],
+)
+def test_lcd_statistical_random_sweep_raises_on_invalid_arguments(object_sizes, workers, expected_error):
+    with pytest.raises(expected_error):
+        lcd_statistical_random_sweep(
+            analysis_matrix=TEST_MATRIX,
+            pixel_size=VoxelData(x=1.0, y=1.0),
+            object_sizes=object_sizes,
+            workers=workers,
+        )
+
+
+@pytest.mark.parametrize("rng", [42, np.random.SeedSequence(42)])
+def test_lcd_statistical_random_with_seed_is_reproducible(rng):
+    # Arrange
+    expected = lcd_statistical_random(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=3.0, rng=42
+    )
+
+    # Act
+    actual = lcd_statistical_random(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=3.0, rng=rng
+    )
+
+    # Assert
+    np.testing.assert_equal(actual, expected)
+
+
+def test_lcd_statistical_random_with_generator_does_not_use_global_random_state():
+    # Arrange
+    np.random.seed(0)
+    expected = np.random.random()
+    np.random.seed(0)
+
+    # Act
+    lcd_statistical_random(
+        analysis_matrix=TEST_MATRIX,
+        pixel_size=VoxelData(x=1.0, y=1.0),
+        object_size=3.0,
+        rng=np.random.default_rng(seed=1),
+    )
+
+    # Assert
+    assert np.random.random() == expected
+
+
+def test_lcd_statistical_random_raises_rng_typeerror():
+    with pytest.raises(TypeError):
+        lcd_statistical_random(
+            analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_size=3.0, rng=1.5
+        )
+
+
+def test_lcd_statistical_random_sweep_with_seed_does_not_depend_on_workers():
+    # Arrange
+    object_sizes = [2.0, 3.0, 4.0, 6.0]
+    expected = lcd_statistical_random_sweep(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=object_sizes, rng=11
+    )
+
+    # Act
+    actual = lcd_statistical_random_sweep(
+        analysis_matrix=TEST_MATRIX, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=object_sizes, rng=11, workers=3
+    )
+
+    # Assert
+    np.testing.assert_equal(actual, expected)
+
+
+def test_lcd_statistical_random_batch_with_seed_does_not_depend_on_workers():
+    # Arrange
+    analysis_matrices = [TEST_MATRIX, np.flipud(TEST_MATRIX), np.fliplr(TEST_MATRIX)]
+    expected = lcd_statistical_random_batch(
+        analysis_matrices=analysis_matrices, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=[2.0, 3.0], seed=5
+    )
+
+    # Act
+    actual = lcd_statistical_random_batch(
+        analysis_matrices=analysis_matrices,
+        pixel_size=VoxelData(x=1.0, y=1.0),
+        object_sizes=[2.0, 3.0],
+        seed=5,
+        workers=2,
+    )
+
+    # Assert
+    assert len(actual) == len(analysis_matrices)
+    np.testing.assert_equal(actual, expected)
+    assert actual[0] != actual[1]
+
+
+@pytest.mark.parametrize("analysis_matrices, seed", [(TEST_MATRIX, None), ([TEST_MATRIX], 1.5), ([TEST_MATRIX], True)])
+def test_lcd_statistical_random_batch_raises_typeerror(analysis_matrices, seed):
+    with pytest.raises(TypeError):
+        lcd_statistical_random_batch(
+            analysis_matrices=analysis_matrices, pixel_size=VoxelData(x=1.0, y=1.0), object_sizes=[3.0], seed=seed
+        )
@@ -1,8 +1,12 @@
+import warnings
+
 import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
 
-from dicom_image_tools.image_quality.variance_image import get_variance_image_2d
+from scipy import ndimage
+
+from dicom_image_tools.image_quality.variance_image import get_variance_image_2d, get_variance_volume
 
 TEST_MATRIX = np.asarray(
     [
@@ -58,3 +62,142 @@ def test_get_variance_image_2d_raises_type_error_when_window_side_y_is_not_int()
         get_variance_image_2d(image=TEST_MATRIX, window_side_y="invalid")
 
     assert str(exc.value).startswith("The window sides have to be specified as integers.")
+
+
+@pytest.mark.parametrize("window_side_x, window_side_y", [(3, 3), (2, 4), (5, 1), (4, 6)])
+def test_get_variance_image_2d_uniform_filter_engine_gives_same_result_as_generic_filter_engine(
+    window_side_x, window_side_y
+):
+    # Arrange
+    image = np.random.default_rng(seed=0).normal(loc=1000.0, scale=20.0, size=(23, 31))
+    expected = get_variance_image_2d(
+        image, window_side_x=window_side_x, window_side_y=window_side_y, engine="generic_filter"
+    )
+
+    # Act
+    actual = get_variance_image_2d(image, window_side_x=window_side_x, window_side_y=window_side_y)
+
+    # Assert
+    assert actual.shape == image.shape
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("window_side_x, window_side_y", [(3, 3), (2, 4)])
+def test_get_variance_image_2d_uniform_filter_engine_gives_nan_for_windows_containing_nan(window_side_x, window_side_y):
+    # Arrange
+    image = TEST_MATRIX.astype(float)
+    image[2, 1] = np.nan
+    expected = get_variance_image_2d(
+        image, window_side_x=window_side_x, window_side_y=window_side_y, engine="generic_filter"
+    )
+
+    # Act
+    actual = get_variance_image_2d(image, window_side_x=window_side_x, window_side_y=window_side_y)
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_get_variance_image_2d_raises_value_error_on_unknown_engine():
+    with pytest.raises(ValueError):
+        get_variance_image_2d(image=TEST_MATRIX, engine="unknown")
+
+
+def _get_test_volume() -> np.ndarray:
+    return np.random.default_rng(seed=2).normal(loc=40.0, scale=10.0, size=(13, 11, 7))
+
+
+@pytest.mark.parametrize("slab_size", [None, 1, 3])
+def test_get_variance_volume_with_2d_window_gives_same_result_as_variance_image_of_each_slice(slab_size):
+    # Arrange
+    image_volume = _get_test_volume()
+    expected = np.stack(
+        [
+            get_variance_image_2d(image_volume[:, :, ind], window_side_x=3, window_side_y=5, engine="generic_filter")
+            for ind in range(image_volume.shape[2])
+        ],
+        axis=2,
+    )
+
+    # Act
+    actual = get_variance_volume(image_volume, window_side_x=3, window_side_y=5, slab_size=slab_size)
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("slab_size", [None, 1, 2, 5])
+@pytest.mark.parametrize("window_side_z", [2, 3, 4])
+def test_get_variance_volume_with_3d_window_gives_same_result_as_generic_filter(window_side_z, slab_size):
+    # Arrange
+    image_volume = _get_test_volume()
+    expected = ndimage.generic_filter(image_volume, np.var, size=(3, 2, window_side_z))
+
+    # Act
+    actual = get_variance_volume(
+        image_volume, window_side_x=2, window_side_y=3, window_side_z=window_side_z, slab_size=slab_size
+    )
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("slab_size", [None, 2])
+def test_get_variance_volume_with_mask_only_includes_masked_voxels(slab_size):
+    # Arrange
+    image_volume = _get_test_volume()
+    mask = np.zeros(image_volume.shape, dtype=bool)
+    mask[2:10, 3:9, 1:6] = True
+    mask[5, 5, 3] = False
+    expected = ndimage.generic_filter(np.where(mask, image_volume, np.nan), np.nanvar, size=(3, 3, 3))
+    expected[~mask] = np.nan
+
+    # Act
+    actual = get_variance_volume(image_volume, window_side_z=3, mask=mask, slab_size=slab_size)
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_get_variance_volume_with_mask_does_not_warn_for_voxels_outside_of_mask():
+    # Arrange
+    image_volume = _get_test_volume()
+    mask = np.zeros(image_volume.shape, dtype=bool)
+    mask[4:6, 4:6, 2:4] = True
+
+    # Act
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        actual = get_variance_volume(image_volume, mask=mask)
+
+    # Assert
+    assert np.all(np.isnan(actual[~mask]))
+    assert np.all(np.isfinite(actual[mask]))
+
+
+def test_get_variance_volume_returns_standard_deviation():
+    # Arrange
+    image_volume = _get_test_volume()
+    expected = np.sqrt(get_variance_volume(image_volume, window_side_z=3))
+
+    # Act
+    actual = get_variance_volume(image_volume, window_side_z=3, standard_deviation=True, dtype=np.float32)
+
+    # Assert
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "image_volume, kwargs, expected_error",
+    [
+        (TEST_MATRIX, {}, ValueError),
+        (np.zeros((3, 3, 3)), {"window_side_z": 1.5}, TypeError),
+        (np.zeros((3, 3, 3)), {"window_side_x": 0}, ValueError),
+        (np.zeros((3, 3, 3)), {"slab_size": 0}, ValueError),
+        (np.zeros((3, 3, 3)), {"mask": np.ones((3, 3, 2), dtype=bool)}, ValueError),
+    ],
+)
+def test_get_variance_volume_raises_on_invalid_arguments(image_volume, kwargs, expected_error):
+    with pytest.raises(expected_error):
+        get_variance_volume(image_volume, **kwargs)
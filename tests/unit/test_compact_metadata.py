@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pydicom
+import pytest
+
+from dicom_image_tools.dicom_handlers.compact_metadata import CompactMetadata
+
+CT_FILE = Path(__file__).parent.parent / "test_data" / "ct_study" / "GE" / "serie1" / "1"
+
+
+@pytest.fixture()
+def ct_dataset() -> pydicom.FileDataset:
+    return pydicom.dcmread(CT_FILE, stop_before_pixels=True)
+
+
+def test_compact_metadata_keeps_header_tag_values(ct_dataset):
+    # Act
+    actual = CompactMetadata(file=CT_FILE, dcm=ct_dataset)
+
+    # Assert
+    assert "KVP" in actual
+    assert actual.KVP == ct_dataset.KVP
+    assert actual.get("KVP") == ct_dataset.KVP
+    assert actual[0x00180060].value == ct_dataset.KVP
+    assert actual.ImagePositionPatient == ct_dataset.ImagePositionPatient
+
+
+def test_compact_metadata_keeps_private_table_offset_tag(ct_dataset):
+    # Act
+    actual = CompactMetadata(file=CT_FILE, dcm=ct_dataset)
+
+    # Assert
+    assert 0x00431031 in actual
+    assert actual[0x00431031].value == ct_dataset[0x00431031].value
+
+
+def test_compact_metadata_does_not_keep_tags_outside_the_whitelist(ct_dataset):
+    # Act
+    actual = CompactMetadata(file=CT_FILE, dcm=ct_dataset)
+
+    # Assert
+    assert "PatientID" not in actual
+    assert actual.get("PatientID") is None
+    with pytest.raises(AttributeError):
+        _ = actual.PatientID
+    with pytest.raises(KeyError):
+        _ = actual["PatientID"]
+
+
+def test_compact_metadata_read_dataset_returns_complete_dataset(ct_dataset):
+    # Arrange
+    compact_metadata = CompactMetadata(file=CT_FILE, dcm=ct_dataset)
+
+    # Act
+    actual = compact_metadata.read_dataset()
+
+    # Assert
+    assert actual.PatientID == ct_dataset.PatientID
+
+
+def test_compact_metadata_has_no_instance_dictionary(ct_dataset):
+    actual = CompactMetadata(file=CT_FILE, dcm=ct_dataset)
+
+    assert not hasattr(actual, "__dict__")
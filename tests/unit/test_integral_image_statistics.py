@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from scipy.stats import sem
+
+from dicom_image_tools.helpers.voxel_data import VoxelData
+from dicom_image_tools.roi.integral_image_statistics import IntegralImageStatistics
+from dicom_image_tools.roi.square_roi import SquareRoi
+
+
+@pytest.fixture()
+def noise_image() -> np.ndarray:
+    rng = np.random.default_rng(seed=42)
+    return 1000.0 + rng.normal(scale=12.0, size=(40, 37))
+
+
+def _get_rois():
+    pixel_size = VoxelData(x=0.5, y=0.5, z=None)
+    return [
+        SquareRoi(center=dict(x=10, y=12, z=None), height=3, width=3, pixel_size=pixel_size),
+        SquareRoi(center=dict(x=2, y=3, z=None), height=2, width=2, pixel_size=pixel_size),
+        SquareRoi(center=dict(x=30, y=35, z=None), height=8, width=8, pixel_size=pixel_size, resize_too_big_roi=True),
+        SquareRoi(center=dict(x=36, y=39, z=None), height=1, width=1, pixel_size=pixel_size, resize_too_big_roi=True),
+    ]
+
+
+def test_integral_image_statistics_give_same_statistics_as_square_roi(noise_image):
+    # Arrange
+    rois = _get_rois()
+    statistics = IntegralImageStatistics(image=noise_image)
+
+    # Act
+    actual = statistics.get_statistics(rois=rois)
+
+    # Assert
+    assert len(actual) == len(rois)
+    np.testing.assert_allclose(actual.mean, [roi.get_mean(noise_image) for roi in rois], rtol=1e-12)
+    np.testing.assert_allclose(actual.stdev, [roi.get_stdev(noise_image) for roi in rois], rtol=1e-9)
+    np.testing.assert_allclose(
+        actual.std_error_of_the_mean, [roi.get_std_error_of_the_mean(noise_image) for roi in rois], rtol=1e-9
+    )
+    np.testing.assert_allclose(actual.sum, [np.sum(roi.get_roi_part_of_image(noise_image)) for roi in rois])
+    np.testing.assert_array_equal(actual.pixel_count, [roi.get_roi_part_of_image(noise_image).size for roi in rois])
+
+
+def test_integral_image_statistics_single_roi_methods_give_same_results_as_square_roi(noise_image):
+    # Arrange
+    roi = _get_rois()[0]
+
+    # Act
+    statistics = IntegralImageStatistics(image=noise_image)
+
+    # Assert
+    assert statistics.get_mean(roi) == pytest.approx(roi.get_mean(noise_image))
+    assert statistics.get_stdev(roi) == pytest.approx(roi.get_stdev(noise_image))
+    assert statistics.get_std_error_of_the_mean(roi) == pytest.approx(roi.get_std_error_of_the_mean(noise_image))
+    assert statistics.get_total_sum(roi) == pytest.approx(np.sum(roi.get_sum(noise_image)))
+
+
+def test_integral_image_statistics_get_box_statistics_crops_bounds_to_image(noise_image):
+    # Arrange
+    statistics = IntegralImageStatistics(image=noise_image)
+
+    # Act
+    actual = statistics.get_box_statistics(top=[0, 35, 40], bottom=[5, 50, 45], left=[0, 30, 0], right=[1, 40, 5])
+
+    # Assert
+    np.testing.assert_array_equal(actual.pixel_count, [5, 35, 0])
+    assert actual.mean[0] == pytest.approx(np.mean(noise_image[0:5, 0:1]))
+    assert actual.std_error_of_the_mean[1] == pytest.approx(sem(noise_image[35:, 30:].flatten()))
+    assert np.isnan(actual.mean[2])
+    assert np.isnan(actual.stdev[2])
+    assert np.isnan(actual.std_error_of_the_mean[2])
+
+
+def test_integral_image_statistics_keep_precision_for_large_offsets():
+    # Arrange
+    rng = np.random.default_rng(seed=1)
+    image = 1e8 + rng.normal(scale=0.5, size=(64, 64))
+
+    # Act
+    actual = IntegralImageStatistics(image=image).get_box_statistics(top=[10], bottom=[30], left=[20], right=[40])
+
+    # Assert
+    assert actual.stdev[0] == pytest.approx(np.std(image[10:30, 20:40]), rel=1e-6)
+
+
+def test_integral_image_statistics_raise_value_error_for_roi_outside_of_image(noise_image):
+    roi = SquareRoi(center=dict(x=36, y=39, z=None), height=4, width=4, pixel_size=VoxelData(x=0.5, y=0.5, z=None))
+
+    with pytest.raises(ValueError):
+        IntegralImageStatistics(image=noise_image).get_statistics(rois=[roi])
+
+
+@pytest.mark.parametrize("image, expected_error", [([[1, 2], [3, 4]], TypeError), (np.zeros((2, 2, 2)), ValueError)])
+def test_integral_image_statistics_raise_error_on_invalid_image(image, expected_error):
+    with pytest.raises(expected_error):
+        IntegralImageStatistics(image=image)
+
+
+def test_integral_image_statistics_raise_type_error_on_invalid_rois(noise_image):
+    with pytest.raises(TypeError):
+        IntegralImageStatistics(image=noise_image).get_statistics(rois=_get_rois()[0])
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from dicom_image_tools.dicom_handlers.result_cache import ResultCache
+
+
+def test_result_cache_get_key_depends_on_uids_and_parameters():
+    # Arrange
+    key = ResultCache.get_key("patient_mask", ["1.2.3", "1.2.4"], threshold=-500, remove_table=True)
+
+    # Act
+    same_key = ResultCache.get_key("patient_mask", ["1.2.3", "1.2.4"], remove_table=True, threshold=-500)
+    other_uids_key = ResultCache.get_key("patient_mask", ["1.2.3"], threshold=-500, remove_table=True)
+    other_parameters_key = ResultCache.get_key("patient_mask", ["1.2.3", "1.2.4"], threshold=-400, remove_table=True)
+
+    # Assert
+    assert key == same_key
+    assert key != other_uids_key
+    assert key != other_parameters_key
+
+
+def test_result_cache_load_returns_stored_arrays(tmp_path):
+    # Arrange
+    expected = {"values": np.arange(5, dtype=float), "flag": np.array(True)}
+
+    with ResultCache(cache_directory=tmp_path) as cache:
+        cache.store("key", expected)
+
+    # Act
+    with ResultCache(cache_directory=tmp_path) as cache:
+        actual = cache.load("key")
+
+    # Assert
+    assert actual.keys() == expected.keys()
+    for name, values in expected.items():
+        np.testing.assert_array_equal(actual[name], values)
+
+
+def test_result_cache_load_returns_none_for_missing_key(tmp_path):
+    with ResultCache(cache_directory=tmp_path) as cache:
+        assert cache.load("missing") is None
+
+
+def test_result_cache_removes_least_recently_used_result_when_full(tmp_path):
+    # Arrange
+    values = {"values": np.zeros(1000)}
+    with ResultCache(cache_directory=tmp_path) as cache:
+        cache.store("first", values)
+        cache.store("second", values)
+        cache.MaxSize = 2 * (tmp_path / "first.npz").stat().st_size
+        _ = cache.load("first")
+
+        # Act
+        cache.store("third", values)
+
+        # Assert
+        assert cache.load("second") is None
+        assert cache.load("first") is not None
+        assert cache.load("third") is not None
+        assert not (tmp_path / "second.npz").exists()
+
+
+@pytest.mark.parametrize("max_size, expected_error", [(1.5, TypeError), (-1, ValueError)])
+def test_result_cache_raises_on_invalid_max_size(tmp_path, max_size, expected_error):
+    with pytest.raises(expected_error):
+        ResultCache(cache_directory=tmp_path, max_size=max_size)